@@ -1,37 +1,63 @@
+"""Backend process entry point: ``python main.py [role] [role options]``.
+
+Roles: ``api`` (single uvicorn process, the default), ``server`` (prefork
+production server) and ``worker`` (outbox dispatcher). Each role imports only
+its own stack, so a worker never loads FastAPI. The role can also come from
+``GODLIFE_ROLE``.
+"""
+
 from __future__ import annotations
 
 import os
 import sys
+from collections.abc import Callable
 from pathlib import Path
 
 
 def _ensure_backend_source_on_path() -> None:
-    project_candidates = (
-        Path(__file__).resolve().parent / "src",
-        Path(__file__).resolve().parent / ".." / "backend" / "src",
-        Path(__file__).resolve().parent.parent / "src",
-        Path(__file__).resolve().parents[2] / "apps" / "backend" / "src",
-        Path.cwd() / "apps" / "backend" / "src",
-        Path.cwd() / "src",
-    )
-
-    for src_root in project_candidates:
-        if src_root.exists():
-            src_root = src_root.resolve()
-            if str(src_root) not in sys.path:
-                sys.path.insert(0, str(src_root))
-            return
-
-
-def main() -> None:
-    _ensure_backend_source_on_path()
-    from godlife_backend.adapter.webapi.app import app
+    src_root = str(Path(__file__).resolve().parent / "src")
+    if src_root not in sys.path:
+        sys.path.insert(0, src_root)
+
 
-    uvicorn = __import__("uvicorn")
+def _run_api(argv: list[str]) -> None:
+    import uvicorn
+    from godlife_backend.adapter.webapi.app import create_app
 
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "8000"))
-    uvicorn.run(app, host=host, port=port)
+    uvicorn.run(create_app(), host=host, port=port)
+
+
+def _run_server(argv: list[str]) -> None:
+    from godlife_backend.adapter.webapi.server import main as server_main
+
+    server_main(argv)
+
+
+def _run_worker(argv: list[str]) -> None:
+    from godlife_backend.adapter.worker import main as worker_main
+
+    worker_main(argv)
+
+
+ROLES: dict[str, Callable[[list[str]], None]] = {
+    "api": _run_api,
+    "server": _run_server,
+    "worker": _run_worker,
+}
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = sys.argv[1:] if argv is None else argv
+    if args and args[0] in ROLES:
+        role, args = args[0], args[1:]
+    else:
+        role = os.getenv("GODLIFE_ROLE", "api")
+    if role not in ROLES:
+        raise SystemExit(f"unknown role {role!r}; expected one of {sorted(ROLES)}")
+    _ensure_backend_source_on_path()
+    ROLES[role](args)
 
 
 if __name__ == "__main__":
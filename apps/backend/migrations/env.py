@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import logging
 import os
+import time
+from collections.abc import Collection, Mapping
 from logging.config import fileConfig
 
 import godlife_backend.db.models  # noqa: F401  (ensures models are imported for metadata)
 from alembic import context
+from alembic.runtime.migration import MigrationContext, MigrationInfo
 from godlife_backend.db.base import Base
 from sqlalchemy import engine_from_config, pool
 
@@ -12,6 +16,11 @@ config = context.config
 
 if config.config_file_name is not None and config.file_config.has_section("loggers"):
     fileConfig(config.config_file_name)
+else:
+    # Revision and backfill progress goes to the console.
+    logging.basicConfig(
+        level=logging.INFO, format="%(levelname)s [%(name)s] %(message)s"
+    )
 
 database_url = os.getenv("DATABASE_URL")
 if database_url:
@@ -20,6 +29,26 @@ else:
     config.set_main_option("sqlalchemy.url", "sqlite:///./godlife_dev.db")
 
 target_metadata = Base.metadata
+logger = logging.getLogger("alembic.runtime.migration")
+
+# DDL waiting longer than this for its lock fails instead of queueing every
+# writer behind it; rerun the migration once the blocking transaction ends.
+lock_timeout = os.getenv("MIGRATION_LOCK_TIMEOUT", "5s")
+_step_started = time.monotonic()
+
+
+def _report_step(
+    ctx: MigrationContext,
+    step: MigrationInfo,
+    heads: Collection[str],
+    run_args: Mapping[str, object],
+) -> None:
+    """Log how long each revision took; each one commits on its own."""
+    global _step_started
+    now = time.monotonic()
+    direction = "upgraded to" if step.is_upgrade else "downgraded from"
+    logger.info("%s %s in %.1fs", direction, step.up_revision_id, now - _step_started)
+    _step_started = now
 
 
 def run_migrations_offline() -> None:
@@ -47,13 +76,23 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.exec_driver_sql(f"SET lock_timeout = '{lock_timeout}'")
+            connection.commit()
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
             compare_type=True,
             compare_server_default=True,
             render_as_batch=True,
+            # One transaction per revision: a failure keeps earlier revisions
+            # applied, and online helpers can step outside it to build indexes
+            # concurrently or backfill in batches.
+            transaction_per_migration=True,
+            on_version_apply=_report_step,
         )
+        global _step_started
+        _step_started = time.monotonic()
         with context.begin_transaction():
             context.run_migrations()
 
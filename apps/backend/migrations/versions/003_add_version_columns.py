@@ -0,0 +1,29 @@
+"""Add optimistic concurrency version columns to plans and set states."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "003_add_version_columns"
+down_revision = "002_add_operability_fields"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add compare-and-swap version counters."""
+    op.add_column(
+        "exercise_plans",
+        sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+    )
+    op.add_column(
+        "exercise_set_states",
+        sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+    )
+
+
+def downgrade() -> None:
+    """Drop compare-and-swap version counters."""
+    op.drop_column("exercise_set_states", "version")
+    op.drop_column("exercise_plans", "version")
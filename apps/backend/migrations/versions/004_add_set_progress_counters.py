@@ -0,0 +1,59 @@
+"""Add incremental set progress counters to plans and sessions."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "004_add_set_progress_counters"
+down_revision = "003_add_version_columns"
+branch_labels = None
+depends_on = None
+
+_COUNTERS = {
+    "pending_sets": "('PENDING', 'IN_PROGRESS')",
+    "done_sets": "('DONE')",
+    "skipped_sets": "('SKIPPED')",
+    "failed_sets": "('FAILED')",
+}
+
+
+def upgrade() -> None:
+    """Add counters and seed them once from existing set states."""
+    for table in ("exercise_plans", "exercise_sessions"):
+        for column in _COUNTERS:
+            op.add_column(
+                table,
+                sa.Column(column, sa.Integer(), nullable=False, server_default="0"),
+            )
+
+    for column, statuses in _COUNTERS.items():
+        op.execute(
+            sa.text(
+                f"""
+                UPDATE exercise_sessions SET {column} = (
+                    SELECT COUNT(*) FROM exercise_set_states
+                    WHERE exercise_set_states.session_id = exercise_sessions.id
+                    AND exercise_set_states.status IN {statuses}
+                )
+                """
+            )
+        )
+        op.execute(
+            sa.text(
+                f"""
+                UPDATE exercise_plans SET {column} = (
+                    SELECT COALESCE(SUM(exercise_sessions.{column}), 0)
+                    FROM exercise_sessions
+                    WHERE exercise_sessions.plan_id = exercise_plans.id
+                )
+                """
+            )
+        )
+
+
+def downgrade() -> None:
+    """Drop set progress counters."""
+    for table in ("exercise_sessions", "exercise_plans"):
+        for column in reversed(tuple(_COUNTERS)):
+            op.drop_column(table, column)
@@ -0,0 +1,42 @@
+"""Add per-user daily activity stats maintained from outbox events."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "005_add_user_daily_stats"
+down_revision = "004_add_set_progress_counters"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the user_daily_stats rollup table."""
+    op.create_table(
+        "user_daily_stats",
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("stat_date", sa.Date(), primary_key=True),
+        sa.Column("sets_done", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("volume_kg", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("reading_minutes", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("pages_read", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("streak_days", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("NOW()"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Drop the user_daily_stats rollup table."""
+    op.drop_table("user_daily_stats")
@@ -0,0 +1,220 @@
+"""Partition webhook and outbox events by month; move idempotency to a key table.
+
+PostgreSQL cannot enforce a unique constraint on a partitioned table unless it
+includes the partition key, so ``(provider, idempotency_key)`` and
+``(provider, event_id)`` uniqueness moves to the unpartitioned
+``webhook_event_keys`` table and both event tables get an
+``(id, created_at)`` primary key. SQLite keeps plain tables with the same keys.
+
+Partitions are created from the oldest row's month to three months ahead,
+plus a ``DEFAULT`` partition that takes rows of any month without one until
+the maintenance job creates it.
+"""
+
+from __future__ import annotations
+
+import warnings
+from datetime import UTC, date, datetime
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "006_partition_event_tables"
+down_revision = "005_add_user_daily_stats"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("webhook_events", "outbox_events")
+# SQLAlchemy warns when batch mode swaps the reflected primary key, as intended.
+_PRIMARY_KEY_REPLACED = ".*specifies columns .* as primary_key=True"
+# Copied rather than imported from ``partitions`` so this revision keeps
+# producing the same schema when the maintenance code changes.
+_MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    """Create the key table, then partition both event tables."""
+    op.create_table(
+        "webhook_event_keys",
+        sa.Column("provider", sa.String(length=80), primary_key=True),
+        sa.Column("idempotency_key", sa.String(length=255), primary_key=True),
+        sa.Column("event_id", sa.String(length=255)),
+        sa.Column("webhook_event_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("NOW()"),
+        ),
+        sa.UniqueConstraint(
+            "provider", "event_id", name="uq_webhook_event_keys_provider_event_id"
+        ),
+    )
+    op.create_index(
+        "ix_webhook_event_keys_created_at", "webhook_event_keys", ["created_at"]
+    )
+    op.execute(
+        "INSERT INTO webhook_event_keys "
+        "(provider, idempotency_key, event_id, webhook_event_id, created_at) "
+        "SELECT provider, idempotency_key, event_id, id, created_at "
+        "FROM webhook_events"
+    )
+
+    if op.get_context().dialect.name == "postgresql":
+        for table in _TABLES:
+            _partition(table)
+        _create_event_indexes()
+        op.create_foreign_key(
+            "fk_webhook_events_user_id",
+            "webhook_events",
+            "users",
+            ["user_id"],
+            ["id"],
+            ondelete="RESTRICT",
+        )
+        return
+
+    op.drop_index("ix_webhook_events_provider_event_id", table_name="webhook_events")
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", _PRIMARY_KEY_REPLACED)
+        with op.batch_alter_table("webhook_events", recreate="always") as batch_op:
+            batch_op.drop_constraint(
+                "uq_webhook_events_provider_idempotency", type_="unique"
+            )
+            batch_op.create_primary_key("pk_webhook_events", ["id", "created_at"])
+        with op.batch_alter_table("outbox_events", recreate="always") as batch_op:
+            batch_op.create_primary_key("pk_outbox_events", ["id", "created_at"])
+    op.create_index(
+        "ix_webhook_events_provider_key",
+        "webhook_events",
+        ["provider", "idempotency_key"],
+    )
+    op.create_index(
+        "ix_webhook_events_provider_event_id",
+        "webhook_events",
+        ["provider", "event_id"],
+    )
+
+
+def downgrade() -> None:
+    """Restore unpartitioned tables with their original unique constraints."""
+    if op.get_context().dialect.name == "postgresql":
+        for table in _TABLES:
+            _unpartition(table)
+        _create_event_indexes(legacy=True)
+        op.create_foreign_key(
+            "webhook_events_user_id_fkey",
+            "webhook_events",
+            "users",
+            ["user_id"],
+            ["id"],
+            ondelete="RESTRICT",
+        )
+    else:
+        op.drop_index(
+            "ix_webhook_events_provider_event_id", table_name="webhook_events"
+        )
+        op.drop_index("ix_webhook_events_provider_key", table_name="webhook_events")
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", _PRIMARY_KEY_REPLACED)
+            with op.batch_alter_table("outbox_events", recreate="always") as batch_op:
+                batch_op.create_primary_key("pk_outbox_events", ["id"])
+            with op.batch_alter_table("webhook_events", recreate="always") as batch_op:
+                batch_op.create_primary_key("pk_webhook_events", ["id"])
+                batch_op.create_unique_constraint(
+                    "uq_webhook_events_provider_idempotency",
+                    ["provider", "idempotency_key"],
+                )
+        op.create_index(
+            "ix_webhook_events_provider_event_id",
+            "webhook_events",
+            ["provider", "event_id"],
+            unique=True,
+        )
+
+    op.drop_index("ix_webhook_event_keys_created_at", table_name="webhook_event_keys")
+    op.drop_table("webhook_event_keys")
+
+
+def _partition(table: str) -> None:
+    """Copy ``table`` into a range-partitioned table of the same shape."""
+    old = f"{table}_unpartitioned"
+    op.rename_table(table, old)
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        " PARTITION BY RANGE (created_at)"
+    )
+    oldest = op.get_bind().scalar(sa.text(f"SELECT MIN(created_at) FROM {old}"))
+    today = datetime.now(UTC).date()
+    month = (oldest.date() if oldest is not None else today).replace(day=1)
+    last = _add_months(today.replace(day=1), _MONTHS_AHEAD)
+    while month <= last:
+        following = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d} 00:00:00+00') "
+            f"TO ('{following:%Y-%m-%d} 00:00:00+00')"
+        )
+        month = following
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    op.drop_table(old)
+    op.create_primary_key(f"pk_{table}", table, ["id", "created_at"])
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _unpartition(table: str) -> None:
+    """Copy a partitioned ``table`` back into a plain one keyed by ``id``."""
+    partitioned = f"{table}_partitioned"
+    op.rename_table(table, partitioned)
+    op.execute(
+        f"CREATE TABLE {table} "
+        f"(LIKE {partitioned} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    op.execute(f"INSERT INTO {table} SELECT * FROM {partitioned}")
+    # Dropping the parent drops every attached partition with it.
+    op.drop_table(partitioned)
+    op.create_primary_key(f"{table}_pkey", table, ["id"])
+
+
+def _create_event_indexes(*, legacy: bool = False) -> None:
+    """Indexes of both tables; ``legacy`` restores the pre-006 unique ones."""
+    if legacy:
+        op.create_unique_constraint(
+            "uq_webhook_events_provider_idempotency",
+            "webhook_events",
+            ["provider", "idempotency_key"],
+        )
+    else:
+        op.create_index(
+            "ix_webhook_events_provider_key",
+            "webhook_events",
+            ["provider", "idempotency_key"],
+        )
+    op.create_index(
+        "ix_webhook_events_provider_event_id",
+        "webhook_events",
+        ["provider", "event_id"],
+        unique=legacy,
+    )
+    op.create_index(
+        "ix_webhook_events_processed_created",
+        "webhook_events",
+        ["processed", "created_at"],
+    )
+    op.create_index(
+        "ix_webhook_events_signature_state", "webhook_events", ["signature_state"]
+    )
+    op.create_index(
+        "ix_webhook_events_provider_schema",
+        "webhook_events",
+        ["provider", "schema_version"],
+    )
+    op.create_index(
+        "ix_outbox_events_status_retry", "outbox_events", ["status", "retry_count"]
+    )
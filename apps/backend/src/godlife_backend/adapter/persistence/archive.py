@@ -0,0 +1,362 @@
+"""Archive processed outbox and webhook rows to compressed files, then delete them.
+
+Rows are streamed out of the hot table in keyset-paged chunks ordered by
+``(created_at, id)``. Each chunk is written under
+``<root>/<table>/dt=YYYY-MM-DD/`` (one file per day it touches) and only then
+deleted from the table in bounded batches, each in its own transaction.
+
+Formats:
+
+- ``ndjson``: one JSON object per line, compressed with zstd when the optional
+  ``archive`` extra (``zstandard``) is installed and with gzip otherwise.
+- ``parquet``: zstd-compressed Parquet; requires ``pyarrow`` from the same
+  extra. JSON payload columns are stored as JSON text.
+
+A crash between writing a chunk and deleting it archives those rows again on
+the next run, so the archive is at-least-once; :func:`read_archive` drops the
+repeats. Detached partitions (``partitions --detach-only``) are archived whole
+with :func:`archive_partition`.
+
+    python -m godlife_backend.adapter.persistence.archive archive --root /data/archive
+    python -m godlife_backend.adapter.persistence.archive scan --root /data/archive \\
+        --table outbox_events --from 2026-01-01 --to 2026-01-31
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import io
+import json
+import logging
+import os
+import sys
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from enum import Enum
+from pathlib import Path
+from typing import IO, Literal, cast
+from uuid import UUID, uuid4
+
+import sqlalchemy as sa
+from godlife_backend.adapter.persistence.partitions import is_detached_partition
+from godlife_backend.db import models
+from godlife_backend.db.enums import OutboxStatus
+from godlife_backend.domain.payload import JsonPayload
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised when the extra is absent
+    zstandard = None  # type: ignore[assignment]
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised when the extra is absent
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+ArchiveFormat = Literal["ndjson", "parquet"]
+ArchiveRow = dict[str, object]
+
+CHUNK_SIZE = 5_000
+DELETE_BATCH_SIZE = 1_000
+NDJSON_SUFFIX = ".ndjson.zst" if zstandard is not None else ".ndjson.gz"
+
+_WEBHOOK_EVENTS = cast(sa.Table, models.WebhookEvent.__table__)
+_OUTBOX = cast(sa.Table, models.OutboxEvent.__table__)
+_TABLES: Mapping[str, sa.Table] = {
+    "webhook_events": _WEBHOOK_EVENTS,
+    "outbox_events": _OUTBOX,
+}
+# Only finished rows leave the hot tables: FAILED outbox events and
+# unprocessed webhooks stay for the manual review queue.
+_ARCHIVABLE: Mapping[str, sa.ColumnElement[bool]] = {
+    "webhook_events": _WEBHOOK_EVENTS.c.processed.is_(True),
+    "outbox_events": _OUTBOX.c.status == OutboxStatus.COMPLETED,
+}
+_JSON_COLUMNS = frozenset({"raw_payload", "payload"})
+
+
+@dataclass(frozen=True, slots=True)
+class ArchiveResult:
+    table: str
+    rows: int
+    files: tuple[Path, ...]
+
+
+def archive_table(
+    engine: sa.Engine,
+    table: str,
+    root: Path,
+    *,
+    older_than: timedelta,
+    now: datetime | None = None,
+    fmt: ArchiveFormat = "ndjson",
+    chunk_size: int = CHUNK_SIZE,
+    delete_batch_size: int = DELETE_BATCH_SIZE,
+) -> ArchiveResult:
+    """Move archivable rows created more than ``older_than`` ago into ``root``."""
+
+    target = _TABLES[table]
+    cutoff = (now or datetime.now(UTC)) - older_than
+    key = (target.c.created_at, target.c.id)
+    query = (
+        sa.select(target)
+        .where(_ARCHIVABLE[table], target.c.created_at < cutoff)
+        .order_by(*key)
+        .limit(chunk_size)
+    )
+    rows_archived = 0
+    files: list[Path] = []
+    last: tuple[datetime, UUID] | None = None
+    while True:
+        page = query if last is None else query.where(sa.tuple_(*key) > last)
+        with engine.connect() as conn:
+            rows = [dict(row) for row in conn.execute(page).mappings()]
+        if not rows:
+            break
+        files.extend(write_chunk(root, table, rows, fmt))
+        _delete_rows(engine, target, rows, delete_batch_size)
+        rows_archived += len(rows)
+        last = (rows[-1]["created_at"], rows[-1]["id"])
+    logger.info("archived %d %s rows into %d files", rows_archived, table, len(files))
+    return ArchiveResult(table, rows_archived, tuple(files))
+
+
+def archive_partition(
+    engine: sa.Engine,
+    table: str,
+    partition: str,
+    root: Path,
+    *,
+    fmt: ArchiveFormat = "ndjson",
+    chunk_size: int = CHUNK_SIZE,
+) -> ArchiveResult:
+    """Archive every row of a detached partition of ``table``, then drop it.
+
+    Raises ``ValueError`` unless ``partition`` is a monthly partition of
+    ``table`` that is no longer attached, so a mistyped name can never drop
+    a live table.
+    """
+
+    target = _TABLES[table]
+    source = sa.Table(
+        partition,
+        sa.MetaData(),
+        *(sa.Column(column.name, column.type) for column in target.columns),
+    )
+    query = sa.select(source).order_by(source.c.created_at, source.c.id)
+    files: list[Path] = []
+    rows_archived = 0
+    with engine.connect() as conn:
+        if not is_detached_partition(conn, table, partition):
+            raise ValueError(f"{partition} is not a detached partition of {table}")
+        result = conn.execution_options(yield_per=chunk_size).execute(query)
+        for chunk in result.mappings().partitions():
+            rows = [dict(row) for row in chunk]
+            files.extend(write_chunk(root, table, rows, fmt))
+            rows_archived += len(rows)
+    with engine.begin() as conn:
+        # Checked again in the dropping transaction: it may have been
+        # re-attached while the rows were being written.
+        if not is_detached_partition(conn, table, partition):
+            raise ValueError(f"{partition} is not a detached partition of {table}")
+        conn.execute(sa.schema.DropTable(source))
+    logger.info("archived partition %s: %d rows", partition, rows_archived)
+    return ArchiveResult(table, rows_archived, tuple(files))
+
+
+def _delete_rows(
+    engine: sa.Engine, target: sa.Table, rows: Sequence[ArchiveRow], batch_size: int
+) -> None:
+    key = sa.tuple_(target.c.id, target.c.created_at)
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start : start + batch_size]
+        with engine.begin() as conn:
+            conn.execute(
+                sa.delete(target).where(
+                    key.in_([(row["id"], row["created_at"]) for row in batch])
+                )
+            )
+
+
+def write_chunk(
+    root: Path, table: str, rows: Sequence[ArchiveRow], fmt: ArchiveFormat
+) -> list[Path]:
+    """Write ``rows`` to one new file per ``created_at`` day; return the paths."""
+
+    by_day: dict[date, list[ArchiveRow]] = {}
+    for row in rows:
+        record = {name: _plain(value) for name, value in row.items()}
+        day = _aware(cast(datetime, row["created_at"])).date()
+        by_day.setdefault(day, []).append(record)
+
+    paths: list[Path] = []
+    for day, records in by_day.items():
+        directory = root / table / f"dt={day:%Y-%m-%d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        suffix = ".parquet" if fmt == "parquet" else NDJSON_SUFFIX
+        path = directory / f"part-{uuid4().hex}{suffix}"
+        partial = path.with_name(path.name + ".tmp")
+        if fmt == "parquet":
+            _write_parquet(partial, records)
+        else:
+            _write_ndjson(partial, records)
+        # Readers never see a half-written file.
+        os.replace(partial, path)
+        paths.append(path)
+    return paths
+
+
+def _plain(value: object) -> object:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return _aware(value).isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, JsonPayload):
+        return dict(value)
+    return value
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes for timezone-aware columns.
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+def _write_ndjson(path: Path, records: Sequence[ArchiveRow]) -> None:
+    lines = b"".join(
+        json.dumps(record, separators=(",", ":")).encode() + b"\n" for record in records
+    )
+    if zstandard is not None:
+        path.write_bytes(zstandard.ZstdCompressor(level=9).compress(lines))
+    else:
+        path.write_bytes(gzip.compress(lines))
+
+
+def _write_parquet(path: Path, records: Sequence[ArchiveRow]) -> None:
+    if pa is None or pq is None:
+        raise RuntimeError("Parquet archives need the 'archive' extra (pyarrow)")
+    columns = {
+        name: [
+            json.dumps(record[name]) if name in _JSON_COLUMNS else record[name]
+            for record in records
+        ]
+        for name in records[0]
+    }
+    pq.write_table(pa.table(columns), path, compression="zstd")
+
+
+def read_archive(
+    root: Path,
+    table: str,
+    *,
+    start: date | None = None,
+    end: date | None = None,
+) -> Iterator[ArchiveRow]:
+    """Yield archived rows of ``table`` created between ``start`` and ``end``.
+
+    Both bounds are inclusive days. Files are read one at a time, in day order,
+    and rows archived twice after an interrupted run are yielded once.
+    """
+
+    seen: set[str] = set()
+    for directory in sorted((root / table).glob("dt=*")):
+        day = date.fromisoformat(directory.name.removeprefix("dt="))
+        if (start is not None and day < start) or (end is not None and day > end):
+            continue
+        for path in sorted(directory.iterdir()):
+            for row in _read_file(path):
+                row_id = cast(str, row["id"])
+                if row_id not in seen:
+                    seen.add(row_id)
+                    yield row
+        seen.clear()
+
+
+def _read_file(path: Path) -> Iterator[ArchiveRow]:
+    name = path.name
+    if name.endswith(".parquet"):
+        if pq is None:
+            raise RuntimeError("Parquet archives need the 'archive' extra (pyarrow)")
+        for record in pq.read_table(path).to_pylist():
+            for column in _JSON_COLUMNS.intersection(record):
+                record[column] = json.loads(record[column])
+            yield record
+        return
+    if name.endswith(".ndjson.zst"):
+        if zstandard is None:
+            raise RuntimeError("zstd archives need the 'archive' extra (zstandard)")
+        stream: IO[bytes] = zstandard.ZstdDecompressor().stream_reader(path.open("rb"))
+    elif name.endswith(".ndjson.gz"):
+        stream = gzip.open(path, "rb")
+    else:
+        # Leftover ``.tmp`` files from an interrupted write.
+        return
+    with stream, io.TextIOWrapper(stream, encoding="utf-8") as lines:
+        for line in lines:
+            yield json.loads(line)
+
+
+def main(argv: list[str] | None = None) -> None:
+    from godlife_backend.adapter.persistence.session import _engine
+
+    parser = argparse.ArgumentParser(description="Archive or scan processed events.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    archive = commands.add_parser("archive", help="move old processed rows out")
+    archive.add_argument("--root", type=Path, required=True)
+    archive.add_argument("--table", choices=sorted(_TABLES), action="append")
+    archive.add_argument("--older-than-days", type=int, default=30)
+    archive.add_argument("--format", choices=["ndjson", "parquet"], default="ndjson")
+    archive.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    archive.add_argument(
+        "--partition",
+        help="archive and drop this detached partition of --table instead",
+    )
+    scan = commands.add_parser("scan", help="print archived rows as NDJSON")
+    scan.add_argument("--root", type=Path, required=True)
+    scan.add_argument("--table", choices=sorted(_TABLES), required=True)
+    scan.add_argument("--from", dest="start", type=date.fromisoformat)
+    scan.add_argument("--to", dest="end", type=date.fromisoformat)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "scan":
+        for row in read_archive(args.root, args.table, start=args.start, end=args.end):
+            sys.stdout.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return
+
+    tables = args.table or sorted(_TABLES)
+    if args.partition is not None:
+        if len(tables) != 1:
+            parser.error("--partition needs exactly one --table")
+        try:
+            archive_partition(
+                _engine(),
+                tables[0],
+                args.partition,
+                args.root,
+                fmt=args.format,
+                chunk_size=args.chunk_size,
+            )
+        except ValueError as exc:
+            parser.error(str(exc))
+        return
+    for table in tables:
+        archive_table(
+            _engine(),
+            table,
+            args.root,
+            older_than=timedelta(days=args.older_than_days),
+            fmt=args.format,
+            chunk_size=args.chunk_size,
+        )
+
+
+if __name__ == "__main__":
+    main()
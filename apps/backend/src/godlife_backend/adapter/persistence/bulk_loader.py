@@ -0,0 +1,304 @@
+"""Stream domain entities into their tables for seeding and backfills.
+
+On PostgreSQL rows go through psycopg's binary ``COPY ... FROM STDIN``: no SQL
+is parsed per row and values are sent in their wire format, which is an order
+of magnitude faster than ``INSERT`` batches. Other dialects (SQLite in
+development and tests) fall back to ``executemany`` inserts.
+
+Entities are consumed lazily and at most ``chunk_size`` rows are held at once,
+so generators of any length can be loaded. The caller owns the transaction:
+nothing is committed here.
+
+Loading ``ExerciseSetState`` rows also adds them to the set progress counters
+of their sessions and plans, as ``ExerciseSetStateRepository.save`` does for a
+new set, so sessions and plans must be loaded first. Loading ``WebhookEvent``
+rows writes each chunk's idempotency keys to ``webhook_event_keys`` as well,
+as ``WebhookEventRepository.save`` does, so later deliveries of a loaded event
+are still recognised as duplicates.
+
+    with Session(engine) as session:
+        bulk_load(session, User, (User(kakao_user_id=f"k{n}") for n in range(10**7)))
+        session.commit()
+"""
+
+from __future__ import annotations
+
+import operator
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import fields
+from itertools import batched, islice
+from typing import Any, Protocol, cast
+from uuid import UUID
+
+import sqlalchemy as sa
+from godlife_backend.db import models
+from godlife_backend.db.types import JsonPayloadType, payload_json
+from godlife_backend.domain.entities import (
+    ExercisePlan,
+    ExerciseSession,
+    ExerciseSetState,
+    Notification,
+    OutboxEvent,
+    ReadingLog,
+    ReadingPlan,
+    User,
+    UserDailyStats,
+    UserProfile,
+    WebhookEvent,
+)
+from godlife_backend.domain.progress import SET_COUNTER_FIELDS, set_counter_deltas
+from sqlalchemy.orm import Session
+
+CHUNK_SIZE = 10_000
+
+ENTITY_TABLES: Mapping[type, sa.Table] = {
+    entity_type: cast(sa.Table, model.__table__)
+    for entity_type, model in [
+        (User, models.User),
+        (UserProfile, models.UserProfile),
+        (ExercisePlan, models.ExercisePlan),
+        (ExerciseSession, models.ExerciseSession),
+        (ExerciseSetState, models.ExerciseSetState),
+        (ReadingPlan, models.ReadingPlan),
+        (ReadingLog, models.ReadingLog),
+        (UserDailyStats, models.UserDailyStats),
+        (Notification, models.Notification),
+        (WebhookEvent, models.WebhookEvent),
+        (OutboxEvent, models.OutboxEvent),
+    ]
+}
+
+_WEBHOOK_EVENT_KEYS = cast(sa.Table, models.WebhookEventKey.__table__)
+_WEBHOOK_KEY_COLUMNS = (
+    "provider",
+    "idempotency_key",
+    "event_id",
+    "webhook_event_id",
+    "created_at",
+)
+
+_Row = tuple[Any, ...]
+
+
+class _Versioned(Protocol):
+    version: int
+
+
+_Value = Callable[[object], object]
+
+
+def bulk_load[E](
+    session: Session,
+    entity_type: type[E],
+    entities: Iterable[E],
+    *,
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """Insert ``entities`` into ``entity_type``'s table; return the row count.
+
+    Rows are inserted as-is, so keys must not exist yet. Versioned entities
+    that were never persisted (``version == 0``) are stored as version 1, as
+    their repository's first ``save`` would. Set states are counted on their
+    already stored sessions and plans; entities in memory are not updated.
+    Webhook events claim their keys, and a key that is already claimed fails
+    the load like any other existing key.
+    """
+
+    table = ENTITY_TABLES[entity_type]
+    columns, values = _column_plan(entity_type, table)
+    load = _copy if session.get_bind().dialect.name == "postgresql" else _insert
+    if entity_type is WebhookEvent:
+        loaded = 0
+        for chunk in batched(
+            cast(Iterable[WebhookEvent], entities), chunk_size, strict=False
+        ):
+            rows = ((value(event) for value in values) for event in chunk)
+            loaded += load(session, table, columns, rows, chunk_size)
+            load(
+                session,
+                _WEBHOOK_EVENT_KEYS,
+                _WEBHOOK_KEY_COLUMNS,
+                map(_webhook_key_row, chunk),
+                chunk_size,
+            )
+        return loaded
+    counters = _SetCounters() if entity_type is ExerciseSetState else None
+    if counters is not None:
+        entities = cast(
+            Iterable[E], counters.tally(cast(Iterable[ExerciseSetState], entities))
+        )
+    rows = ((value(entity) for value in values) for entity in entities)
+    loaded = load(session, table, columns, rows, chunk_size)
+    if counters is not None:
+        counters.apply(session, chunk_size)
+    return loaded
+
+
+def _webhook_key_row(event: WebhookEvent) -> _Row:
+    return (
+        event.provider,
+        event.idempotency_key,
+        event.event_id,
+        event.id,
+        event.created_at,
+    )
+
+
+def _insert(
+    session: Session,
+    table: sa.Table,
+    columns: Sequence[str],
+    rows: Iterable[Iterable[object]],
+    chunk_size: int,
+) -> int:
+    statement = sa.insert(table)
+    loaded = 0
+    for chunk in _chunks(rows, chunk_size):
+        session.execute(
+            statement, [dict(zip(columns, row, strict=True)) for row in chunk]
+        )
+        loaded += len(chunk)
+    return loaded
+
+
+class _SetCounters:
+    """Counter increments of loaded set states, applied once per session."""
+
+    def __init__(self) -> None:
+        self._deltas: defaultdict[UUID, Counter[str]] = defaultdict(Counter)
+
+    def tally(self, states: Iterable[ExerciseSetState]) -> Iterator[ExerciseSetState]:
+        for state in states:
+            self._deltas[state.session_id].update(
+                set_counter_deltas(None, state.status)
+            )
+            yield state
+
+    def apply(self, session: Session, chunk_size: int) -> None:
+        sessions = ENTITY_TABLES[ExerciseSession]
+        plans = ENTITY_TABLES[ExercisePlan]
+        plan_id = (
+            sa.select(sessions.c.plan_id)
+            .where(sessions.c.id == sa.bindparam("session_id"))
+            .scalar_subquery()
+        )
+        statements = [
+            sa.update(sessions)
+            .where(sessions.c.id == sa.bindparam("session_id"))
+            .values(_incremented(sessions)),
+            # As in the repository, the plan's version moves with its counters.
+            sa.update(plans)
+            .where(plans.c.id == plan_id)
+            .values({**_incremented(plans), "version": plans.c.version + 1}),
+        ]
+        # Sorted so concurrent loads lock sessions and plans in the same order.
+        params = (
+            {
+                "session_id": session_id,
+                **{f"delta_{name}": deltas[name] for name in SET_COUNTER_FIELDS},
+            }
+            for session_id, deltas in sorted(self._deltas.items())
+        )
+        while chunk := list(islice(params, chunk_size)):
+            for statement in statements:
+                session.execute(statement, chunk)
+
+
+def _incremented(table: sa.Table) -> dict[str, sa.ColumnElement[Any]]:
+    return {
+        name: table.c[name] + sa.bindparam(f"delta_{name}", type_=sa.Integer)
+        for name in SET_COUNTER_FIELDS
+    }
+
+
+def _column_plan(entity_type: type, table: sa.Table) -> tuple[list[str], list[_Value]]:
+    """Columns the entity carries and how to read each one's value.
+
+    Columns the entity lacks (delivery details of notifications, for example)
+    are left out and keep their defaults.
+    """
+
+    names = {f.name for f in fields(cast(Any, entity_type))}
+    columns = [column.name for column in table.columns if column.name in names]
+    return columns, [_attribute(name) for name in columns]
+
+
+def _attribute(name: str) -> _Value:
+    if name != "version":
+        return operator.attrgetter(name)
+
+    def first_version(entity: object) -> int:
+        versioned = cast(_Versioned, entity)
+        versioned.version = versioned.version or 1
+        return versioned.version
+
+    return first_version
+
+
+def _chunks(rows: Iterable[Iterable[object]], size: int) -> Iterator[list[_Row]]:
+    iterator = iter(rows)
+    while chunk := [tuple(row) for row in islice(iterator, size)]:
+        yield chunk
+
+
+def _copy(
+    session: Session,
+    table: sa.Table,
+    columns: Sequence[str],
+    rows: Iterable[Iterable[object]],
+    chunk_size: int,
+) -> int:
+    # ``session.connection()`` opens the session transaction the COPY joins.
+    from psycopg.types.json import Jsonb
+
+    driver = cast(Any, session.connection().connection.driver_connection)
+    type_oids = _column_type_oids(session, table, columns)
+    column_list = ", ".join(columns)
+    # Payloads go out as their stored JSON bytes (see ``JsonPayloadType``).
+    payloads = {
+        index
+        for index, name in enumerate(columns)
+        if isinstance(table.c[name].type, JsonPayloadType)
+    }
+    loaded = 0
+    with driver.cursor() as cursor:
+        for chunk in _chunks(rows, chunk_size):
+            with cursor.copy(
+                f"COPY {table.name} ({column_list}) FROM STDIN (FORMAT BINARY)"
+            ) as copy:
+                copy.set_types(type_oids)
+                for row in chunk:
+                    copy.write_row(
+                        [
+                            Jsonb(value, dumps=payload_json)
+                            if index in payloads and value is not None
+                            else value
+                            for index, value in enumerate(row)
+                        ]
+                    )
+            loaded += len(chunk)
+    return loaded
+
+
+def _column_type_oids(
+    session: Session, table: sa.Table, columns: Sequence[str]
+) -> list[int]:
+    """Actual column types, so binary dumpers match what migrations created.
+
+    Native enum columns (``create_all`` schemas) share text's binary format.
+    """
+
+    rows = session.execute(
+        sa.text(
+            "SELECT a.attname,"
+            " CASE WHEN t.typtype = 'e' THEN 'text'::regtype::oid"
+            " ELSE a.atttypid END"
+            " FROM pg_attribute a JOIN pg_type t ON t.oid = a.atttypid"
+            " WHERE a.attrelid = CAST(:table AS regclass)"
+            " AND a.attnum > 0 AND NOT a.attisdropped"
+        ),
+        {"table": table.name},
+    )
+    oids = {name: oid for name, oid in rows}
+    return [oids[column] for column in columns]
@@ -0,0 +1,188 @@
+"""Chunked, parallel recomputation of ``user_daily_stats`` from history."""
+
+from __future__ import annotations
+
+import argparse
+from collections import defaultdict
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import UTC, date, datetime, timedelta
+from typing import cast
+from uuid import UUID
+
+import sqlalchemy as sa
+from godlife_backend.db import models
+from godlife_backend.db.enums import SetStatus
+from godlife_backend.domain.entities import ReadingLog, UserDailyStats
+from godlife_backend.domain.stats import reading_log_contribution, user_zone
+from sqlalchemy.orm import Session
+
+_USERS = cast(sa.Table, models.User.__table__)
+_PLANS = cast(sa.Table, models.ExercisePlan.__table__)
+_SESSIONS = cast(sa.Table, models.ExerciseSession.__table__)
+_SET_STATES = cast(sa.Table, models.ExerciseSetState.__table__)
+_READING_LOGS = cast(sa.Table, models.ReadingLog.__table__)
+_DAILY_STATS = cast(sa.Table, models.UserDailyStats.__table__)
+
+SessionFactory = Callable[[], Session]
+
+
+def backfill_user_daily_stats(
+    session_factory: SessionFactory,
+    *,
+    chunk_size: int = 500,
+    workers: int = 4,
+) -> int:
+    """Rebuild every user's daily stats and return the number of rows written.
+
+    Users are processed in keyset-paged chunks of ``chunk_size``; each chunk is
+    aggregated and replaced in its own transaction on one of ``workers``
+    threads, and at most ``2 * workers`` chunks are queued at a time so memory
+    stays bounded. Run it with the outbox stats projector paused, otherwise
+    increments applied mid-chunk are overwritten by the recomputed snapshot.
+    """
+
+    written = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight: set[Future[int]] = set()
+        for user_ids in _user_id_chunks(session_factory, chunk_size):
+            if len(in_flight) >= 2 * workers:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                written += sum(future.result() for future in done)
+            in_flight.add(executor.submit(_backfill_chunk, session_factory, user_ids))
+        written += sum(future.result() for future in in_flight)
+    return written
+
+
+def _user_id_chunks(
+    session_factory: SessionFactory, chunk_size: int
+) -> Iterator[list[UUID]]:
+    last_id: UUID | None = None
+    with session_factory() as session:
+        while True:
+            statement = sa.select(_USERS.c.id).order_by(_USERS.c.id).limit(chunk_size)
+            if last_id is not None:
+                statement = statement.where(_USERS.c.id > last_id)
+            user_ids = list(session.scalars(statement))
+            if not user_ids:
+                return
+            yield user_ids
+            last_id = user_ids[-1]
+
+
+def _backfill_chunk(session_factory: SessionFactory, user_ids: Sequence[UUID]) -> int:
+    with session_factory() as session, session.begin():
+        totals: defaultdict[tuple[UUID, date], UserDailyStats] = defaultdict(
+            UserDailyStats
+        )
+
+        set_rows = session.execute(
+            sa.select(
+                _PLANS.c.user_id,
+                _PLANS.c.target_date,
+                sa.func.count(_SET_STATES.c.id),
+                sa.func.sum(
+                    sa.func.coalesce(_SET_STATES.c.performed_reps, 0)
+                    * sa.func.coalesce(_SET_STATES.c.performed_weight_kg, 0.0)
+                ),
+            )
+            .select_from(
+                _SET_STATES.join(
+                    _SESSIONS, _SESSIONS.c.id == _SET_STATES.c.session_id
+                ).join(_PLANS, _PLANS.c.id == _SESSIONS.c.plan_id)
+            )
+            .where(
+                _PLANS.c.user_id.in_(user_ids),
+                _SET_STATES.c.status == SetStatus.DONE,
+            )
+            .group_by(_PLANS.c.user_id, _PLANS.c.target_date)
+        )
+        for user_id, target_date, sets_done, volume in set_rows:
+            row = totals[(user_id, target_date)]
+            row.sets_done += sets_done
+            row.volume_kg += float(volume or 0.0)
+
+        log_rows = session.execute(
+            sa.select(
+                _READING_LOGS.c.user_id,
+                _USERS.c.timezone,
+                _READING_LOGS.c.start_at,
+                _READING_LOGS.c.end_at,
+                _READING_LOGS.c.pages_read,
+            )
+            .join(_USERS, _USERS.c.id == _READING_LOGS.c.user_id)
+            .where(
+                _READING_LOGS.c.user_id.in_(user_ids),
+                _READING_LOGS.c.start_at.is_not(None),
+            )
+        )
+        for user_id, timezone, start_at, end_at, pages_read in log_rows:
+            contribution = reading_log_contribution(
+                ReadingLog(start_at=start_at, end_at=end_at, pages_read=pages_read),
+                user_zone(timezone),
+            )
+            if contribution is None:
+                continue
+            stat_date, minutes, pages = contribution
+            row = totals[(user_id, stat_date)]
+            row.reading_minutes += minutes
+            row.pages_read += pages
+
+        rows = _with_streaks(totals)
+        session.execute(
+            sa.delete(_DAILY_STATS).where(_DAILY_STATS.c.user_id.in_(user_ids))
+        )
+        if rows:
+            session.execute(sa.insert(_DAILY_STATS), rows)
+        return len(rows)
+
+
+def _with_streaks(
+    totals: dict[tuple[UUID, date], UserDailyStats],
+) -> list[dict[str, object]]:
+    now = datetime.now(UTC)
+    rows: list[dict[str, object]] = []
+    previous: UserDailyStats | None = None
+    for (user_id, stat_date), stats in sorted(totals.items()):
+        stats.user_id = user_id
+        stats.stat_date = stat_date
+        if stats.is_active:
+            stats.streak_days = 1
+            if (
+                previous is not None
+                and previous.user_id == user_id
+                and previous.stat_date == stat_date - timedelta(days=1)
+                and previous.is_active
+            ):
+                stats.streak_days += previous.streak_days
+        rows.append(
+            {
+                "user_id": user_id,
+                "stat_date": stat_date,
+                "sets_done": stats.sets_done,
+                "volume_kg": stats.volume_kg,
+                "reading_minutes": stats.reading_minutes,
+                "pages_read": stats.pages_read,
+                "streak_days": stats.streak_days,
+                "updated_at": now,
+            }
+        )
+        previous = stats
+    return rows
+
+
+def main() -> None:
+    from godlife_backend.adapter.persistence.session import _session_factory
+
+    parser = argparse.ArgumentParser(description="Rebuild user_daily_stats.")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    written = backfill_user_daily_stats(
+        _session_factory(), chunk_size=args.chunk_size, workers=args.workers
+    )
+    print(f"user_daily_stats rows written: {written}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+"""Monthly range partitions of append-only tables and their retention.
+
+On PostgreSQL ``webhook_events`` and ``outbox_events`` are range-partitioned
+on ``created_at`` by month (migration ``006``). Maintenance keeps
+``MONTHS_AHEAD`` future partitions in place and retires expired months by
+detaching, and optionally dropping, whole partitions. That is O(1) per month
+and leaves no dead tuples behind, unlike a bulk ``DELETE``.
+
+Each table also has a ``DEFAULT`` partition, so an insert for a month without
+a partition (the job stopped running, a far-off clock) is stored rather than
+rejected. The job reports rows found there, moves them into the monthly
+partition once it creates it, and deletes them once they expire.
+
+SQLite (local development) has plain tables; retention falls back to
+``DELETE`` in bounded batches there, and on any table that is not partitioned.
+
+Run it daily: ``python -m godlife_backend.adapter.persistence.partitions``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from typing import Literal, cast
+
+import sqlalchemy as sa
+from godlife_backend.db import models
+from godlife_backend.db.enums import OutboxStatus
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("webhook_events", "outbox_events")
+MONTHS_AHEAD = 3
+DEFAULT_RETENTION_MONTHS: Mapping[str, int] = {"webhook_events": 6, "outbox_events": 2}
+DELETE_BATCH_SIZE = 5_000
+
+RetentionMode = Literal["drop", "detach"]
+
+_WEBHOOK_EVENT_KEYS = cast(sa.Table, models.WebhookEventKey.__table__)
+_TABLES: Mapping[str, sa.Table] = {
+    "webhook_events": cast(sa.Table, models.WebhookEvent.__table__),
+    "outbox_events": cast(sa.Table, models.OutboxEvent.__table__),
+}
+# Outbox rows still owed a delivery must survive retention.
+_UNFINISHED_OUTBOX = (OutboxStatus.PENDING, OutboxStatus.IN_FLIGHT)
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def _bound(month: date) -> str:
+    return f"{month:%Y-%m-%d} 00:00:00+00"
+
+
+def create_partition_sql(table: str, month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+        f"PARTITION OF {table} FOR VALUES FROM ('{_bound(month)}') "
+        f"TO ('{_bound(add_months(month, 1))}')"
+    )
+
+
+def create_default_partition_sql(table: str) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {default_partition_name(table)} "
+        f"PARTITION OF {table} DEFAULT"
+    )
+
+
+def is_partitioned(conn: sa.Connection, table: str) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(
+        conn.scalar(
+            sa.text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.relname = :table AND pg_table_is_visible(c.oid))"
+            ),
+            {"table": table},
+        )
+    )
+
+
+def list_partitions(conn: sa.Connection, table: str) -> dict[date, str]:
+    """Monthly partitions attached to ``table``, keyed by their first day.
+
+    The default partition and any other partition not named by
+    :func:`partition_name` are left out.
+    """
+
+    names = conn.scalars(
+        sa.text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table AND pg_table_is_visible(p.oid)"
+        ),
+        {"table": table},
+    )
+    partitions: dict[date, str] = {}
+    for name in names:
+        month = partition_month(table, name)
+        if month is not None:
+            partitions[month] = name
+    return partitions
+
+
+def partition_month(table: str, name: str) -> date | None:
+    """The month ``name`` holds if :func:`partition_name` made it for ``table``."""
+
+    year, _, month = name.removeprefix(f"{table}_p").partition("_")
+    if not name.startswith(f"{table}_p") or len(year) != 4 or len(month) != 2:
+        return None
+    if not (year.isdigit() and month.isdigit() and 1 <= int(month) <= 12):
+        return None
+    return date(int(year), int(month), 1)
+
+
+def is_detached_partition(conn: sa.Connection, table: str, name: str) -> bool:
+    """Whether ``name`` is a monthly partition of ``table`` detached from it.
+
+    A detached partition keeps its name but loses every catalog link to its
+    parent, so the name must be one :func:`partition_name` gives ``table`` and
+    the table must be a plain one no longer in ``pg_inherits``, either as a
+    partition (attached, or detaching concurrently) or as a parent.
+    """
+
+    if conn.dialect.name != "postgresql" or partition_month(table, name) is None:
+        return False
+    return bool(
+        conn.scalar(
+            sa.text(
+                "SELECT EXISTS (SELECT 1 FROM pg_class c "
+                "WHERE c.relname = :name AND pg_table_is_visible(c.oid) "
+                "AND c.relkind = 'r' AND NOT c.relispartition "
+                "AND NOT EXISTS (SELECT 1 FROM pg_inherits i "
+                "WHERE i.inhrelid = c.oid OR i.inhparent = c.oid))"
+            ),
+            {"name": name},
+        )
+    )
+
+
+def default_partition_rows(conn: sa.Connection, table: str) -> int:
+    """Rows that landed in the default partition for lack of a monthly one."""
+
+    return int(
+        conn.scalar(sa.text(f"SELECT COUNT(*) FROM {default_partition_name(table)}"))
+        or 0
+    )
+
+
+def ensure_partitions(
+    conn: sa.Connection,
+    table: str,
+    *,
+    today: date,
+    months_ahead: int = MONTHS_AHEAD,
+    first_month: date | None = None,
+) -> list[str]:
+    """Create missing monthly partitions up to ``months_ahead`` past today.
+
+    The default partition is created too if it is missing.
+    """
+
+    conn.execute(sa.text(create_default_partition_sql(table)))
+    month = month_start(first_month or today)
+    last = add_months(month_start(today), months_ahead)
+    existing = list_partitions(conn, table)
+    created: list[str] = []
+    while month <= last:
+        if month not in existing:
+            _create_partition(conn, table, month)
+            created.append(partition_name(table, month))
+        month = add_months(month, 1)
+    return created
+
+
+def _create_partition(conn: sa.Connection, table: str, month: date) -> None:
+    """Create ``month``'s partition, moving its rows out of the default one.
+
+    PostgreSQL refuses a new partition whose range matches rows already in
+    the default partition, so those rows go into a standalone table first and
+    that table is attached as the partition.
+    """
+
+    default = default_partition_name(table)
+    in_month = (
+        f"created_at >= '{_bound(month)}' "
+        f"AND created_at < '{_bound(add_months(month, 1))}'"
+    )
+    if not conn.scalar(
+        sa.text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_month})")
+    ):
+        conn.execute(sa.text(create_partition_sql(table, month)))
+        return
+
+    name = partition_name(table, month)
+    logger.warning("moving rows of %s out of %s", name, default)
+    conn.execute(
+        sa.text(
+            f"CREATE TABLE {name} "
+            f"(LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+    )
+    conn.execute(
+        sa.text(
+            f"WITH moved AS (DELETE FROM {default} WHERE {in_month} RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        )
+    )
+    conn.execute(
+        sa.text(
+            f"ALTER TABLE {table} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{_bound(month)}') "
+            f"TO ('{_bound(add_months(month, 1))}')"
+        )
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class RetentionResult:
+    table: str
+    cutoff: date
+    dropped: tuple[str, ...] = ()
+    detached: tuple[str, ...] = ()
+    skipped: tuple[str, ...] = ()
+    deleted_rows: int = 0
+    # Rows left in the default partition; nonzero means months are missing.
+    default_rows: int = 0
+
+
+def apply_retention(
+    conn: sa.Connection,
+    table: str,
+    *,
+    keep_months: int,
+    today: date,
+    mode: RetentionMode = "drop",
+    batch_size: int = DELETE_BATCH_SIZE,
+) -> RetentionResult:
+    """Retire rows created before the first kept month.
+
+    ``keep_months`` counts the current month, so ``1`` keeps only this month.
+    ``detach`` leaves retired partitions as standalone tables for archiving.
+    Expired rows outside monthly partitions (in the default partition) are
+    deleted in batches.
+    """
+
+    cutoff = add_months(month_start(today), 1 - keep_months)
+    if not is_partitioned(conn, table):
+        deleted = _delete_before(conn, table, cutoff, batch_size)
+        return RetentionResult(table, cutoff, deleted_rows=deleted)
+
+    dropped: list[str] = []
+    detached: list[str] = []
+    skipped: list[str] = []
+    for month, name in sorted(list_partitions(conn, table).items()):
+        if month >= cutoff:
+            continue
+        if table == "outbox_events" and _has_unfinished_outbox_rows(conn, name):
+            logger.warning("keeping %s: it still holds undelivered events", name)
+            skipped.append(name)
+            continue
+        conn.execute(sa.text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        if mode == "drop":
+            conn.execute(sa.text(f"DROP TABLE {name}"))
+            dropped.append(name)
+        else:
+            detached.append(name)
+    deleted = _delete_before(conn, table, cutoff, batch_size)
+    default_rows = default_partition_rows(conn, table)
+    if default_rows:
+        logger.warning(
+            "%d rows of %s are in its default partition", default_rows, table
+        )
+    return RetentionResult(
+        table,
+        cutoff,
+        tuple(dropped),
+        tuple(detached),
+        tuple(skipped),
+        deleted,
+        default_rows,
+    )
+
+
+def _has_unfinished_outbox_rows(conn: sa.Connection, partition: str) -> bool:
+    statuses = ", ".join(f"'{status}'" for status in _UNFINISHED_OUTBOX)
+    return bool(
+        conn.scalar(
+            sa.text(
+                f"SELECT EXISTS (SELECT 1 FROM {partition} "
+                f"WHERE status IN ({statuses}))"
+            )
+        )
+    )
+
+
+def _delete_before(
+    conn: sa.Connection, table: str, cutoff: date, batch_size: int
+) -> int:
+    """Bounded ``DELETE`` batches; each batch is short and index-driven."""
+
+    target = _TABLES[table]
+    boundary = datetime.combine(cutoff, datetime.min.time(), UTC)
+    criteria = [target.c.created_at < boundary]
+    if table == "outbox_events":
+        criteria.append(target.c.status.not_in(_UNFINISHED_OUTBOX))
+    return _delete_batched(conn, target, criteria, batch_size)
+
+
+def prune_webhook_keys(
+    conn: sa.Connection, *, keep_months: int, today: date, batch_size: int
+) -> int:
+    """Forget idempotency keys of events older than the webhook retention.
+
+    Redeliveries arriving after that window are accepted again, exactly as if
+    the event had never been stored.
+    """
+
+    cutoff = add_months(month_start(today), 1 - keep_months)
+    boundary = datetime.combine(cutoff, datetime.min.time(), UTC)
+    return _delete_batched(
+        conn,
+        _WEBHOOK_EVENT_KEYS,
+        [_WEBHOOK_EVENT_KEYS.c.created_at < boundary],
+        batch_size,
+    )
+
+
+def _delete_batched(
+    conn: sa.Connection,
+    table: sa.Table,
+    criteria: list[sa.ColumnElement[bool]],
+    batch_size: int,
+) -> int:
+    key = tuple(table.primary_key.columns)
+    batch = sa.select(*key).where(*criteria).limit(batch_size)
+    deleted = 0
+    while True:
+        rows = conn.execute(batch).all()
+        if not rows:
+            return deleted
+        conn.execute(
+            sa.delete(table).where(sa.tuple_(*key).in_([tuple(row) for row in rows]))
+        )
+        if conn.in_transaction():
+            conn.commit()
+        deleted += len(rows)
+
+
+def run_maintenance(
+    engine: sa.Engine,
+    *,
+    today: date | None = None,
+    retention_months: Mapping[str, int] = DEFAULT_RETENTION_MONTHS,
+    mode: RetentionMode = "drop",
+    batch_size: int = DELETE_BATCH_SIZE,
+) -> list[RetentionResult]:
+    """Create upcoming partitions, then apply retention; one transaction per step."""
+
+    today = today or datetime.now(UTC).date()
+    results: list[RetentionResult] = []
+    for table in PARTITIONED_TABLES:
+        with engine.begin() as conn:
+            if is_partitioned(conn, table):
+                for name in ensure_partitions(conn, table, today=today):
+                    logger.info("created partition %s", name)
+        with engine.connect() as conn:
+            result = apply_retention(
+                conn,
+                table,
+                keep_months=retention_months[table],
+                today=today,
+                mode=mode,
+                batch_size=batch_size,
+            )
+            conn.commit()
+        results.append(result)
+    with engine.connect() as conn:
+        prune_webhook_keys(
+            conn,
+            keep_months=retention_months["webhook_events"],
+            today=today,
+            batch_size=batch_size,
+        )
+        conn.commit()
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    from godlife_backend.adapter.persistence.session import _engine
+
+    parser = argparse.ArgumentParser(
+        description="Create upcoming partitions and retire expired months."
+    )
+    parser.add_argument(
+        "--webhook-months",
+        type=int,
+        default=DEFAULT_RETENTION_MONTHS["webhook_events"],
+    )
+    parser.add_argument(
+        "--outbox-months", type=int, default=DEFAULT_RETENTION_MONTHS["outbox_events"]
+    )
+    parser.add_argument(
+        "--detach-only",
+        action="store_true",
+        help="detach expired partitions without dropping them (for archiving)",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    results = run_maintenance(
+        _engine(),
+        retention_months={
+            "webhook_events": args.webhook_months,
+            "outbox_events": args.outbox_months,
+        },
+        mode="detach" if args.detach_only else "drop",
+    )
+    for result in results:
+        logger.info(
+            "%s: cutoff %s, dropped %d, detached %d, skipped %d, deleted rows %d, "
+            "default partition rows %d",
+            result.table,
+            result.cutoff,
+            len(result.dropped),
+            len(result.detached),
+            len(result.skipped),
+            result.deleted_rows,
+            result.default_rows,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Statement recorder for development and tests: N+1, slow and scanning queries.
+
+:func:`record_queries` captures every statement any engine runs in the current
+context. The recording then reports:
+
+- statement shapes executed with many distinct parameter sets (N+1 loops);
+- statements slower than a threshold;
+- sequential scans, found by running ``EXPLAIN`` once per distinct ``SELECT``,
+  ``UPDATE`` or ``DELETE`` shape on PostgreSQL or SQLite (``EXPLAIN`` without
+  ``ANALYZE`` never executes the statement). On PostgreSQL the ``EXPLAIN``
+  runs inside a savepoint, so a failing one cannot abort the transaction of
+  the connection it borrows.
+
+:class:`QueryBudget` turns those findings into violations; the ``query_budget``
+test fixture fails a test that exceeds its budget. The hooks are attached to
+the ``Engine`` class by :func:`install` and cost one context-variable lookup
+per statement outside a recording.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Connection, Engine, event
+
+_START_KEY = "godlife_recorder_started_at"
+_WHITESPACE = re.compile(r"\s+")
+_PG_SEQ_SCAN = re.compile(r"Seq Scan on (\w+)")
+_Parameters = Sequence[Any] | Mapping[str, Any] | None
+_EXPLAIN_PREFIX = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN "}
+_EXPLAINED_VERBS = frozenset({"SELECT", "UPDATE", "DELETE"})
+_EXPLAIN_SAVEPOINT = "godlife_recorder_explain"
+
+
+@dataclass(frozen=True, slots=True)
+class RecordedStatement:
+    sql: str
+    parameters: object
+    seconds: float
+    executemany: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class RepeatedStatement:
+    sql: str
+    # Distinct parameter sets the shape ran with.
+    count: int
+
+
+@dataclass(frozen=True, slots=True)
+class SequentialScan:
+    sql: str
+    table: str
+
+
+@dataclass(slots=True)
+class QueryRecording:
+    explain: bool = False
+    statements: list[RecordedStatement] = field(default_factory=list)
+    # Plan lines per explained statement shape; ``None`` if EXPLAIN failed.
+    plans: dict[str, list[str] | None] = field(default_factory=dict)
+
+    def repeated(self, threshold: int) -> list[RepeatedStatement]:
+        """Shapes run one at a time with more than ``threshold`` parameter sets.
+
+        Re-running a statement with the same parameters is a missing cache,
+        not an N+1 loop, so only distinct parameter sets count. ``executemany``
+        batches are the fix for N+1 and are not counted either.
+        """
+
+        parameter_sets: defaultdict[str, set[str]] = defaultdict(set)
+        for statement in self.statements:
+            if not statement.executemany:
+                # ``repr`` because parameters may hold unhashable values.
+                parameter_sets[statement.sql].add(repr(statement.parameters))
+        repeats = [
+            RepeatedStatement(sql, len(distinct))
+            for sql, distinct in parameter_sets.items()
+            if len(distinct) > threshold
+        ]
+        return sorted(repeats, key=lambda repeat: repeat.count, reverse=True)
+
+    def slow(self, threshold_seconds: float) -> list[RecordedStatement]:
+        return [
+            statement
+            for statement in self.statements
+            if statement.seconds > threshold_seconds
+        ]
+
+    def sequential_scans(self) -> list[SequentialScan]:
+        return [
+            SequentialScan(sql, table)
+            for sql, plan in self.plans.items()
+            for table in _scanned_tables(plan or ())
+        ]
+
+
+@dataclass(frozen=True, slots=True)
+class QueryBudget:
+    """Limits a request or test must stay within; ``None`` disables a check."""
+
+    max_statements: int | None = None
+    # A shape may run with this many parameter sets individually before it
+    # counts as N+1.
+    max_repeats: int | None = 3
+    slow_seconds: float | None = 0.25
+    allow_sequential_scans: bool = True
+
+    def violations(self, recording: QueryRecording) -> list[str]:
+        found: list[str] = []
+        total = len(recording.statements)
+        if self.max_statements is not None and total > self.max_statements:
+            found.append(
+                f"{total} statements exceed the budget of {self.max_statements}"
+            )
+        if self.max_repeats is not None:
+            found.extend(
+                f"N+1: {repeat.count} parameter sets for {repeat.sql}"
+                for repeat in recording.repeated(self.max_repeats)
+            )
+        if self.slow_seconds is not None:
+            found.extend(
+                f"slow: {statement.seconds * 1000:.1f} ms for {statement.sql}"
+                for statement in recording.slow(self.slow_seconds)
+            )
+        if not self.allow_sequential_scans:
+            found.extend(
+                f"sequential scan of {scan.table}: {scan.sql}"
+                for scan in recording.sequential_scans()
+            )
+        return found
+
+
+_CURRENT: ContextVar[QueryRecording | None] = ContextVar(
+    "query_recording", default=None
+)
+
+
+@contextmanager
+def record_queries(*, explain: bool = False) -> Iterator[QueryRecording]:
+    """Record statements run in this context; ``explain`` samples query plans."""
+
+    install()
+    recording = QueryRecording(explain=explain)
+    token = _CURRENT.set(recording)
+    try:
+        yield recording
+    finally:
+        _CURRENT.reset(token)
+
+
+def install() -> None:
+    """Attach the recorder hooks to every engine, once."""
+
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def normalize(statement: str) -> str:
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: object,
+    statement: str,
+    parameters: object,
+    context: object,
+    executemany: bool,
+) -> None:
+    if _CURRENT.get() is not None:
+        setattr(context, _START_KEY, time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Connection,
+    cursor: object,
+    statement: str,
+    parameters: _Parameters,
+    context: object,
+    executemany: bool,
+) -> None:
+    recording = _CURRENT.get()
+    started = getattr(context, _START_KEY, None)
+    if recording is None or started is None:
+        return
+    elapsed = time.perf_counter() - started
+    sql = normalize(statement)
+    recording.statements.append(
+        RecordedStatement(sql, parameters, elapsed, executemany)
+    )
+    if (
+        recording.explain
+        and not executemany
+        and sql not in recording.plans
+        and sql[:6].upper() in _EXPLAINED_VERBS
+    ):
+        recording.plans[sql] = _explain(conn, statement, parameters)
+
+
+def _explain(
+    conn: Connection, statement: str, parameters: _Parameters
+) -> list[str] | None:
+    prefix = _EXPLAIN_PREFIX.get(conn.dialect.name)
+    if prefix is None:
+        return None
+    # On PostgreSQL any failed statement aborts the transaction the request
+    # is still using; the savepoint confines a failing EXPLAIN to itself.
+    savepoint = conn.dialect.name == "postgresql" and not getattr(
+        conn.connection.driver_connection, "autocommit", False
+    )
+    # A raw DBAPI cursor keeps the EXPLAIN itself out of the recording.
+    cursor = conn.connection.cursor()
+    try:
+        if savepoint:
+            cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception:
+            if savepoint:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            return None
+        finally:
+            if savepoint:
+                cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+    finally:
+        cursor.close()
+    # SQLite rows are (id, parent, notused, detail); PostgreSQL rows are (line,).
+    return [str(row[-1]) for row in rows]
+
+
+def _scanned_tables(plan: Iterable[str]) -> Iterator[str]:
+    for line in plan:
+        pg_match = _PG_SEQ_SCAN.search(line)
+        if pg_match:
+            yield pg_match.group(1)
+        elif line.startswith("SCAN ") and " USING " not in line:
+            table = line.split()[1]
+            if table != "CONSTANT":
+                yield table
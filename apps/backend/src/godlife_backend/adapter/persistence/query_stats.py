@@ -0,0 +1,80 @@
+"""Per-request SQL statement counting through SQLAlchemy cursor events."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import Connection, Engine, event
+
+_START_KEY = "godlife_query_started_at"
+
+
+@dataclass(slots=True)
+class QueryStats:
+    statements: int = 0
+    seconds: float = 0.0
+
+
+_CURRENT: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect statements executed in this context (and threads it spawns).
+
+    Starlette copies the context into its threadpool, and the stats object is
+    mutated rather than replaced, so sync endpoints and dependencies count too.
+    """
+
+    stats = QueryStats()
+    token = _CURRENT.set(stats)
+    try:
+        yield stats
+    finally:
+        _CURRENT.reset(token)
+
+
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: object,
+    statement: str,
+    parameters: object,
+    context: object,
+    executemany: bool,
+) -> None:
+    if _CURRENT.get() is not None:
+        # The execution context lives for exactly one statement, so a failed
+        # statement cannot leave a stale start time behind.
+        setattr(context, _START_KEY, time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Connection,
+    cursor: object,
+    statement: str,
+    parameters: object,
+    context: object,
+    executemany: bool,
+) -> None:
+    stats = _CURRENT.get()
+    started = getattr(context, _START_KEY, None)
+    if stats is None or started is None:
+        return
+    stats.statements += 1
+    stats.seconds += time.perf_counter() - started
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """Attach the counting hooks once.
+
+    Statements outside a tracked context cost one context-variable lookup.
+    """
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
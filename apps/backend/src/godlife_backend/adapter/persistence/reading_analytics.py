@@ -0,0 +1,282 @@
+"""Columnar reading-log analytics computed with NumPy over Core query results.
+
+Requires the ``analytics`` extra (``numpy``). Logs are streamed from a single
+Core query into flat float arrays, so per-log metrics and cohort aggregates
+are whole-array operations instead of loops over ``ReadingLog`` dataclasses.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from typing import cast
+from uuid import UUID
+
+import numpy as np
+import numpy.typing as npt
+import sqlalchemy as sa
+from godlife_backend.db import models
+from sqlalchemy.orm import Session
+
+_READING_LOGS = cast(sa.Table, models.ReadingLog.__table__)
+_READING_PLANS = cast(sa.Table, models.ReadingPlan.__table__)
+
+_SECONDS_PER_DAY = 86_400
+_UNIX_EPOCH_JULIAN_DAY = 2_440_587.5
+DEFAULT_PERCENTILES = (50.0, 90.0, 95.0, 99.0)
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+
+@dataclass(slots=True, frozen=True)
+class ReadingLogColumns:
+    """One array element per reading log; missing values are ``NaN``.
+
+    ``user_codes`` index into ``user_ids`` and ``start_at``/``end_at`` are Unix
+    epoch seconds. ``goal_minutes`` comes from the log's reading plan.
+    """
+
+    user_ids: tuple[UUID, ...]
+    user_codes: IntArray
+    start_at: FloatArray
+    end_at: FloatArray
+    pages_read: FloatArray
+    goal_minutes: FloatArray
+
+    def __len__(self) -> int:
+        return len(self.user_codes)
+
+    @property
+    def durations_minutes(self) -> FloatArray:
+        minutes = (self.end_at - self.start_at) / 60.0
+        return np.where(minutes > 0, minutes, np.nan)
+
+    @property
+    def pages_per_minute(self) -> FloatArray:
+        minutes = self.durations_minutes
+        with np.errstate(invalid="ignore"):
+            return self.pages_read / minutes
+
+    @property
+    def start_days(self) -> IntArray:
+        return (self.start_at // _SECONDS_PER_DAY).astype(np.int64)
+
+
+@dataclass(slots=True, frozen=True)
+class GoalAttainment:
+    """Per user-day reading minutes compared against the plan goal."""
+
+    user_codes: IntArray
+    days: IntArray
+    minutes: FloatArray
+    goal_minutes: FloatArray
+
+    @property
+    def attained(self) -> npt.NDArray[np.bool_]:
+        return self.minutes >= self.goal_minutes
+
+    def rate_by_user(self, user_ids: Sequence[UUID]) -> dict[UUID, float]:
+        """Share of each user's goal days on which the goal was reached."""
+
+        counts = np.bincount(self.user_codes, minlength=len(user_ids))
+        hits = np.bincount(
+            self.user_codes, weights=self.attained, minlength=len(user_ids)
+        )
+        return {
+            user_ids[code]: float(hits[code] / counts[code])
+            for code in np.flatnonzero(counts).tolist()
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class ReadingCohortReport:
+    users: int
+    logs: int
+    total_minutes: float
+    total_pages: int
+    goal_days: int
+    goal_attained_days: int
+    minutes_percentiles: dict[float, float] = field(default_factory=dict)
+    pages_per_minute_percentiles: dict[float, float] = field(default_factory=dict)
+
+    @property
+    def goal_attainment_rate(self) -> float:
+        if not self.goal_days:
+            return 0.0
+        return self.goal_attained_days / self.goal_days
+
+
+def load_reading_log_columns(
+    session: Session,
+    *,
+    from_date: date,
+    to_date: date,
+    user_ids: Sequence[UUID] | None = None,
+    batch_size: int = 50_000,
+) -> ReadingLogColumns:
+    """Load logs started in ``[from_date, to_date]`` as columnar arrays.
+
+    Timestamps are converted to epoch seconds in SQL and rows are streamed in
+    ``batch_size`` partitions, so the only per-row Python work is collecting
+    tuples and assigning user codes.
+    """
+
+    start_epoch = _epoch_seconds(session, _READING_LOGS.c.start_at)
+    end_epoch = _epoch_seconds(session, _READING_LOGS.c.end_at)
+    statement = (
+        sa.select(
+            _READING_LOGS.c.user_id,
+            start_epoch,
+            end_epoch,
+            _READING_LOGS.c.pages_read,
+            _READING_PLANS.c.goal_minutes,
+        )
+        .select_from(
+            _READING_LOGS.outerjoin(
+                _READING_PLANS,
+                _READING_PLANS.c.id == _READING_LOGS.c.reading_plan_id,
+            )
+        )
+        .where(
+            _READING_LOGS.c.start_at
+            >= datetime.combine(from_date, datetime.min.time(), UTC),
+            _READING_LOGS.c.start_at
+            < datetime.combine(to_date, datetime.min.time(), UTC) + timedelta(days=1),
+        )
+    )
+    if user_ids is not None:
+        statement = statement.where(_READING_LOGS.c.user_id.in_(user_ids))
+
+    codes: dict[UUID, int] = {}
+    chunks: list[tuple[npt.NDArray[np.generic], ...]] = []
+    result = session.execute(statement.execution_options(yield_per=batch_size))
+    for rows in result.partitions():
+        users, starts, ends, pages, goals = zip(*rows, strict=True)
+        chunks.append(
+            (
+                np.array(
+                    [codes.setdefault(user_id, len(codes)) for user_id in users],
+                    dtype=np.int64,
+                ),
+                np.array(starts, dtype=np.float64),
+                np.array(ends, dtype=np.float64),
+                np.array(pages, dtype=np.float64),
+                np.array(goals, dtype=np.float64),
+            )
+        )
+
+    def _column(index: int) -> FloatArray:
+        if not chunks:
+            return np.empty(0, dtype=np.float64)
+        return np.concatenate([chunk[index] for chunk in chunks])
+
+    return ReadingLogColumns(
+        user_ids=tuple(codes),
+        user_codes=_column(0).astype(np.int64),
+        start_at=_column(1),
+        end_at=_column(2),
+        pages_read=_column(3),
+        goal_minutes=_column(4),
+    )
+
+
+def goal_attainment(columns: ReadingLogColumns) -> GoalAttainment:
+    """Sum minutes per user-day (UTC) for logs attached to a plan with a goal."""
+
+    has_goal = ~np.isnan(columns.goal_minutes)
+    minutes = np.nan_to_num(columns.durations_minutes[has_goal])
+    user_codes = columns.user_codes[has_goal]
+    days = columns.start_days[has_goal]
+    goals = columns.goal_minutes[has_goal]
+
+    # Pack (user, day) into one integer key so grouping is a 1-D unique.
+    first_day = int(days.min()) if days.size else 0
+    span = int(days.max()) - first_day + 1 if days.size else 1
+    keys, inverse = np.unique(
+        user_codes * span + (days - first_day), return_inverse=True
+    )
+    totals = np.bincount(inverse, weights=minutes, minlength=len(keys))
+    group_goals = np.full(len(keys), np.nan)
+    np.fmax.at(group_goals, inverse, goals)
+    return GoalAttainment(
+        user_codes=keys // span,
+        days=keys % span + first_day,
+        minutes=totals,
+        goal_minutes=group_goals,
+    )
+
+
+def build_cohort_report(
+    columns: ReadingLogColumns,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+) -> ReadingCohortReport:
+    durations = columns.durations_minutes
+    attainment = goal_attainment(columns)
+    return ReadingCohortReport(
+        users=len(columns.user_ids),
+        logs=len(columns),
+        total_minutes=float(np.nansum(durations)),
+        total_pages=int(np.nansum(columns.pages_read)),
+        goal_days=len(attainment.minutes),
+        goal_attained_days=int(np.count_nonzero(attainment.attained)),
+        minutes_percentiles=_percentiles(durations, percentiles),
+        pages_per_minute_percentiles=_percentiles(
+            columns.pages_per_minute, percentiles
+        ),
+    )
+
+
+def _percentiles(
+    values: FloatArray, percentiles: Sequence[float]
+) -> dict[float, float]:
+    values = values[~np.isnan(values)]
+    if not values.size:
+        return {}
+    return dict(
+        zip(percentiles, np.percentile(values, percentiles).tolist(), strict=True)
+    )
+
+
+def _epoch_seconds(
+    session: Session, column: sa.ColumnElement[datetime]
+) -> sa.ColumnElement[float]:
+    # Cast to float so PostgreSQL returns doubles rather than Decimal values.
+    if session.get_bind().dialect.name == "postgresql":
+        return sa.cast(sa.extract("epoch", column), sa.Float)
+    return sa.cast(
+        (sa.func.julianday(column) - _UNIX_EPOCH_JULIAN_DAY) * _SECONDS_PER_DAY,
+        sa.Float,
+    )
+
+
+def main() -> None:
+    from godlife_backend.adapter.persistence.session import _read_session_factory
+
+    parser = argparse.ArgumentParser(description="Reading cohort report.")
+    parser.add_argument(
+        "--from", dest="from_date", type=date.fromisoformat, required=True
+    )
+    parser.add_argument("--to", dest="to_date", type=date.fromisoformat, required=True)
+    args = parser.parse_args()
+    # A report over past days tolerates replica lag.
+    with _read_session_factory()() as session:
+        columns = load_reading_log_columns(
+            session, from_date=args.from_date, to_date=args.to_date
+        )
+    report = build_cohort_report(columns)
+    print(
+        f"users={report.users} logs={report.logs} "
+        f"minutes={report.total_minutes:.0f} pages={report.total_pages} "
+        f"goal_attainment={report.goal_attainment_rate:.1%}"
+    )
+    for percentile, minutes in report.minutes_percentiles.items():
+        print(f"minutes p{percentile:g}: {minutes:.1f}")
+    for percentile, rate in report.pages_per_minute_percentiles.items():
+        print(f"pages/min p{percentile:g}: {rate:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Read-through caching decorators for user lookups on the request hot path."""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable, Iterator
+from copy import copy
+from functools import cache
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from godlife_backend.application.cache import SharedCache, TieredCache, TtlLruCache
+from godlife_backend.application.services.outbox_broadcast import OutboxBroadcast
+from godlife_backend.domain.entities import OutboxEvent, User, UserProfile
+from godlife_backend.domain.events import USER_CHANGED, USER_PROFILE_CHANGED
+from godlife_backend.domain.ports import (
+    OutboxEventRepository,
+    UserProfileRepository,
+    UserRepository,
+)
+
+if TYPE_CHECKING:
+    from pydantic import TypeAdapter
+
+
+@cache
+def _codec[E](entity_type: type[E]) -> TypeAdapter[E]:
+    # Only the shared tier serializes entities, so pydantic is loaded on first
+    # use rather than by every process importing the repositories.
+    from pydantic import TypeAdapter
+
+    return TypeAdapter(entity_type)
+
+
+def _encode_user(user: User) -> bytes:
+    return _codec(User).dump_json(user)
+
+
+def _decode_user(data: bytes) -> User:
+    return _codec(User).validate_json(data)
+
+
+def _encode_profile(profile: UserProfile) -> bytes:
+    return _codec(UserProfile).dump_json(profile)
+
+
+def _decode_profile(data: bytes) -> UserProfile:
+    return _codec(UserProfile).validate_json(data)
+
+
+def user_id_key(user_id: UUID) -> str:
+    return f"user:id:{user_id}"
+
+
+def kakao_user_key(kakao_user_id: str) -> str:
+    return f"user:kakao:{kakao_user_id}"
+
+
+def user_profile_key(user_id: UUID) -> str:
+    return f"user_profile:{user_id}"
+
+
+def user_cache(
+    max_entries: int = 10_000,
+    ttl_seconds: float = 30.0,
+    shared: SharedCache | None = None,
+) -> TieredCache[User]:
+    return TieredCache(
+        TtlLruCache(max_entries=max_entries, ttl_seconds=ttl_seconds),
+        encode=_encode_user,
+        decode=_decode_user,
+        shared=shared,
+    )
+
+
+def user_profile_cache(
+    max_entries: int = 10_000,
+    ttl_seconds: float = 30.0,
+    shared: SharedCache | None = None,
+) -> TieredCache[UserProfile]:
+    return TieredCache(
+        TtlLruCache(max_entries=max_entries, ttl_seconds=ttl_seconds),
+        encode=_encode_profile,
+        decode=_decode_profile,
+        shared=shared,
+    )
+
+
+class CachingUserRepository(UserRepository):
+    """Serve users from ``cache`` and announce every save through the outbox.
+
+    Callers always receive copies, so mutating a returned user never leaks into
+    the cache before it is saved.
+    """
+
+    def __init__(
+        self,
+        inner: UserRepository,
+        cache: TieredCache[User],
+        outbox_repository: OutboxEventRepository,
+    ) -> None:
+        self._inner = inner
+        self._cache = cache
+        self._outbox_repository = outbox_repository
+
+    def get_by_id(self, user_id: UUID) -> User | None:
+        cached = self._cache.get(user_id_key(user_id))
+        if cached is not None:
+            return copy(cached)
+        return self._remember(self._inner.get_by_id(user_id))
+
+    def get_by_kakao_user_id(self, kakao_user_id: str) -> User | None:
+        cached = self._cache.get(kakao_user_key(kakao_user_id))
+        if cached is not None:
+            return copy(cached)
+        return self._remember(self._inner.get_by_kakao_user_id(kakao_user_id))
+
+    def map_kakao_user_ids(self, kakao_user_ids: Collection[str]) -> dict[str, UUID]:
+        return self._inner.map_kakao_user_ids(kakao_user_ids)
+
+    def iter_kakao_user_ids(
+        self, batch_size: int = 10_000
+    ) -> Iterator[tuple[str, UUID]]:
+        return self._inner.iter_kakao_user_ids(batch_size)
+
+    def save(self, user: User) -> User:
+        previous = self._inner.get_by_id(user.id)
+        saved = self._inner.save(user)
+        kakao_user_ids = {saved.kakao_user_id}
+        if previous is not None:
+            kakao_user_ids.add(previous.kakao_user_id)
+        self._outbox_repository.save(
+            OutboxEvent(
+                aggregate_type="user",
+                aggregate_id=saved.id,
+                event_type=USER_CHANGED,
+                payload={
+                    "user_id": str(saved.id),
+                    "kakao_user_ids": sorted(kakao_user_ids),
+                },
+            )
+        )
+        # Drop it now for read-your-writes here; the outbox event drops it again
+        # after commit in every process polling the broadcast, including this
+        # one in case another request re-cached the old row meanwhile.
+        _invalidate_user(self._cache, saved.id, kakao_user_ids)
+        return saved
+
+    def _remember(self, user: User | None) -> User | None:
+        if user is not None:
+            snapshot = copy(user)
+            self._cache.put(user_id_key(user.id), snapshot)
+            self._cache.put(kakao_user_key(user.kakao_user_id), snapshot)
+        return user
+
+
+class CachingUserProfileRepository(UserProfileRepository):
+    def __init__(
+        self,
+        inner: UserProfileRepository,
+        cache: TieredCache[UserProfile],
+        outbox_repository: OutboxEventRepository,
+    ) -> None:
+        self._inner = inner
+        self._cache = cache
+        self._outbox_repository = outbox_repository
+
+    def get_by_user_id(self, user_id: UUID) -> UserProfile | None:
+        cached = self._cache.get(user_profile_key(user_id))
+        if cached is not None:
+            return copy(cached)
+        profile = self._inner.get_by_user_id(user_id)
+        if profile is not None:
+            self._cache.put(user_profile_key(user_id), copy(profile))
+        return profile
+
+    def save(self, profile: UserProfile) -> UserProfile:
+        saved = self._inner.save(profile)
+        self._outbox_repository.save(
+            OutboxEvent(
+                aggregate_type="user_profile",
+                aggregate_id=saved.id,
+                event_type=USER_PROFILE_CHANGED,
+                payload={"user_id": str(saved.user_id)},
+            )
+        )
+        self._cache.invalidate(user_profile_key(saved.user_id))
+        return saved
+
+
+def register_user_cache_invalidation(
+    broadcast: OutboxBroadcast,
+    users: TieredCache[User],
+    profiles: TieredCache[UserProfile] | None = None,
+) -> None:
+    """Drop cached users and profiles named by committed change events.
+
+    Registered on the process's :class:`OutboxBroadcast`, so every API process
+    sees every save, not just the worker that leases the event.
+    """
+
+    def _on_user_changed(event: OutboxEvent) -> None:
+        kakao_user_ids = event.payload.get("kakao_user_ids")
+        _invalidate_user(
+            users,
+            UUID(str(event.payload["user_id"])),
+            [str(value) for value in kakao_user_ids]
+            if isinstance(kakao_user_ids, list)
+            else [],
+        )
+
+    broadcast.register(USER_CHANGED, _on_user_changed)
+    if profiles is None:
+        return
+
+    def _on_profile_changed(event: OutboxEvent) -> None:
+        profiles.invalidate(user_profile_key(UUID(str(event.payload["user_id"]))))
+
+    broadcast.register(USER_PROFILE_CHANGED, _on_profile_changed)
+
+
+def _invalidate_user(
+    cache: TieredCache[User], user_id: UUID, kakao_user_ids: Iterable[str]
+) -> None:
+    cache.invalidate(
+        user_id_key(user_id),
+        *(kakao_user_key(kakao_user_id) for kakao_user_id in kakao_user_ids),
+    )
@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
-from datetime import date
+from collections.abc import Collection, Iterator, Mapping, Sequence
+from dataclasses import fields
+from datetime import UTC, date, datetime, timedelta
+from typing import Any, Protocol, cast
 from uuid import UUID
 
-from godlife_backend.db.enums import NotificationStatus, PlanStatus
+import sqlalchemy as sa
+from godlife_backend.db import models
+from godlife_backend.db.enums import (
+    NotificationStatus,
+    OutboxStatus,
+    PlanStatus,
+    SetStatus,
+)
+from godlife_backend.db.types import payload_json
 from godlife_backend.domain.entities import (
     ExercisePlan,
     ExerciseSession,
@@ -16,9 +26,11 @@ from godlife_backend.domain.entities import (
     ReadingLog,
     ReadingPlan,
     User,
+    UserDailyStats,
     UserProfile,
     WebhookEvent,
 )
+from godlife_backend.domain.errors import ConcurrencyConflictError
 from godlife_backend.domain.ports import (
     ExercisePlanRepository,
     ExerciseSessionRepository,
@@ -27,25 +39,241 @@ from godlife_backend.domain.ports import (
     OutboxEventRepository,
     ReadingLogRepository,
     ReadingPlanRepository,
+    UserDailyStatsRepository,
     UserProfileRepository,
     UserRepository,
     WebhookEventRepository,
 )
+from godlife_backend.domain.progress import SET_COUNTER_FIELDS, set_counter_deltas
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import CursorResult
 from sqlalchemy.orm import Session
 
+_USERS = cast(sa.Table, models.User.__table__)
+_USER_PROFILES = cast(sa.Table, models.UserProfile.__table__)
+_PLANS = cast(sa.Table, models.ExercisePlan.__table__)
+_SESSIONS = cast(sa.Table, models.ExerciseSession.__table__)
+_SET_STATES = cast(sa.Table, models.ExerciseSetState.__table__)
+_READING_LOGS = cast(sa.Table, models.ReadingLog.__table__)
+_DAILY_STATS = cast(sa.Table, models.UserDailyStats.__table__)
+_NOTIFICATIONS = cast(sa.Table, models.Notification.__table__)
+_WEBHOOK_EVENTS = cast(sa.Table, models.WebhookEvent.__table__)
+_WEBHOOK_EVENT_KEYS = cast(sa.Table, models.WebhookEventKey.__table__)
+_OUTBOX = cast(sa.Table, models.OutboxEvent.__table__)
+_ONE_DAY = timedelta(days=1)
+# Partial-index predicates are reused verbatim: a bound parameter in their
+# place keeps SQLite (and PostgreSQL generic plans) from using the index.
+_DUE_NOTIFICATIONS = models.DUE_NOTIFICATIONS
+_PENDING_OUTBOX = models.PENDING_OUTBOX
+
+
+class _Versioned(Protocol):
+    id: UUID
+    version: int
+
+
+def _to_entity[E](entity_type: type[E], row: Mapping[str, Any]) -> E:
+    names = [f.name for f in fields(cast(Any, entity_type))]
+    return entity_type(**{name: row[name] for name in names if name in row})
+
+
+def _entity_values(entity: object, exclude: Collection[str] = ()) -> dict[str, Any]:
+    return {
+        f.name: getattr(entity, f.name)
+        for f in fields(cast(Any, entity))
+        if f.name not in exclude
+    }
+
+
+def _reader(session: Session, read_session: Session | None) -> Session:
+    """Session for a read that may trail the primary by the replica lag.
+
+    Once the request has used its primary session it may have written, so
+    later reads stay there and see those writes.
+    """
+
+    if read_session is None or session.in_transaction():
+        return session
+    return read_session
+
+
+def _dialect_name(session: Session) -> str:
+    return session.get_bind().dialect.name
+
+
+def _upsert_statement(
+    session: Session, table: sa.Table
+) -> postgresql.Insert | sqlite.Insert:
+    """Return an INSERT supporting ``ON CONFLICT`` for the bound dialect."""
+
+    if _dialect_name(session) == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+def _patched_json(
+    session: Session, column: sa.Column[Any], changes: Mapping[str, object]
+) -> sa.ColumnElement[Any]:
+    """SQL setting top-level ``changes`` on a JSON column in place."""
+
+    patch = sa.literal(payload_json(changes))
+    if _dialect_name(session) == "postgresql":
+        return column.op("||", return_type=column.type)(
+            sa.cast(patch, postgresql.JSONB)
+        )
+    # SQLite: ``->`` yields each value as JSON so json_set keeps its type.
+    arguments: list[Any] = []
+    for key in changes:
+        path = f'$."{key}"'
+        arguments += [path, patch.op("->")(path)]
+    return sa.func.json_set(column, *arguments, type_=column.type)
+
+
+def _save_unversioned(session: Session, table: sa.Table, entity: object) -> bool:
+    """Update the row by id, inserting it when it does not exist yet.
+
+    Returns whether the row was inserted.
+    """
+
+    values = _entity_values(entity)
+    result = cast(
+        CursorResult[Any],
+        session.execute(
+            sa.update(table)
+            .where(table.c.id == values["id"])
+            .values({k: v for k, v in values.items() if k not in {"id", "created_at"}})
+        ),
+    )
+    if result.rowcount != 0:
+        return False
+    session.execute(sa.insert(table).values(values))
+    return True
+
+
+def _save_versioned(
+    session: Session, table: sa.Table, entity: _Versioned, entity_name: str
+) -> None:
+    """Insert a new row or compare-and-swap an existing one on ``version``.
+
+    Entities with ``version == 0`` have never been persisted. Updates only match
+    the row when its version is unchanged since the entity was read, so
+    concurrent writers never wait on row locks; the loser gets a
+    ``ConcurrencyConflictError`` and is expected to reload and retry.
+    """
+
+    if entity.version == 0:
+        session.execute(
+            sa.insert(table).values(
+                **_entity_values(entity, exclude={"version"}), version=1
+            )
+        )
+        entity.version = 1
+        return
+
+    result = cast(
+        CursorResult[Any],
+        session.execute(
+            sa.update(table)
+            .where(table.c.id == entity.id, table.c.version == entity.version)
+            .values(
+                **_entity_values(entity, exclude={"id", "created_at", "version"}),
+                version=entity.version + 1,
+            )
+        ),
+    )
+    if result.rowcount != 1:
+        raise ConcurrencyConflictError(entity_name, entity.id, entity.version)
+    entity.version += 1
+
+
+def _increment_set_counters(
+    session: Session,
+    table: sa.Table,
+    entity_id: UUID | sa.ColumnElement[Any],
+    deltas: Mapping[str, int],
+    *,
+    bump_version: bool = False,
+) -> None:
+    """Apply counter deltas as ``col = col + :delta`` so concurrent set updates
+    never read-modify-write the same counters."""
+
+    values: dict[str, Any] = {
+        name: table.c[name] + delta
+        for name, delta in deltas.items()
+        if name in SET_COUNTER_FIELDS and delta
+    }
+    if not values:
+        return
+    if bump_version:
+        # Any CAS write of the row after this must observe the new counters.
+        values["version"] = table.c.version + 1
+    session.execute(sa.update(table).where(table.c.id == entity_id).values(values))
+
 
 class SqlAlchemyUserRepository(UserRepository):
     def __init__(self, session: Session) -> None:
         self._session = session
 
     def get_by_id(self, user_id: UUID) -> User | None:
-        raise NotImplementedError("SQLAlchemy User repository not implemented yet.")
+        row = (
+            self._session.execute(sa.select(_USERS).where(_USERS.c.id == user_id))
+            .mappings()
+            .first()
+        )
+        return None if row is None else _to_entity(User, row)
 
     def get_by_kakao_user_id(self, kakao_user_id: str) -> User | None:
-        raise NotImplementedError("SQLAlchemy User repository not implemented yet.")
+        row = (
+            self._session.execute(
+                sa.select(_USERS).where(_USERS.c.kakao_user_id == kakao_user_id)
+            )
+            .mappings()
+            .first()
+        )
+        return None if row is None else _to_entity(User, row)
+
+    def map_kakao_user_ids(self, kakao_user_ids: Collection[str]) -> dict[str, UUID]:
+        if not kakao_user_ids:
+            return {}
+        wanted = list(kakao_user_ids)
+        if _dialect_name(self._session) == "postgresql":
+            # One array parameter keeps the statement text (and plan) identical
+            # whatever the batch size, unlike an expanded IN list.
+            condition = _USERS.c.kakao_user_id == sa.func.any(
+                sa.bindparam(
+                    "kakao_user_ids", wanted, type_=postgresql.ARRAY(sa.String)
+                )
+            )
+        else:
+            condition = _USERS.c.kakao_user_id.in_(wanted)
+        rows = self._session.execute(
+            sa.select(_USERS.c.kakao_user_id, _USERS.c.id).where(condition)
+        )
+        return {kakao_user_id: user_id for kakao_user_id, user_id in rows}
+
+    def iter_kakao_user_ids(
+        self, batch_size: int = 10_000
+    ) -> Iterator[tuple[str, UUID]]:
+        last_key: str | None = None
+        while True:
+            statement = (
+                sa.select(_USERS.c.kakao_user_id, _USERS.c.id)
+                .order_by(_USERS.c.kakao_user_id)
+                .limit(batch_size)
+            )
+            if last_key is not None:
+                statement = statement.where(_USERS.c.kakao_user_id > last_key)
+            rows = [
+                (row.kakao_user_id, row.id) for row in self._session.execute(statement)
+            ]
+            if not rows:
+                return
+            yield from rows
+            last_key = rows[-1][0]
 
     def save(self, user: User) -> User:
-        raise NotImplementedError("SQLAlchemy User repository not implemented yet.")
+        _save_unversioned(self._session, _USERS, user)
+        return user
 
 
 class SqlAlchemyUserProfileRepository(UserProfileRepository):
@@ -53,31 +281,48 @@ class SqlAlchemyUserProfileRepository(UserProfileRepository):
         self._session = session
 
     def get_by_user_id(self, user_id: UUID) -> UserProfile | None:
-        raise NotImplementedError(
-            "SQLAlchemy UserProfile repository not implemented yet."
+        row = (
+            self._session.execute(
+                sa.select(_USER_PROFILES).where(_USER_PROFILES.c.user_id == user_id)
+            )
+            .mappings()
+            .first()
         )
+        return None if row is None else _to_entity(UserProfile, row)
 
     def save(self, profile: UserProfile) -> UserProfile:
-        raise NotImplementedError(
-            "SQLAlchemy UserProfile repository not implemented yet."
-        )
+        _save_unversioned(self._session, _USER_PROFILES, profile)
+        return profile
 
 
 class SqlAlchemyExercisePlanRepository(ExercisePlanRepository):
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, read_session: Session | None = None) -> None:
         self._session = session
+        self._read_session = read_session
 
     def get_active_by_user_and_date(
         self, user_id: UUID, target_date: date
     ) -> ExercisePlan | None:
-        raise NotImplementedError(
-            "SQLAlchemy ExercisePlan repository not implemented yet."
+        row = (
+            self._session.execute(
+                sa.select(_PLANS).where(
+                    _PLANS.c.user_id == user_id,
+                    _PLANS.c.target_date == target_date,
+                    _PLANS.c.status == PlanStatus.ACTIVE,
+                )
+            )
+            .mappings()
+            .first()
         )
+        return None if row is None else _to_entity(ExercisePlan, row)
 
     def get_by_id(self, plan_id: UUID) -> ExercisePlan | None:
-        raise NotImplementedError(
-            "SQLAlchemy ExercisePlan repository not implemented yet."
+        row = (
+            self._session.execute(sa.select(_PLANS).where(_PLANS.c.id == plan_id))
+            .mappings()
+            .first()
         )
+        return None if row is None else _to_entity(ExercisePlan, row)
 
     def list_by_user(
         self,
@@ -86,13 +331,28 @@ class SqlAlchemyExercisePlanRepository(ExercisePlanRepository):
         to_date: date | None = None,
         status: PlanStatus | None = None,
     ) -> list[ExercisePlan]:
-        raise NotImplementedError(
-            "SQLAlchemy ExercisePlan repository not implemented yet."
-        )
+        statement = sa.select(_PLANS).where(_PLANS.c.user_id == user_id)
+        if from_date is not None:
+            statement = statement.where(_PLANS.c.target_date >= from_date)
+        if to_date is not None:
+            statement = statement.where(_PLANS.c.target_date <= to_date)
+        if status is not None:
+            statement = statement.where(_PLANS.c.status == status)
+        statement = statement.order_by(_PLANS.c.created_at.desc())
+        return [
+            _to_entity(ExercisePlan, row)
+            for row in _reader(self._session, self._read_session)
+            .execute(statement)
+            .mappings()
+        ]
 
     def save(self, plan: ExercisePlan) -> ExercisePlan:
-        raise NotImplementedError(
-            "SQLAlchemy ExercisePlan repository not implemented yet."
+        _save_versioned(self._session, _PLANS, plan, "ExercisePlan")
+        return plan
+
+    def increment_set_counters(self, plan_id: UUID, deltas: Mapping[str, int]) -> None:
+        _increment_set_counters(
+            self._session, _PLANS, plan_id, deltas, bump_version=True
         )
 
 
@@ -101,19 +361,49 @@ class SqlAlchemyExerciseSessionRepository(ExerciseSessionRepository):
         self._session = session
 
     def list_by_plan(self, plan_id: UUID) -> list[ExerciseSession]:
-        raise NotImplementedError(
-            "SQLAlchemy ExerciseSession repository not implemented yet."
+        statement = (
+            sa.select(_SESSIONS)
+            .where(_SESSIONS.c.plan_id == plan_id)
+            .order_by(_SESSIONS.c.order_no)
         )
+        return [
+            _to_entity(ExerciseSession, row)
+            for row in self._session.execute(statement).mappings()
+        ]
 
     def get_by_id(self, session_id: UUID) -> ExerciseSession | None:
-        raise NotImplementedError(
-            "SQLAlchemy ExerciseSession repository not implemented yet."
+        row = (
+            self._session.execute(
+                sa.select(_SESSIONS).where(_SESSIONS.c.id == session_id)
+            )
+            .mappings()
+            .first()
         )
+        return None if row is None else _to_entity(ExerciseSession, row)
 
     def save(self, session: ExerciseSession) -> ExerciseSession:
-        raise NotImplementedError(
-            "SQLAlchemy ExerciseSession repository not implemented yet."
+        # Counters are owned by increment_set_counters; an update never rewrites
+        # them from a possibly stale copy.
+        result = cast(
+            CursorResult[Any],
+            self._session.execute(
+                sa.update(_SESSIONS)
+                .where(_SESSIONS.c.id == session.id)
+                .values(
+                    _entity_values(
+                        session, exclude={"id", "created_at", *SET_COUNTER_FIELDS}
+                    )
+                )
+            ),
         )
+        if result.rowcount == 0:
+            self._session.execute(sa.insert(_SESSIONS).values(_entity_values(session)))
+        return session
+
+    def increment_set_counters(
+        self, session_id: UUID, deltas: Mapping[str, int]
+    ) -> None:
+        _increment_set_counters(self._session, _SESSIONS, session_id, deltas)
 
 
 class SqlAlchemyExerciseSetStateRepository(ExerciseSetStateRepository):
@@ -121,19 +411,49 @@ class SqlAlchemyExerciseSetStateRepository(ExerciseSetStateRepository):
         self._session = session
 
     def get(self, session_id: UUID, set_no: int) -> ExerciseSetState | None:
-        raise NotImplementedError(
-            "SQLAlchemy ExerciseSetState repository not implemented yet."
+        row = (
+            self._session.execute(
+                sa.select(_SET_STATES).where(
+                    _SET_STATES.c.session_id == session_id,
+                    _SET_STATES.c.set_no == set_no,
+                )
+            )
+            .mappings()
+            .first()
         )
+        return None if row is None else _to_entity(ExerciseSetState, row)
 
     def list_pending(self, session_id: UUID) -> list[ExerciseSetState]:
-        raise NotImplementedError(
-            "SQLAlchemy ExerciseSetState repository not implemented yet."
+        statement = (
+            sa.select(_SET_STATES)
+            .where(
+                _SET_STATES.c.session_id == session_id,
+                _SET_STATES.c.status == SetStatus.PENDING,
+            )
+            .order_by(_SET_STATES.c.set_no)
         )
+        return [
+            _to_entity(ExerciseSetState, row)
+            for row in self._session.execute(statement).mappings()
+        ]
 
     def save(self, state: ExerciseSetState) -> ExerciseSetState:
-        raise NotImplementedError(
-            "SQLAlchemy ExerciseSetState repository not implemented yet."
-        )
+        created = state.version == 0
+        _save_versioned(self._session, _SET_STATES, state, "ExerciseSetState")
+        if created:
+            # A new set opens on its session and plan in the same transaction,
+            # so completion never sees a plan whose sets are not counted yet.
+            deltas = set_counter_deltas(None, state.status)
+            _increment_set_counters(self._session, _SESSIONS, state.session_id, deltas)
+            plan_id = (
+                sa.select(_SESSIONS.c.plan_id)
+                .where(_SESSIONS.c.id == state.session_id)
+                .scalar_subquery()
+            )
+            _increment_set_counters(
+                self._session, _PLANS, plan_id, deltas, bump_version=True
+            )
+        return state
 
 
 class SqlAlchemyReadingPlanRepository(ReadingPlanRepository):
@@ -152,8 +472,9 @@ class SqlAlchemyReadingPlanRepository(ReadingPlanRepository):
 
 
 class SqlAlchemyReadingLogRepository(ReadingLogRepository):
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, read_session: Session | None = None) -> None:
         self._session = session
+        self._read_session = read_session
 
     def list(
         self,
@@ -161,34 +482,121 @@ class SqlAlchemyReadingLogRepository(ReadingLogRepository):
         from_date: date | None = None,
         to_date: date | None = None,
     ) -> Sequence[ReadingLog]:
-        raise NotImplementedError(
-            "SQLAlchemy ReadingLog repository not implemented yet."
-        )
+        statement = sa.select(_READING_LOGS).where(_READING_LOGS.c.user_id == user_id)
+        if from_date is not None:
+            statement = statement.where(
+                _READING_LOGS.c.created_at
+                >= datetime.combine(from_date, datetime.min.time(), UTC)
+            )
+        if to_date is not None:
+            statement = statement.where(
+                _READING_LOGS.c.created_at
+                < datetime.combine(to_date, datetime.min.time(), UTC) + _ONE_DAY
+            )
+        statement = statement.order_by(_READING_LOGS.c.created_at.desc())
+        return [
+            _to_entity(ReadingLog, row)
+            for row in _reader(self._session, self._read_session)
+            .execute(statement)
+            .mappings()
+        ]
 
     def get_by_id(self, log_id: UUID) -> ReadingLog | None:
-        raise NotImplementedError(
-            "SQLAlchemy ReadingLog repository not implemented yet."
+        row = (
+            self._session.execute(
+                sa.select(_READING_LOGS).where(_READING_LOGS.c.id == log_id)
+            )
+            .mappings()
+            .first()
         )
+        return None if row is None else _to_entity(ReadingLog, row)
 
     def save(self, log: ReadingLog) -> ReadingLog:
-        raise NotImplementedError(
-            "SQLAlchemy ReadingLog repository not implemented yet."
+        _save_unversioned(self._session, _READING_LOGS, log)
+        return log
+
+
+class SqlAlchemyUserDailyStatsRepository(UserDailyStatsRepository):
+    def __init__(self, session: Session, read_session: Session | None = None) -> None:
+        self._session = session
+        self._read_session = read_session
+
+    def get(self, user_id: UUID, stat_date: date) -> UserDailyStats | None:
+        row = (
+            self._session.execute(
+                sa.select(_DAILY_STATS).where(
+                    _DAILY_STATS.c.user_id == user_id,
+                    _DAILY_STATS.c.stat_date == stat_date,
+                )
+            )
+            .mappings()
+            .first()
+        )
+        return None if row is None else _to_entity(UserDailyStats, row)
+
+    def list_range(
+        self, user_id: UUID, from_date: date, to_date: date
+    ) -> list[UserDailyStats]:
+        statement = (
+            sa.select(_DAILY_STATS)
+            .where(
+                _DAILY_STATS.c.user_id == user_id,
+                _DAILY_STATS.c.stat_date >= from_date,
+                _DAILY_STATS.c.stat_date <= to_date,
+            )
+            .order_by(_DAILY_STATS.c.stat_date)
+        )
+        return [
+            _to_entity(UserDailyStats, row)
+            for row in _reader(self._session, self._read_session)
+            .execute(statement)
+            .mappings()
+        ]
+
+    def increment(
+        self, user_id: UUID, stat_date: date, deltas: Mapping[str, float]
+    ) -> UserDailyStats:
+        values = {name: delta for name, delta in deltas.items() if delta}
+        insert = _upsert_statement(self._session, _DAILY_STATS).values(
+            user_id=user_id,
+            stat_date=stat_date,
+            updated_at=datetime.now(UTC),
+            **values,
+        )
+        statement = insert.on_conflict_do_update(
+            index_elements=[_DAILY_STATS.c.user_id, _DAILY_STATS.c.stat_date],
+            set_={
+                **{
+                    name: _DAILY_STATS.c[name] + insert.excluded[name]
+                    for name in values
+                },
+                "updated_at": insert.excluded.updated_at,
+            },
+        ).returning(*_DAILY_STATS.c)
+        row = self._session.execute(statement).mappings().one()
+        return _to_entity(UserDailyStats, row)
+
+    def set_streak(self, user_id: UUID, stat_date: date, streak_days: int) -> None:
+        self._session.execute(
+            sa.update(_DAILY_STATS)
+            .where(
+                _DAILY_STATS.c.user_id == user_id,
+                _DAILY_STATS.c.stat_date == stat_date,
+            )
+            .values(streak_days=streak_days)
         )
 
 
 class SqlAlchemyNotificationRepository(NotificationRepository):
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, read_session: Session | None = None) -> None:
         self._session = session
+        self._read_session = read_session
 
     def get_by_id(self, notification_id: UUID) -> Notification | None:
-        raise NotImplementedError(
-            "SQLAlchemy Notification repository not implemented yet."
-        )
+        return self._first(_NOTIFICATIONS.c.id == notification_id)
 
     def get_by_idempotency_key(self, idempotency_key: str) -> Notification | None:
-        raise NotImplementedError(
-            "SQLAlchemy Notification repository not implemented yet."
-        )
+        return self._first(_NOTIFICATIONS.c.idempotency_key == idempotency_key)
 
     def list(
         self,
@@ -197,14 +605,60 @@ class SqlAlchemyNotificationRepository(NotificationRepository):
         from_at: date | None = None,
         to_at: date | None = None,
     ) -> Sequence[Notification]:
-        raise NotImplementedError(
-            "SQLAlchemy Notification repository not implemented yet."
+        statement = sa.select(_NOTIFICATIONS).where(_NOTIFICATIONS.c.user_id == user_id)
+        if status is not None:
+            statement = statement.where(_NOTIFICATIONS.c.status == status)
+        if from_at is not None:
+            statement = statement.where(
+                _NOTIFICATIONS.c.schedule_at
+                >= datetime.combine(from_at, datetime.min.time(), UTC)
+            )
+        if to_at is not None:
+            statement = statement.where(
+                _NOTIFICATIONS.c.schedule_at
+                < datetime.combine(to_at, datetime.min.time(), UTC) + _ONE_DAY
+            )
+        statement = statement.order_by(_NOTIFICATIONS.c.schedule_at.desc())
+        return [
+            _to_entity(Notification, row)
+            for row in _reader(self._session, self._read_session)
+            .execute(statement)
+            .mappings()
+        ]
+
+    def list_due(self, before: datetime, limit: int = 100) -> Sequence[Notification]:
+        statement = (
+            sa.select(_NOTIFICATIONS)
+            .where(_DUE_NOTIFICATIONS, _NOTIFICATIONS.c.schedule_at < before)
+            .order_by(_NOTIFICATIONS.c.schedule_at)
+            .limit(limit)
         )
+        return [
+            _to_entity(Notification, row)
+            for row in self._session.execute(statement).mappings()
+        ]
 
     def save(self, notification: Notification) -> Notification:
-        raise NotImplementedError(
-            "SQLAlchemy Notification repository not implemented yet."
+        _save_unversioned(self._session, _NOTIFICATIONS, notification)
+        return notification
+
+    def _first(self, *criteria: sa.ColumnElement[bool]) -> Notification | None:
+        row = (
+            self._session.execute(sa.select(_NOTIFICATIONS).where(*criteria))
+            .mappings()
+            .first()
         )
+        return None if row is None else _to_entity(Notification, row)
+
+
+def _webhook_key_values(event: WebhookEvent) -> dict[str, Any]:
+    return {
+        "provider": event.provider,
+        "idempotency_key": event.idempotency_key,
+        "event_id": event.event_id,
+        "webhook_event_id": event.id,
+        "created_at": event.created_at,
+    }
 
 
 class SqlAlchemyWebhookEventRepository(WebhookEventRepository):
@@ -212,26 +666,78 @@ class SqlAlchemyWebhookEventRepository(WebhookEventRepository):
         self._session = session
 
     def get_by_provider_and_key(self, provider: str, key: str) -> WebhookEvent | None:
-        raise NotImplementedError(
-            "SQLAlchemy WebhookEvent repository not implemented yet."
+        return self._first(
+            _WEBHOOK_EVENTS.c.provider == provider,
+            _WEBHOOK_EVENTS.c.idempotency_key == key,
         )
 
     def save(self, event: WebhookEvent) -> WebhookEvent:
-        raise NotImplementedError(
-            "SQLAlchemy WebhookEvent repository not implemented yet."
+        # A new event claims its keys; a duplicate raises IntegrityError here.
+        if _save_unversioned(self._session, _WEBHOOK_EVENTS, event):
+            self._session.execute(
+                sa.insert(_WEBHOOK_EVENT_KEYS).values(_webhook_key_values(event))
+            )
+        return event
+
+    def insert_new(self, events: Sequence[WebhookEvent]) -> set[UUID]:
+        """Claim keys with ``ON CONFLICT DO NOTHING``, then insert the winners.
+
+        ``webhook_event_keys`` carries both unique constraints,
+        ``(provider, idempotency_key)`` and ``(provider, event_id)``; naming no
+        conflict target covers both. Passing the rows as parameters lets
+        SQLAlchemy's "insertmanyvalues" mode send them as multi-row ``VALUES``
+        pages while compiling each statement once.
+        """
+
+        if not events:
+            return set()
+        claim = (
+            _upsert_statement(self._session, _WEBHOOK_EVENT_KEYS)
+            .on_conflict_do_nothing()
+            .returning(_WEBHOOK_EVENT_KEYS.c.webhook_event_id)
+        )
+        inserted = set(
+            self._session.execute(
+                claim, [_webhook_key_values(event) for event in events]
+            ).scalars()
         )
+        if inserted:
+            self._session.execute(
+                sa.insert(_WEBHOOK_EVENTS),
+                [_entity_values(event) for event in events if event.id in inserted],
+            )
+        return inserted
 
     def get_by_provider_and_event_id(
         self, provider: str, event_id: str
     ) -> WebhookEvent | None:
-        raise NotImplementedError(
-            "SQLAlchemy WebhookEvent repository not implemented yet."
+        return self._first(
+            _WEBHOOK_EVENTS.c.provider == provider,
+            _WEBHOOK_EVENTS.c.event_id == event_id,
         )
 
     def mark_failed(self, event_id: UUID, reason: str | None) -> WebhookEvent | None:
-        raise NotImplementedError(
-            "SQLAlchemy WebhookEvent repository not implemented yet."
+        if reason is None:
+            return self._first(_WEBHOOK_EVENTS.c.id == event_id)
+        row = (
+            self._session.execute(
+                sa.update(_WEBHOOK_EVENTS)
+                .where(_WEBHOOK_EVENTS.c.id == event_id)
+                .values(reason_code=reason)
+                .returning(*_WEBHOOK_EVENTS.c)
+            )
+            .mappings()
+            .first()
+        )
+        return None if row is None else _to_entity(WebhookEvent, row)
+
+    def _first(self, *criteria: sa.ColumnElement[bool]) -> WebhookEvent | None:
+        row = (
+            self._session.execute(sa.select(_WEBHOOK_EVENTS).where(*criteria))
+            .mappings()
+            .first()
         )
+        return None if row is None else _to_entity(WebhookEvent, row)
 
 
 class SqlAlchemyOutboxEventRepository(OutboxEventRepository):
@@ -239,21 +745,146 @@ class SqlAlchemyOutboxEventRepository(OutboxEventRepository):
         self._session = session
 
     def lease_pending(self, limit: int = 100) -> list[OutboxEvent]:
-        raise NotImplementedError(
-            "SQLAlchemy OutboxEvent repository not implemented yet."
+        candidates = (
+            sa.select(_OUTBOX.c.id)
+            .where(_PENDING_OUTBOX)
+            .order_by(_OUTBOX.c.updated_at)
+            .limit(limit)
+        )
+        if _dialect_name(self._session) == "postgresql":
+            candidates = candidates.with_for_update(skip_locked=True)
+        # Re-checking the status keeps a lease exclusive on backends without
+        # SKIP LOCKED: a row already claimed by another worker no longer matches.
+        statement = (
+            sa.update(_OUTBOX)
+            .where(
+                _OUTBOX.c.id.in_(candidates.scalar_subquery()),
+                _OUTBOX.c.status == OutboxStatus.PENDING,
+            )
+            .values(status=OutboxStatus.IN_FLIGHT, updated_at=datetime.now(UTC))
+            .returning(*_OUTBOX.c)
         )
+        events = [
+            _to_entity(OutboxEvent, row)
+            for row in self._session.execute(statement).mappings()
+        ]
+        return sorted(events, key=lambda event: event.created_at)
+
+    def list_recent(
+        self, event_types: Collection[str], since: datetime, limit: int = 1000
+    ) -> list[OutboxEvent]:
+        # Range scan on ix_outbox_events_created within the newest partition.
+        statement = (
+            sa.select(_OUTBOX)
+            .where(
+                _OUTBOX.c.created_at >= since,
+                _OUTBOX.c.event_type.in_(event_types),
+            )
+            .order_by(_OUTBOX.c.created_at, _OUTBOX.c.id)
+            .limit(limit)
+        )
+        return [
+            _to_entity(OutboxEvent, row)
+            for row in self._session.execute(statement).mappings()
+        ]
 
     def save(self, event: OutboxEvent) -> OutboxEvent:
-        raise NotImplementedError(
-            "SQLAlchemy OutboxEvent repository not implemented yet."
-        )
+        _save_unversioned(self._session, _OUTBOX, event)
+        return event
 
     def mark_complete(self, event_id: UUID) -> OutboxEvent | None:
-        raise NotImplementedError(
-            "SQLAlchemy OutboxEvent repository not implemented yet."
-        )
+        return self._update_status(event_id, status=OutboxStatus.COMPLETED)
 
     def mark_failed(self, event_id: UUID, reason: str | None) -> OutboxEvent | None:
-        raise NotImplementedError(
-            "SQLAlchemy OutboxEvent repository not implemented yet."
+        if reason is None:
+            return self._update_status(event_id, status=OutboxStatus.FAILED)
+        # The reason is merged into the stored payload by the database, so the
+        # (possibly large) payload is neither read nor re-encoded here.
+        return self._update_status(
+            event_id,
+            status=OutboxStatus.FAILED,
+            payload=_patched_json(
+                self._session, _OUTBOX.c.payload, {"failure_reason": reason}
+            ),
         )
+
+    def _update_status(
+        self,
+        event_id: UUID,
+        status: OutboxStatus,
+        payload: sa.ColumnElement[Any] | None = None,
+    ) -> OutboxEvent | None:
+        values: dict[str, Any] = {"status": status, "updated_at": datetime.now(UTC)}
+        if payload is not None:
+            values["payload"] = payload
+        row = (
+            self._session.execute(
+                sa.update(_OUTBOX)
+                .where(_OUTBOX.c.id == event_id)
+                .values(values)
+                .returning(*_OUTBOX.c)
+            )
+            .mappings()
+            .first()
+        )
+        return None if row is None else _to_entity(OutboxEvent, row)
+
+
+class SqlAlchemyBufferedOutboxEventRepository(SqlAlchemyOutboxEventRepository):
+    """Outbox repository that defers appends and writes them in one statement.
+
+    ``save`` only records the event; ``flush`` upserts every buffered event with
+    a single multi-row ``INSERT ... ON CONFLICT (id, created_at) DO UPDATE`` in
+    the caller's transaction, so events still commit or roll back with the state
+    change that produced them. Reads and status updates flush first.
+    """
+
+    def __init__(self, session: Session) -> None:
+        super().__init__(session)
+        self._pending: dict[UUID, OutboxEvent] = {}
+
+    def save(self, event: OutboxEvent) -> OutboxEvent:
+        self._pending[event.id] = event
+        return event
+
+    @property
+    def buffered_ids(self) -> Collection[UUID]:
+        return self._pending.keys()
+
+    def discard(self, event_ids: Collection[UUID]) -> None:
+        """Forget buffered events, e.g. those of a rolled-back savepoint."""
+
+        for event_id in event_ids:
+            self._pending.pop(event_id, None)
+
+    def flush(self) -> int:
+        if not self._pending:
+            return 0
+        rows = [_entity_values(event) for event in self._pending.values()]
+        statement = _upsert_statement(self._session, _OUTBOX)
+        # ``created_at`` is part of the key of the partitioned table.
+        statement = statement.on_conflict_do_update(
+            index_elements=[_OUTBOX.c.id, _OUTBOX.c.created_at],
+            set_={
+                name: statement.excluded[name]
+                for name in rows[0]
+                if name not in {"id", "created_at"}
+            },
+        )
+        # Executemany: sent as multi-row VALUES pages, compiled once and cached.
+        self._session.execute(statement, rows)
+        flushed = len(self._pending)
+        self._pending.clear()
+        return flushed
+
+    def lease_pending(self, limit: int = 100) -> list[OutboxEvent]:
+        self.flush()
+        return super().lease_pending(limit)
+
+    def mark_complete(self, event_id: UUID) -> OutboxEvent | None:
+        self.flush()
+        return super().mark_complete(event_id)
+
+    def mark_failed(self, event_id: UUID, reason: str | None) -> OutboxEvent | None:
+        self.flush()
+        return super().mark_failed(event_id, reason)
@@ -1,32 +1,272 @@
-"""Session factory and FastAPI-friendly session dependency helpers."""
+"""Session factory and FastAPI-friendly session dependency helpers.
+
+Writes always go to ``DATABASE_URL``. When ``DATABASE_REPLICA_URLS`` lists
+read replicas (comma-separated), each gets its own engine and pool, and
+lag-tolerant reads (:func:`get_read_session`, the unit of work's list and
+stats queries) are spread over the replicas whose replication lag is within
+``DATABASE_REPLICA_MAX_LAG_SECONDS``, falling back to the primary otherwise.
+"""
 
 from __future__ import annotations
 
+import logging
+import math
 import os
-from collections.abc import Generator
+import threading
+import time
+from collections.abc import Callable, Generator, Mapping, Sequence
+from dataclasses import dataclass
+from typing import cast
 
-from sqlalchemy import Engine, create_engine
+from godlife_backend.adapter.persistence.query_stats import instrument_engine
+from godlife_backend.db.types import keep_json_encoded
+from sqlalchemy import Connection, Engine, create_engine, make_url, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, sessionmaker
 
+logger = logging.getLogger(__name__)
+
+REPLICA_MAX_LAG_SECONDS = 5.0
+REPLICA_CHECK_INTERVAL_SECONDS = 1.0
+REPLICA_CONNECT_TIMEOUT = 2
+
 
 def _database_url() -> str:
     return os.getenv("DATABASE_URL", "sqlite:///./godlife_backend.db")
 
 
+def _replica_urls() -> list[str]:
+    urls = os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    return [url.strip() for url in urls if url.strip()]
+
+
 _ENGINES: dict[str, Engine] = {}
 _SESSION_FACTORIES: dict[str, sessionmaker[Session]] = {}
+_REPLICA_POOLS: dict[str, ReplicaPool] = {}
+
+
+def _create_engine(
+    url: str, connect_args: Mapping[str, object] | None = None
+) -> Engine:
+    engine = create_engine(
+        url,
+        future=True,
+        echo=os.getenv("GODLIFE_DB_ECHO", "false").lower() in {"1", "true", "yes"},
+        connect_args=dict(connect_args or {}),
+    )
+    return instrument_engine(keep_json_encoded(engine))
 
 
 def _engine() -> Engine:
     if "default" not in _ENGINES:
-        _ENGINES["default"] = create_engine(
-            _database_url(),
-            future=True,
-            echo=os.getenv("GODLIFE_DB_ECHO", "false").lower() in {"1", "true", "yes"},
-        )
+        _ENGINES["default"] = _create_engine(_database_url())
     return _ENGINES["default"]
 
 
+def replication_lag(conn: Connection) -> float:
+    """Seconds the replica behind ``conn`` trails its primary.
+
+    A PostgreSQL standby that has replayed everything it received counts as
+    current only while its WAL receiver is streaming and has heard from the
+    primary within the last minute (``wal_receiver_timeout``'s default): a
+    disconnected standby also has nothing left to replay. Otherwise the lag is
+    the age of the last replayed transaction, or infinite if there is none.
+    Reading ``pg_stat_wal_receiver`` needs ``pg_read_all_stats`` (granted by
+    ``pg_monitor``); without it an idle primary makes replicas look behind.
+    Other dialects have no replication to measure and always report zero.
+    """
+
+    if conn.dialect.name != "postgresql":
+        return 0.0
+    lag = conn.scalar(
+        text(
+            "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0"
+            " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()"
+            " AND EXISTS (SELECT 1 FROM pg_stat_wal_receiver"
+            " WHERE status = 'streaming'"
+            " AND last_msg_receipt_time > now() - interval '1 minute') THEN 0"
+            " ELSE COALESCE(EXTRACT(EPOCH FROM"
+            " now() - pg_last_xact_replay_timestamp()), 'Infinity') END"
+        )
+    )
+    return float(lag if lag is not None else math.inf)
+
+
+@dataclass(slots=True)
+class _Replica:
+    engine: Engine
+    lag: float = math.inf
+    checked_at: float = -math.inf
+
+
+class ReplicaPool:
+    """Round-robin over replicas that are caught up, else the primary.
+
+    Lag is measured by :meth:`refresh`, which :meth:`start` runs every
+    ``check_interval_seconds`` on a background thread; :meth:`engine` only
+    reads the last readings, so no request waits on a probe. A replica that
+    cannot be reached counts as infinitely behind, and one whose reading is
+    older than ``stale_after_seconds`` (the refresher stalled) is not used.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: Sequence[Engine],
+        *,
+        max_lag_seconds: float = REPLICA_MAX_LAG_SECONDS,
+        check_interval_seconds: float = REPLICA_CHECK_INTERVAL_SECONDS,
+        stale_after_seconds: float | None = None,
+        lag_probe: Callable[[Connection], float] = replication_lag,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.primary = primary
+        self._replicas = [_Replica(engine) for engine in replicas]
+        self._max_lag = max_lag_seconds
+        self._interval = check_interval_seconds
+        self._stale_after = (
+            stale_after_seconds
+            if stale_after_seconds is not None
+            else 3 * check_interval_seconds
+        )
+        self._probe = lag_probe
+        self._clock = clock
+        self._next = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher: threading.Thread | None = None
+
+    def engine(self) -> Engine:
+        """The engine the next lag-tolerant read should use."""
+
+        with self._lock:
+            now = self._clock()
+            count = len(self._replicas)
+            for offset in range(count):
+                index = (self._next + offset) % count
+                replica = self._replicas[index]
+                fresh = now - replica.checked_at <= self._stale_after
+                if fresh and replica.lag <= self._max_lag:
+                    self._next = (index + 1) % count
+                    return replica.engine
+        return self.primary
+
+    def refresh(self) -> None:
+        """Probe every replica and record its lag; the lock is not held."""
+
+        for replica in self._replicas:
+            lag = self._measure(replica)
+            with self._lock:
+                was_current = replica.lag <= self._max_lag
+                replica.lag = lag
+                replica.checked_at = self._clock()
+            if was_current and lag > self._max_lag:
+                logger.warning(
+                    "replica %s is %.1fs behind; reading from elsewhere",
+                    replica.engine.url,
+                    lag,
+                )
+
+    def start(self) -> None:
+        """Refresh now and then every interval on a daemon thread."""
+
+        if self._refresher is not None:
+            return
+        self._refresher = threading.Thread(
+            target=self._refresh_until_stopped, name="replica-lag", daemon=True
+        )
+        self._refresher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=5)
+            self._refresher = None
+
+    def _refresh_until_stopped(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("replica lag refresh failed")
+            if self._stop.wait(self._interval):
+                return
+
+    def _measure(self, replica: _Replica) -> float:
+        try:
+            with replica.engine.connect() as conn:
+                return self._probe(conn)
+        except SQLAlchemyError:
+            logger.warning("replica %s unreachable", replica.engine.url, exc_info=True)
+            return math.inf
+
+
+def _create_replica_engine(url: str) -> Engine:
+    if make_url(url).get_backend_name() != "postgresql":
+        return _create_engine(url)
+    # A dead replica must fail fast, both for the lag probe and for reads.
+    timeout = int(
+        os.getenv("DATABASE_REPLICA_CONNECT_TIMEOUT_SECONDS", REPLICA_CONNECT_TIMEOUT)
+    )
+    return _create_engine(url, connect_args={"connect_timeout": timeout})
+
+
+def _replica_pool() -> ReplicaPool | None:
+    urls = _replica_urls()
+    if not urls:
+        return None
+    if "default" not in _REPLICA_POOLS:
+        replicas: list[Engine] = []
+        for index, url in enumerate(urls):
+            key = f"replica:{index}"
+            if key not in _ENGINES:
+                _ENGINES[key] = _create_replica_engine(url)
+            replicas.append(_ENGINES[key])
+        pool = ReplicaPool(
+            _engine(),
+            replicas,
+            max_lag_seconds=float(
+                os.getenv("DATABASE_REPLICA_MAX_LAG_SECONDS", REPLICA_MAX_LAG_SECONDS)
+            ),
+            check_interval_seconds=float(
+                os.getenv(
+                    "DATABASE_REPLICA_CHECK_SECONDS", REPLICA_CHECK_INTERVAL_SECONDS
+                )
+            ),
+        )
+        pool.start()
+        _REPLICA_POOLS["default"] = pool
+    return _REPLICA_POOLS["default"]
+
+
+def dispose_engines(*, close: bool = True) -> None:
+    """Drop pooled connections of every cached engine.
+
+    ``close=False`` only forgets them, which is what a forked child must do:
+    the sockets belong to the parent and closing them from the child would
+    break the parent's connections.
+    """
+
+    if close:
+        # Refreshers probe through these engines; pools restart on next use.
+        for pool in _REPLICA_POOLS.values():
+            pool.stop()
+        _REPLICA_POOLS.clear()
+    for engine in _ENGINES.values():
+        engine.dispose(close=close)
+
+
+def _reset_in_child() -> None:
+    dispose_engines(close=False)
+    # Lag readings and the pool lock are rebuilt rather than inherited.
+    _REPLICA_POOLS.clear()
+
+
+# Any fork (prefork server, multiprocessing, gunicorn) gets a fresh pool in the
+# child instead of sharing the parent's connections.
+os.register_at_fork(after_in_child=_reset_in_child)
+
+
 def _session_factory() -> sessionmaker[Session]:
     if "default" not in _SESSION_FACTORIES:
         _SESSION_FACTORIES["default"] = sessionmaker(
@@ -38,10 +278,67 @@ def _session_factory() -> sessionmaker[Session]:
     return _SESSION_FACTORIES["default"]
 
 
+def _read_session_factory() -> Callable[[], Session]:
+    """Sessions for reads that tolerate replica lag; the primary without replicas."""
+
+    factory = _session_factory()
+    pool = _replica_pool()
+    if pool is None:
+        return factory
+    return lambda: factory(bind=pool.engine())
+
+
+class _LazySession:
+    """Stand-in for ``Session`` that builds the real one on first attribute use.
+
+    Until a repository actually runs a statement no session exists and no pooled
+    connection is checked out, so ``commit``/``rollback``/``close`` are no-ops.
+    They are also skipped when the session never began a transaction.
+    """
+
+    __slots__ = ("_factory", "_session")
+
+    def __init__(self, factory: Callable[[], Session]) -> None:
+        self._factory = factory
+        self._session: Session | None = None
+
+    def __getattr__(self, name: str) -> object:
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    def commit(self) -> None:
+        if self._session is not None and self._session.in_transaction():
+            self._session.commit()
+
+    def rollback(self) -> None:
+        if self._session is not None and self._session.in_transaction():
+            self._session.rollback()
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+def lazy_session(factory: Callable[[], Session] | None = None) -> Session:
+    """Return a session that is only created once something uses it."""
+
+    return cast(Session, _LazySession(factory or _session_factory()))
+
+
+def lazy_read_session() -> Session | None:
+    """Lazy replica-routed session, or ``None`` when no replica is configured."""
+
+    if not _replica_urls():
+        return None
+    return lazy_session(_read_session_factory())
+
+
 def get_session() -> Generator[Session]:
     """Yield SQLAlchemy session for FastAPI dependencies."""
 
-    session = _session_factory()()
+    session = lazy_session()
     try:
         yield session
         session.commit()
@@ -50,3 +347,18 @@ def get_session() -> Generator[Session]:
         raise
     finally:
         session.close()
+
+
+def get_read_session() -> Generator[Session]:
+    """Yield a read-only session for FastAPI dependencies.
+
+    Nothing read through it is committed; it may trail the primary by up to
+    ``DATABASE_REPLICA_MAX_LAG_SECONDS``.
+    """
+
+    session = lazy_session(_read_session_factory())
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
@@ -0,0 +1,153 @@
+"""Request-scoped unit of work sharing one session and repository set."""
+
+from __future__ import annotations
+
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from functools import cached_property
+from types import TracebackType
+
+from godlife_backend.adapter.persistence.repositories.sqlalchemy_repositories import (
+    SqlAlchemyBufferedOutboxEventRepository,
+    SqlAlchemyExercisePlanRepository,
+    SqlAlchemyExerciseSessionRepository,
+    SqlAlchemyExerciseSetStateRepository,
+    SqlAlchemyNotificationRepository,
+    SqlAlchemyReadingLogRepository,
+    SqlAlchemyReadingPlanRepository,
+    SqlAlchemyUserDailyStatsRepository,
+    SqlAlchemyUserProfileRepository,
+    SqlAlchemyUserRepository,
+    SqlAlchemyWebhookEventRepository,
+)
+from godlife_backend.adapter.persistence.session import (
+    lazy_read_session,
+    lazy_session,
+)
+from sqlalchemy.orm import Session
+
+
+class SqlAlchemyUnitOfWork:
+    """Build each repository on first access and commit everything together.
+
+    Every service resolved in the same request receives the same repository
+    objects. Outbox appends are buffered and written with one multi-row insert
+    right before the commit, inside the same transaction as the state changes
+    that emitted them, which is the transactional-outbox guarantee.
+
+    List and stats queries run on ``read_session`` (a read replica) when one
+    is given, until the request first touches its primary session.
+    """
+
+    def __init__(self, session: Session, read_session: Session | None = None) -> None:
+        self.session = session
+        self.read_session = read_session
+
+    @cached_property
+    def users(self) -> SqlAlchemyUserRepository:
+        return SqlAlchemyUserRepository(self.session)
+
+    @cached_property
+    def user_profiles(self) -> SqlAlchemyUserProfileRepository:
+        return SqlAlchemyUserProfileRepository(self.session)
+
+    @cached_property
+    def plans(self) -> SqlAlchemyExercisePlanRepository:
+        return SqlAlchemyExercisePlanRepository(self.session, self.read_session)
+
+    @cached_property
+    def sessions(self) -> SqlAlchemyExerciseSessionRepository:
+        return SqlAlchemyExerciseSessionRepository(self.session)
+
+    @cached_property
+    def set_states(self) -> SqlAlchemyExerciseSetStateRepository:
+        return SqlAlchemyExerciseSetStateRepository(self.session)
+
+    @cached_property
+    def reading_plans(self) -> SqlAlchemyReadingPlanRepository:
+        return SqlAlchemyReadingPlanRepository(self.session)
+
+    @cached_property
+    def reading_logs(self) -> SqlAlchemyReadingLogRepository:
+        return SqlAlchemyReadingLogRepository(self.session, self.read_session)
+
+    @cached_property
+    def daily_stats(self) -> SqlAlchemyUserDailyStatsRepository:
+        return SqlAlchemyUserDailyStatsRepository(self.session, self.read_session)
+
+    @cached_property
+    def notifications(self) -> SqlAlchemyNotificationRepository:
+        return SqlAlchemyNotificationRepository(self.session, self.read_session)
+
+    @cached_property
+    def webhook_events(self) -> SqlAlchemyWebhookEventRepository:
+        return SqlAlchemyWebhookEventRepository(self.session)
+
+    @cached_property
+    def outbox(self) -> SqlAlchemyBufferedOutboxEventRepository:
+        return SqlAlchemyBufferedOutboxEventRepository(self.session)
+
+    @contextmanager
+    def savepoint(self) -> Iterator[None]:
+        """Roll back writes made inside the block if it raises.
+
+        Uses a ``SAVEPOINT`` in the current transaction; outbox events buffered
+        inside the block are dropped with it.
+        """
+
+        buffered = set(self.outbox.buffered_ids) if "outbox" in self.__dict__ else set()
+        try:
+            with self.session.begin_nested():
+                yield
+        except BaseException:
+            if "outbox" in self.__dict__:
+                self.outbox.discard(set(self.outbox.buffered_ids) - buffered)
+            raise
+
+    def flush(self) -> None:
+        if "outbox" in self.__dict__:
+            self.outbox.flush()
+
+    def commit(self) -> None:
+        self.flush()
+        self.session.commit()
+
+    def rollback(self) -> None:
+        # Buffered events belong to the aborted transaction; drop them with it.
+        self.__dict__.pop("outbox", None)
+        self.session.rollback()
+
+    def __enter__(self) -> SqlAlchemyUnitOfWork:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        try:
+            if exc_type is not None:
+                self.rollback()
+                return
+            try:
+                self.commit()
+            except Exception:
+                self.rollback()
+                raise
+        finally:
+            self.session.close()
+            if self.read_session is not None:
+                self.read_session.close()
+
+
+def get_unit_of_work() -> Generator[SqlAlchemyUnitOfWork]:
+    """Yield one unit of work per request; FastAPI caches it across dependencies.
+
+    The session is lazy, so requests rejected before any repository call (for
+    example a provider mismatch on a webhook) never check out a connection.
+    The replica session, when replicas are configured, is lazy as well.
+    """
+
+    with SqlAlchemyUnitOfWork(lazy_session(), lazy_read_session()) as unit_of_work:
+        yield unit_of_work
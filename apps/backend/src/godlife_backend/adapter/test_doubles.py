@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
-from dataclasses import dataclass, field
-from datetime import date
+from collections.abc import Collection, Iterator, Mapping, Sequence
+from copy import copy
+from dataclasses import dataclass, field, replace
+from datetime import UTC, date, datetime
 from typing import Protocol
 from uuid import UUID
 
+from godlife_backend.application.cache import SharedCache
 from godlife_backend.db.enums import (
     NotificationStatus,
     OutboxStatus,
@@ -23,9 +25,12 @@ from godlife_backend.domain.entities import (
     ReadingLog,
     ReadingPlan,
     User,
+    UserDailyStats,
     UserProfile,
     WebhookEvent,
 )
+from godlife_backend.domain.errors import ConcurrencyConflictError
+from godlife_backend.domain.payload import JsonPayload
 from godlife_backend.domain.ports import (
     ExercisePlanRepository,
     ExerciseSessionRepository,
@@ -34,10 +39,16 @@ from godlife_backend.domain.ports import (
     OutboxEventRepository,
     ReadingLogRepository,
     ReadingPlanRepository,
+    UserDailyStatsRepository,
     UserProfileRepository,
     UserRepository,
     WebhookEventRepository,
 )
+from godlife_backend.domain.progress import SET_COUNTER_FIELDS, set_counter_deltas
+
+_DUE_NOTIFICATION_STATUSES = frozenset(
+    {NotificationStatus.SCHEDULED, NotificationStatus.RETRY_SCHEDULED}
+)
 
 
 class _HasId(Protocol):
@@ -55,6 +66,32 @@ class _IndexedStore[U: _HasId]:
         return list(self.entities.values())
 
 
+class _HasVersion(_HasId, Protocol):
+    version: int
+
+
+def _compare_and_swap[V: _HasVersion](
+    store: _IndexedStore[V], entity: V, entity_name: str
+) -> None:
+    """Mirror the SQL version check and keep a private snapshot of the row."""
+
+    current = store.entities.get(entity.id)
+    committed_version = 0 if current is None else current.version
+    if committed_version != entity.version:
+        raise ConcurrencyConflictError(entity_name, entity.id, entity.version)
+    entity.version += 1
+    store.upsert(copy(entity))
+
+
+def _increment_set_counters(entity: object, deltas: Mapping[str, int]) -> bool:
+    changed = False
+    for name, delta in deltas.items():
+        if name in SET_COUNTER_FIELDS and delta:
+            setattr(entity, name, getattr(entity, name) + delta)
+            changed = True
+    return changed
+
+
 class InMemoryUserRepository(UserRepository):
     def __init__(self) -> None:
         self._store = _IndexedStore[User]()
@@ -68,6 +105,20 @@ class InMemoryUserRepository(UserRepository):
                 return user
         return None
 
+    def map_kakao_user_ids(self, kakao_user_ids: Collection[str]) -> dict[str, UUID]:
+        wanted = set(kakao_user_ids)
+        return {
+            user.kakao_user_id: user.id
+            for user in self._store.list_all()
+            if user.kakao_user_id in wanted
+        }
+
+    def iter_kakao_user_ids(
+        self, batch_size: int = 10_000
+    ) -> Iterator[tuple[str, UUID]]:
+        for user in self._store.list_all():
+            yield user.kakao_user_id, user.id
+
     def save(self, user: User) -> User:
         self._store.upsert(user)
         return user
@@ -101,11 +152,12 @@ class InMemoryExercisePlanRepository(ExercisePlanRepository):
                 and plan.target_date == target_date
                 and plan.status == PlanStatus.ACTIVE
             ):
-                return plan
+                return replace(plan)
         return None
 
     def get_by_id(self, plan_id: UUID) -> ExercisePlan | None:
-        return self._store.entities.get(plan_id)
+        plan = self._store.entities.get(plan_id)
+        return None if plan is None else replace(plan)
 
     def list_by_user(
         self,
@@ -115,7 +167,7 @@ class InMemoryExercisePlanRepository(ExercisePlanRepository):
         status: PlanStatus | None = None,
     ) -> list[ExercisePlan]:
         plans: list[ExercisePlan] = [
-            plan
+            replace(plan)
             for plan in self._store.list_all()
             if plan.user_id == user_id and (status is None or plan.status == status)
         ]
@@ -127,9 +179,14 @@ class InMemoryExercisePlanRepository(ExercisePlanRepository):
         return plans
 
     def save(self, plan: ExercisePlan) -> ExercisePlan:
-        self._store.upsert(plan)
+        _compare_and_swap(self._store, plan, "ExercisePlan")
         return plan
 
+    def increment_set_counters(self, plan_id: UUID, deltas: Mapping[str, int]) -> None:
+        plan = self._store.entities.get(plan_id)
+        if plan is not None and _increment_set_counters(plan, deltas):
+            plan.version += 1
+
 
 class InMemoryExerciseSessionRepository(ExerciseSessionRepository):
     def __init__(self) -> None:
@@ -152,27 +209,50 @@ class InMemoryExerciseSessionRepository(ExerciseSessionRepository):
         self._store.upsert(session)
         return session
 
+    def increment_set_counters(
+        self, session_id: UUID, deltas: Mapping[str, int]
+    ) -> None:
+        session = self._store.entities.get(session_id)
+        if session is not None:
+            _increment_set_counters(session, deltas)
+
 
 class InMemoryExerciseSetStateRepository(ExerciseSetStateRepository):
-    def __init__(self) -> None:
+    """Set states; new sets are counted on the given session and plan doubles,
+    as the SQL repository does in the insert's transaction."""
+
+    def __init__(
+        self,
+        session_repository: InMemoryExerciseSessionRepository | None = None,
+        plan_repository: InMemoryExercisePlanRepository | None = None,
+    ) -> None:
         self._store = _IndexedStore[ExerciseSetState]()
+        self._session_repository = session_repository
+        self._plan_repository = plan_repository
 
     def get(self, session_id: UUID, set_no: int) -> ExerciseSetState | None:
         for state in self._store.list_all():
             if state.session_id == session_id and state.set_no == set_no:
-                return state
+                return replace(state)
         return None
 
     def list_pending(self, session_id: UUID) -> list[ExerciseSetState]:
         pending: list[ExerciseSetState] = [
-            state
+            replace(state)
             for state in self._store.list_all()
             if state.session_id == session_id and state.status == SetStatus.PENDING
         ]
         return sorted(pending, key=lambda state: state.set_no)
 
     def save(self, state: ExerciseSetState) -> ExerciseSetState:
-        self._store.upsert(state)
+        created = state.version == 0
+        _compare_and_swap(self._store, state, "ExerciseSetState")
+        if created and self._session_repository is not None:
+            deltas = set_counter_deltas(None, state.status)
+            self._session_repository.increment_set_counters(state.session_id, deltas)
+            session = self._session_repository.get_by_id(state.session_id)
+            if session is not None and self._plan_repository is not None:
+                self._plan_repository.increment_set_counters(session.plan_id, deltas)
         return state
 
 
@@ -219,6 +299,41 @@ class InMemoryReadingLogRepository(ReadingLogRepository):
         return log
 
 
+class InMemoryUserDailyStatsRepository(UserDailyStatsRepository):
+    def __init__(self) -> None:
+        self._rows: dict[tuple[UUID, date], UserDailyStats] = {}
+
+    def get(self, user_id: UUID, stat_date: date) -> UserDailyStats | None:
+        row = self._rows.get((user_id, stat_date))
+        return None if row is None else replace(row)
+
+    def list_range(
+        self, user_id: UUID, from_date: date, to_date: date
+    ) -> list[UserDailyStats]:
+        rows = [
+            replace(row)
+            for (row_user_id, stat_date), row in self._rows.items()
+            if row_user_id == user_id and from_date <= stat_date <= to_date
+        ]
+        return sorted(rows, key=lambda row: row.stat_date)
+
+    def increment(
+        self, user_id: UUID, stat_date: date, deltas: Mapping[str, float]
+    ) -> UserDailyStats:
+        row = self._rows.setdefault(
+            (user_id, stat_date), UserDailyStats(user_id=user_id, stat_date=stat_date)
+        )
+        for name, delta in deltas.items():
+            setattr(row, name, getattr(row, name) + delta)
+        row.updated_at = datetime.now(UTC)
+        return replace(row)
+
+    def set_streak(self, user_id: UUID, stat_date: date, streak_days: int) -> None:
+        row = self._rows.get((user_id, stat_date))
+        if row is not None:
+            row.streak_days = streak_days
+
+
 class InMemoryNotificationRepository(NotificationRepository):
     def __init__(self) -> None:
         self._store = _IndexedStore[Notification]()
@@ -255,11 +370,29 @@ class InMemoryNotificationRepository(NotificationRepository):
         notifications.sort(key=lambda n: n.schedule_at, reverse=True)
         return notifications
 
+    def list_due(self, before: datetime, limit: int = 100) -> Sequence[Notification]:
+        due = sorted(
+            (
+                n
+                for n in self._store.list_all()
+                if n.status in _DUE_NOTIFICATION_STATUSES and n.schedule_at < before
+            ),
+            key=lambda n: n.schedule_at,
+        )
+        return due[:limit]
+
     def save(self, notification: Notification) -> Notification:
         self._store.upsert(notification)
         return notification
 
 
+def _webhook_keys(event: WebhookEvent) -> list[tuple[str, str, str]]:
+    keys = [(event.provider, "idempotency_key", event.idempotency_key)]
+    if event.event_id is not None:
+        keys.append((event.provider, "event_id", event.event_id))
+    return keys
+
+
 class InMemoryWebhookEventRepository(WebhookEventRepository):
     def __init__(self) -> None:
         self._store = _IndexedStore[WebhookEvent]()
@@ -274,6 +407,20 @@ class InMemoryWebhookEventRepository(WebhookEventRepository):
         self._store.upsert(event)
         return event
 
+    def insert_new(self, events: Sequence[WebhookEvent]) -> set[UUID]:
+        taken = {
+            key for stored in self._store.list_all() for key in _webhook_keys(stored)
+        }
+        inserted: set[UUID] = set()
+        for event in events:
+            keys = _webhook_keys(event)
+            if event.id in self._store.entities or not taken.isdisjoint(keys):
+                continue
+            taken.update(keys)
+            self._store.upsert(event)
+            inserted.add(event.id)
+        return inserted
+
     def get_by_provider_and_event_id(
         self, provider: str, event_id: str
     ) -> WebhookEvent | None:
@@ -303,6 +450,16 @@ class InMemoryOutboxEventRepository(OutboxEventRepository):
         ]
         return sorted(events, key=lambda event: event.created_at)[:limit]
 
+    def list_recent(
+        self, event_types: Collection[str], since: datetime, limit: int = 1000
+    ) -> list[OutboxEvent]:
+        events = [
+            event
+            for event in self._store.list_all()
+            if event.event_type in event_types and event.created_at >= since
+        ]
+        return sorted(events, key=lambda event: event.created_at)[:limit]
+
     def save(self, event: OutboxEvent) -> OutboxEvent:
         self._store.upsert(event)
         return event
@@ -319,6 +476,28 @@ class InMemoryOutboxEventRepository(OutboxEventRepository):
         if event is None:
             return None
         if reason is not None:
-            event.payload = {**event.payload, "failure_reason": reason}
+            event.payload = JsonPayload.of(event.payload).patched(
+                {"failure_reason": reason}
+            )
         event.status = OutboxStatus.FAILED
         return event
+
+
+class InMemorySharedCache(SharedCache):
+    """Process-local stand-in for the shared cache tier; TTLs are recorded only."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+        self.ttls: dict[str, float] = {}
+
+    def get(self, key: str) -> bytes | None:
+        return self.values.get(key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self.values[key] = value
+        self.ttls[key] = ttl_seconds
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.values.pop(key, None)
+            self.ttls.pop(key, None)
@@ -2,22 +2,116 @@
 
 from __future__ import annotations
 
+import os
+import threading
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
 from fastapi import FastAPI
-from godlife_backend.adapter.webapi.routers.health import router as health_router
-from godlife_backend.adapter.webapi.routers.notifications import (
-    router as notifications_router,
-)
-from godlife_backend.adapter.webapi.routers.plans import router as plans_router
-from godlife_backend.adapter.webapi.routers.webhooks import router as webhooks_router
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    from godlife_backend.adapter.webapi.dependencies import (
+        poll_cache_broadcast,
+        warm_kakao_user_resolver,
+    )
+
+    warm_kakao_user_resolver()
+    # Threads start here rather than at import so each prefork worker runs
+    # its own.
+    stop = threading.Event()
+    poller = threading.Thread(
+        target=poll_cache_broadcast,
+        args=(stop,),
+        name="cache-broadcast",
+        daemon=True,
+    )
+    threads = [poller]
+    metrics = getattr(app.state, "metrics", None)
+    if metrics is not None and metrics.shared:
+        threads.append(
+            threading.Thread(
+                target=metrics.publish,
+                args=(stop,),
+                name="metrics-publish",
+                daemon=True,
+            )
+        )
+    for thread in threads:
+        thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in {"1", "true", "yes"}
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="GodLife API", version="0.1.0")
+    # Routers pull in every service and repository; import them only when an
+    # app is actually built so importing this module stays cheap.
+    from godlife_backend.adapter.webapi.metrics import (
+        MetricsMiddleware,
+        MetricsRegistry,
+    )
+    from godlife_backend.adapter.webapi.routers.health import router as health_router
+    from godlife_backend.adapter.webapi.routers.metrics import (
+        router as metrics_router,
+    )
+    from godlife_backend.adapter.webapi.routers.notifications import (
+        router as notifications_router,
+    )
+    from godlife_backend.adapter.webapi.routers.plans import router as plans_router
+    from godlife_backend.adapter.webapi.routers.users import router as users_router
+    from godlife_backend.adapter.webapi.routers.webhooks import (
+        router as webhooks_router,
+    )
+
+    app = FastAPI(title="GodLife API", version="0.1.0", lifespan=_lifespan)
     app.include_router(health_router)
     app.include_router(plans_router)
     app.include_router(notifications_router)
     app.include_router(webhooks_router)
+    app.include_router(users_router)
+    if _env_flag("GODLIFE_METRICS", "true"):
+        directory = os.getenv("GODLIFE_METRICS_DIR")
+        app.state.metrics = MetricsRegistry(Path(directory) if directory else None)
+        app.add_middleware(
+            MetricsMiddleware,  # type: ignore[arg-type]  # ParamSpec factory
+            registry=app.state.metrics,
+            server_timing=_env_flag("GODLIFE_SERVER_TIMING", "false"),
+        )
+        app.include_router(metrics_router)
+    if _env_flag("GODLIFE_QUERY_AUDIT", "false"):
+        from godlife_backend.adapter.persistence.query_recorder import QueryBudget
+        from godlife_backend.adapter.webapi.query_audit import QueryAuditMiddleware
+
+        budget = QueryBudget(
+            slow_seconds=float(os.getenv("GODLIFE_SLOW_QUERY_MS", "100")) / 1000,
+            allow_sequential_scans=False,
+        )
+        app.add_middleware(
+            QueryAuditMiddleware,  # type: ignore[arg-type]  # ParamSpec factory
+            budget=budget,
+        )
     return app
 
 
-app = create_app()
+_APP: FastAPI | None = None
+
+
+def __getattr__(name: str) -> FastAPI:
+    """Build the module-level ``app`` (``...webapi.app:app``) on first access."""
+
+    global _APP
+    if name != "app":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if _APP is None:
+        _APP = create_app()
+    return _APP
@@ -2,48 +2,146 @@
 
 from __future__ import annotations
 
+import logging
+import os
+import threading
 from typing import Annotated
 
 from fastapi import Depends
+from godlife_backend.adapter.persistence.repositories.caching_repositories import (
+    CachingUserRepository,
+    register_user_cache_invalidation,
+    user_cache,
+)
 from godlife_backend.adapter.persistence.repositories.sqlalchemy_repositories import (
-    SqlAlchemyExercisePlanRepository,
-    SqlAlchemyExerciseSessionRepository,
-    SqlAlchemyExerciseSetStateRepository,
-    SqlAlchemyNotificationRepository,
     SqlAlchemyOutboxEventRepository,
-    SqlAlchemyWebhookEventRepository,
+    SqlAlchemyUserRepository,
+)
+from godlife_backend.adapter.persistence.session import _session_factory
+from godlife_backend.adapter.persistence.unit_of_work import (
+    SqlAlchemyUnitOfWork,
+    get_unit_of_work,
+)
+from godlife_backend.application.services.activity_summary_service import (
+    ActivitySeriesCache,
+    ActivitySummaryService,
+    register_activity_cache_invalidation,
+)
+from godlife_backend.application.services.daily_stats_service import (
+    DailyStatsService,
 )
-from godlife_backend.adapter.persistence.session import get_session
 from godlife_backend.application.services.exercise_plan_service import (
     ExercisePlanService,
 )
+from godlife_backend.application.services.kakao_user_resolver import (
+    KakaoUserResolver,
+)
 from godlife_backend.application.services.notification_service import (
     NotificationService,
 )
+from godlife_backend.application.services.outbox_broadcast import OutboxBroadcast
 from godlife_backend.application.services.webhook_service import WebhookService
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+logger = logging.getLogger(__name__)
+
+UnitOfWorkDep = Annotated[SqlAlchemyUnitOfWork, Depends(get_unit_of_work)]
+
+# Shared by every request in this process; stats events evict a user's series,
+# and the TTL is the backstop for evictions that race the projection worker.
+ACTIVITY_SERIES_CACHE = ActivitySeriesCache(max_entries=2048, ttl_seconds=60.0)
+USER_CACHE = user_cache()
+KAKAO_USER_RESOLVER = KakaoUserResolver()
+# Each API process tails the outbox for change events and drops its own entries.
+CACHE_BROADCAST = OutboxBroadcast()
+register_user_cache_invalidation(CACHE_BROADCAST, USER_CACHE)
+KAKAO_USER_RESOLVER.register(CACHE_BROADCAST)
+register_activity_cache_invalidation(CACHE_BROADCAST, ACTIVITY_SERIES_CACHE)
+
+
+def warm_kakao_user_resolver() -> None:
+    """Preload the Kakao id index; failures only cost the warm start."""
+
+    if len(KAKAO_USER_RESOLVER):
+        # Already loaded, e.g. by the prefork master before the workers forked.
+        return
+    if os.getenv("GODLIFE_WARM_KAKAO_INDEX", "true").lower() not in {
+        "1",
+        "true",
+        "yes",
+    }:
+        return
+    try:
+        with _session_factory()() as session:
+            loaded = KAKAO_USER_RESOLVER.warm(SqlAlchemyUserRepository(session))
+    except SQLAlchemyError:
+        logger.warning("kakao user index warm-up skipped", exc_info=True)
+        return
+    logger.info("kakao user index warmed with %d users", loaded)
 
-SessionDep = Annotated[Session, Depends(get_session)]
 
+def poll_cache_broadcast(stop: threading.Event) -> None:
+    """Poll the outbox for cache invalidations until ``stop`` is set.
 
-def get_plan_service(session: SessionDep) -> ExercisePlanService:
+    ``GODLIFE_CACHE_BROADCAST_SECONDS`` sets the interval; ``0`` disables the
+    poller and leaves the caches to their TTLs.
+    """
+
+    interval = float(os.getenv("GODLIFE_CACHE_BROADCAST_SECONDS", "1.0"))
+    if interval <= 0:
+        return
+    while not stop.wait(interval):
+        try:
+            with _session_factory()() as session:
+                CACHE_BROADCAST.poll(SqlAlchemyOutboxEventRepository(session))
+        except SQLAlchemyError:
+            logger.warning("cache invalidation poll failed", exc_info=True)
+
+
+def get_user_repository(uow: UnitOfWorkDep) -> CachingUserRepository:
+    return CachingUserRepository(
+        inner=uow.users, cache=USER_CACHE, outbox_repository=uow.outbox
+    )
+
+
+def get_plan_service(uow: UnitOfWorkDep) -> ExercisePlanService:
     return ExercisePlanService(
-        plan_repository=SqlAlchemyExercisePlanRepository(session),
-        session_repository=SqlAlchemyExerciseSessionRepository(session),
-        set_state_repository=SqlAlchemyExerciseSetStateRepository(session),
-        outbox_repository=SqlAlchemyOutboxEventRepository(session),
+        plan_repository=uow.plans,
+        session_repository=uow.sessions,
+        set_state_repository=uow.set_states,
+        outbox_repository=uow.outbox,
     )
 
 
-def get_notification_service(session: SessionDep) -> NotificationService:
+def get_notification_service(uow: UnitOfWorkDep) -> NotificationService:
     return NotificationService(
-        notification_repository=SqlAlchemyNotificationRepository(session),
-        outbox_repository=SqlAlchemyOutboxEventRepository(session),
+        notification_repository=uow.notifications,
+        outbox_repository=uow.outbox,
     )
 
 
-def get_webhook_service(session: SessionDep) -> WebhookService:
+def get_webhook_service(
+    uow: UnitOfWorkDep,
+    users: Annotated[CachingUserRepository, Depends(get_user_repository)],
+) -> WebhookService:
     return WebhookService(
-        webhook_event_repository=SqlAlchemyWebhookEventRepository(session),
-        outbox_repository=SqlAlchemyOutboxEventRepository(session),
+        webhook_event_repository=uow.webhook_events,
+        outbox_repository=uow.outbox,
+        user_repository=users,
+        user_resolver=KAKAO_USER_RESOLVER,
+    )
+
+
+def get_daily_stats_service(uow: UnitOfWorkDep) -> DailyStatsService:
+    return DailyStatsService(stats_repository=uow.daily_stats)
+
+
+def get_activity_summary_service(
+    uow: UnitOfWorkDep,
+    users: Annotated[CachingUserRepository, Depends(get_user_repository)],
+) -> ActivitySummaryService:
+    return ActivitySummaryService(
+        stats_repository=uow.daily_stats,
+        user_repository=users,
+        cache=ACTIVITY_SERIES_CACHE,
     )
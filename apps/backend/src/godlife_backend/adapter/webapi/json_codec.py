@@ -0,0 +1,188 @@
+"""JSON encoding and decoding helpers for the web API.
+
+``orjson`` is used when the optional ``fastjson`` extra is installed; otherwise
+every helper falls back to pydantic's Rust serializer, so behaviour is the same
+either way and only the speed differs.
+
+FastAPI already serializes routes with a ``response_model`` through a prebuilt
+``TypeAdapter``. Replacing the app-wide ``default_response_class`` would turn
+that path off, so :class:`FastJSONResponse` is meant for routes that return
+dicts or domain dataclasses, where the generic ``jsonable_encoder`` walk is the
+slow part.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from functools import cache
+from typing import Any
+
+from fastapi.exceptions import RequestValidationError
+from godlife_backend.domain.payload import JsonPayload
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when the extra is absent
+    orjson = None  # type: ignore[assignment]
+
+HAS_ORJSON = orjson is not None
+
+
+@cache
+def type_adapter[T](tp: type[T]) -> TypeAdapter[T]:
+    """Return the process-wide adapter for ``tp``; building one is the costly part."""
+
+    return TypeAdapter(tp)
+
+
+def dumps(value: object) -> bytes:
+    """Encode models, dataclasses and JSON-compatible values straight to bytes.
+
+    UUIDs, dates and enums inside domain dataclasses are handled natively, with
+    no intermediate ``dict`` copy.
+    """
+
+    if orjson is not None and not isinstance(value, BaseModel):
+        return orjson.dumps(value, default=_fragment)
+    return type_adapter(type(value)).dump_json(value, fallback=_plain_payload)
+
+
+def _fragment(value: object) -> object:
+    # Stored payloads are embedded as their JSON bytes, never decoded.
+    if isinstance(value, JsonPayload):
+        return orjson.Fragment(value.to_json())
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _plain_payload(value: object) -> object:
+    if isinstance(value, JsonPayload):
+        return dict(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:  # noqa: ANN401
+    if orjson is not None:
+        return orjson.loads(data)
+    return type_adapter(object).validate_json(data)
+
+
+def parse_model[M: BaseModel](model: type[M], body: bytes) -> M:
+    """Decode ``body`` once and validate it as ``model``."""
+
+    return parse_body(type_adapter(model), body)
+
+
+def parse_body[T](adapter: TypeAdapter[T], body: bytes) -> T:
+    """Decode ``body`` once and validate it with ``adapter``.
+
+    Errors are re-raised as ``RequestValidationError`` so the client sees the
+    same 422 response FastAPI produces for a declared body parameter.
+    """
+
+    try:
+        if orjson is None:
+            return adapter.validate_json(body)
+        return adapter.validate_python(orjson.loads(body))
+    except ValidationError as exc:
+        raise _request_error(exc) from exc
+    except ValueError as exc:
+        # orjson.JSONDecodeError subclasses ValueError.
+        raise _decode_error(("body",), exc) from exc
+
+
+def ndjson_documents(body: bytes) -> list[bytes]:
+    """Split a newline-delimited JSON body into its documents, skipping blanks."""
+
+    return [line for line in body.splitlines() if line.strip()]
+
+
+def parse_each[T](adapter: TypeAdapter[T], documents: Iterable[bytes]) -> list[T | str]:
+    """Decode and validate each encoded document on its own.
+
+    An invalid document yields a one-line description of its first error in
+    its place instead of failing the others.
+    """
+
+    results: list[T | str] = []
+    for document in documents:
+        try:
+            results.append(parse_body(adapter, document))
+        except RequestValidationError as exc:
+            results.append(_describe(exc.errors(), skip=1))
+    return results
+
+
+def validate_each[T](
+    adapter: TypeAdapter[T], values: Iterable[object]
+) -> list[T | str]:
+    """Validate each decoded value on its own; see :func:`parse_each`."""
+
+    results: list[T | str] = []
+    for value in values:
+        try:
+            results.append(adapter.validate_python(value))
+        except ValidationError as exc:
+            results.append(_describe(exc.errors(include_url=False)))
+    return results
+
+
+def _describe(errors: Sequence[Any], skip: int = 0) -> str:
+    error = errors[0]
+    loc = ".".join(str(part) for part in error["loc"][skip:])
+    return f"{loc}: {error['msg']}" if loc else str(error["msg"])
+
+
+def _request_error(exc: ValidationError) -> RequestValidationError:
+    return RequestValidationError(
+        [
+            {**error, "loc": ("body", *error["loc"])}
+            for error in exc.errors(include_url=False)
+        ]
+    )
+
+
+def _decode_error(
+    loc: tuple[str | int, ...], exc: ValueError
+) -> RequestValidationError:
+    return RequestValidationError(
+        [
+            {
+                "type": "json_invalid",
+                "loc": loc,
+                "msg": "JSON decode error",
+                "input": {},
+                "ctx": {"error": str(exc)},
+            }
+        ]
+    )
+
+
+def body_openapi(
+    tp: Any,  # noqa: ANN401 - any type pydantic can build a schema for
+    *media_types: str,
+) -> dict[str, Any]:
+    """Describe a body read through the ``parse_*`` helpers in the OpenAPI schema.
+
+    The schema is self-contained (``$defs`` inline) because the model is not a
+    declared parameter and therefore not registered under ``components``.
+    """
+
+    schema = TypeAdapter(tp).json_schema()
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": schema}
+                for media_type in media_types or ("application/json",)
+            },
+        }
+    }
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` that renders through :func:`dumps`."""
+
+    def render(self, content: object) -> bytes:
+        return dumps(content)
@@ -0,0 +1,338 @@
+"""Request latency and SQL round-trip metrics in Prometheus text format.
+
+``MetricsMiddleware`` times every HTTP request and, through
+:func:`track_queries`, counts the statements it ran and the time spent in the
+database. Observations are grouped by route template (``/webhooks/{provider}``
+rather than the concrete path) so label cardinality stays bounded.
+
+Under the prefork server every worker keeps its own registry, and a scrape
+reaches whichever worker accepts it. Given a shared ``directory`` (the server
+sets ``GODLIFE_METRICS_DIR``), each registry publishes a snapshot of its
+histograms there every ``flush_interval`` (see :meth:`MetricsRegistry.publish`)
+and ``/metrics`` renders the sum of all snapshots. A scrape folds the
+snapshots of exited workers into one aggregate file, so totals never go
+backwards across restarts and the directory does not grow with them;
+observations a worker made after its last flush are lost with it.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Event, Lock
+from time import perf_counter
+from typing import Any
+from uuid import uuid4
+
+from godlife_backend.adapter.persistence.query_stats import QueryStats, track_queries
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+UNMATCHED_ROUTE = "<unmatched>"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+AGGREGATE_NAME = "aggregate.json"
+LOCK_NAME = ".lock"
+
+_Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """Fixed-bucket histogram; bucket counts are stored non-cumulatively."""
+
+    __slots__ = ("bounds", "counts", "count", "total")
+
+    def __init__(self, bounds: Iterable[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def merge(self, counts: Iterable[int], total: float) -> None:
+        """Add another histogram's non-cumulative bucket counts and sum."""
+
+        for index, count in enumerate(counts):
+            self.counts[index] += count
+            self.count += count
+        self.total += total
+
+    def cumulative(self) -> Iterator[tuple[str, int]]:
+        running = 0
+        for bound, count in zip(self.bounds, self.counts, strict=False):
+            running += count
+            yield _format_number(bound), running
+        yield "+Inf", self.count
+
+
+_Families = dict[str, dict[_Labels, Histogram]]
+
+
+class MetricsRegistry:
+    """Thread-safe store for the request histograms rendered at ``/metrics``."""
+
+    _FAMILIES = (
+        (
+            "godlife_http_request_duration_seconds",
+            "HTTP request latency by route template.",
+            LATENCY_BUCKETS,
+        ),
+        (
+            "godlife_db_statements_per_request",
+            "SQL statements executed per HTTP request.",
+            STATEMENT_BUCKETS,
+        ),
+        (
+            "godlife_db_duration_seconds",
+            "Time spent in SQL statements per HTTP request.",
+            LATENCY_BUCKETS,
+        ),
+    )
+
+    def __init__(
+        self, directory: Path | None = None, flush_interval: float = 1.0
+    ) -> None:
+        self._lock = Lock()
+        self._series = self._empty()
+        self._directory = directory
+        self._flush_interval = flush_interval
+        self._owner: int | None = None
+        self._snapshot_path: Path | None = None
+
+    def observe_request(
+        self,
+        *,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        queries: QueryStats,
+    ) -> None:
+        labels = (("method", method), ("route", route), ("status", str(status)))
+        values = (seconds, float(queries.statements), queries.seconds)
+        with self._lock:
+            for (name, _, bounds), value in zip(self._FAMILIES, values, strict=True):
+                series = self._series[name]
+                histogram = series.get(labels)
+                if histogram is None:
+                    histogram = series[labels] = Histogram(bounds)
+                histogram.observe(value)
+
+    @property
+    def shared(self) -> bool:
+        return self._directory is not None
+
+    def publish(self, stop: Event) -> None:
+        """Flush every ``flush_interval`` until ``stop`` is set, then once more."""
+
+        while not stop.wait(self._flush_interval):
+            self.flush()
+        self.flush()
+
+    def flush(self) -> None:
+        """Publish this process's snapshot to the shared directory."""
+
+        if self._directory is None:
+            return
+        with self._lock:
+            if self._snapshot_path is None or self._owner != os.getpid():
+                # A registry built before the fork gets its own file in each
+                # worker, under a name no later process can reuse.
+                self._owner = os.getpid()
+                self._snapshot_path = self._directory / f"{os.getpid()}-{uuid4().hex}"
+            _write_atomically(
+                self._snapshot_path.with_suffix(".json"), _dump(self._series)
+            )
+
+    def render(self) -> str:
+        if self._directory is None:
+            return self._render(self._series)
+        self.flush()
+        with _locked(self._directory):
+            return self._render(self._merged(self._directory))
+
+    def _empty(self) -> _Families:
+        return {name: {} for name, _, _ in self._FAMILIES}
+
+    def _merged(self, directory: Path) -> _Families:
+        """Sum every snapshot, folding those of exited workers into the aggregate.
+
+        Runs under the directory lock. The aggregate names the snapshots it
+        already contains, so a fold interrupted before they were deleted is
+        finished on the next scrape instead of counting them twice.
+        """
+
+        retired = self._empty()
+        aggregate_path = directory / AGGREGATE_NAME
+        if aggregate_path.exists():
+            aggregate = json.loads(aggregate_path.read_text())
+            for name in aggregate["folded"]:
+                (directory / name).unlink(missing_ok=True)
+            self._fold(retired, aggregate["families"])
+        live = self._empty()
+        exited: list[Path] = []
+        for path in directory.glob("*-*.json"):
+            pid = int(path.name.split("-", 1)[0])
+            if _is_running(pid):
+                self._fold(live, json.loads(path.read_text()))
+            else:
+                self._fold(retired, json.loads(path.read_text()))
+                exited.append(path)
+        if exited:
+            _write_atomically(
+                aggregate_path,
+                {"folded": [path.name for path in exited], "families": _dump(retired)},
+            )
+            for path in exited:
+                path.unlink()
+        self._fold(live, _dump(retired))
+        return live
+
+    def _fold(self, families: _Families, snapshot: Mapping[str, Any]) -> None:
+        bounds = {name: family_bounds for name, _, family_bounds in self._FAMILIES}
+        for name, entries in snapshot.items():
+            if name not in families:
+                continue
+            for label_pairs, counts, total in entries:
+                labels = tuple((key, value) for key, value in label_pairs)
+                histogram = families[name].get(labels)
+                if histogram is None:
+                    histogram = families[name][labels] = Histogram(bounds[name])
+                histogram.merge(counts, total)
+
+    def _render(self, families: Mapping[str, Mapping[_Labels, Histogram]]) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name, help_text, _ in self._FAMILIES:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in sorted(families[name].items()):
+                    for bound, count in histogram.cumulative():
+                        bucket_labels = _render_labels((*labels, ("le", bound)))
+                        lines.append(f"{name}_bucket{bucket_labels} {count}")
+                    rendered = _render_labels(labels)
+                    lines.append(
+                        f"{name}_sum{rendered} {_format_number(histogram.total)}"
+                    )
+                    lines.append(f"{name}_count{rendered} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency and DB usage per route template.
+
+    With ``server_timing`` the response carries a ``Server-Timing`` header with
+    the database time and statement count accumulated before the response
+    started, plus the total handler time.
+    """
+
+    def __init__(
+        self, app: ASGIApp, registry: MetricsRegistry, server_timing: bool = False
+    ) -> None:
+        self.app = app
+        self.registry = registry
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        status = 500
+        with track_queries() as queries:
+
+            async def send_wrapper(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    if self.server_timing:
+                        header = _server_timing(queries, perf_counter() - started)
+                        message["headers"] = [
+                            *message.get("headers", ()),
+                            (b"server-timing", header.encode("latin-1")),
+                        ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                self.registry.observe_request(
+                    method=scope["method"],
+                    route=route_template(scope),
+                    status=status,
+                    seconds=perf_counter() - started,
+                    queries=queries,
+                )
+
+
+def _dump(families: Mapping[str, Mapping[_Labels, Histogram]]) -> dict[str, Any]:
+    return {
+        name: [
+            [list(labels), histogram.counts, histogram.total]
+            for labels, histogram in series.items()
+        ]
+        for name, series in families.items()
+    }
+
+
+def _write_atomically(path: Path, document: object) -> None:
+    partial = path.with_suffix(".tmp")
+    partial.write_text(json.dumps(document))
+    partial.replace(path)
+
+
+@contextmanager
+def _locked(directory: Path) -> Iterator[None]:
+    # Serializes scrapes so two workers never fold the same snapshot.
+    with (directory / LOCK_NAME).open("a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _is_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # running under another user
+    return True
+
+
+def route_template(scope: Mapping[str, Any]) -> str:
+    # Starlette stores the matched route in the scope while routing.
+    return getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+
+
+def _server_timing(queries: QueryStats, seconds: float) -> str:
+    return (
+        f'db;dur={queries.seconds * 1000:.2f};desc="{queries.statements} queries", '
+        f"app;dur={seconds * 1000:.2f}"
+    )
+
+
+def _render_labels(labels: Iterable[tuple[str, str]]) -> str:
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else f"{value:.1f}"
@@ -0,0 +1,41 @@
+"""Development-mode middleware logging N+1, slow and scanning queries per request."""
+
+from __future__ import annotations
+
+import logging
+
+from godlife_backend.adapter.persistence.query_recorder import (
+    QueryBudget,
+    record_queries,
+)
+from godlife_backend.adapter.webapi.metrics import route_template
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class QueryAuditMiddleware:
+    """Record each request's statements and warn about budget violations.
+
+    Plans are sampled with ``EXPLAIN`` once per ``SELECT`` shape per request,
+    which adds a round trip per shape: enable this in development only.
+    """
+
+    def __init__(self, app: ASGIApp, budget: QueryBudget) -> None:
+        self.app = app
+        self.budget = budget
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        explain = not self.budget.allow_sequential_scans
+        with record_queries(explain=explain) as recording:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                for violation in self.budget.violations(recording):
+                    logger.warning(
+                        "%s %s: %s", scope["method"], route_template(scope), violation
+                    )
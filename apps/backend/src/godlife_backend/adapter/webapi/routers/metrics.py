@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+from godlife_backend.adapter.webapi.metrics import CONTENT_TYPE, MetricsRegistry
+
+router = APIRouter()
+
+
+@router.get("/metrics", tags=["health"], include_in_schema=False)
+def metrics(request: Request) -> PlainTextResponse:
+    registry: MetricsRegistry = request.app.state.metrics
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
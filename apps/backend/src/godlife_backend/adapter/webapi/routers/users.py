@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from godlife_backend.adapter.webapi.dependencies import (
+    get_activity_summary_service,
+    get_daily_stats_service,
+)
+from godlife_backend.application.services.activity_summary_service import (
+    ActivitySummaryService,
+)
+from godlife_backend.application.services.daily_stats_service import (
+    DailyStatsService,
+)
+from pydantic import BaseModel
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+
+class DailyStatsResponse(BaseModel):
+    user_id: UUID
+    stat_date: date
+    sets_done: int = 0
+    volume_kg: float = 0.0
+    reading_minutes: float = 0.0
+    pages_read: int = 0
+    streak_days: int = 0
+
+
+class ActivitySummaryResponse(BaseModel):
+    user_id: UUID
+    as_of: date
+    current_streak_days: int
+    longest_streak_days: int
+    weekly_sets_done: int
+    weekly_volume_kg: float
+    weekly_reading_minutes: float
+    weekly_pages_read: int
+    monthly_reading_minutes: float
+
+
+@router.get("/{user_id}/summary", response_model=ActivitySummaryResponse)
+def get_activity_summary(
+    user_id: UUID,
+    service: Annotated[ActivitySummaryService, Depends(get_activity_summary_service)],
+) -> ActivitySummaryResponse:
+    summary = service.get_summary(user_id)
+    return ActivitySummaryResponse(
+        user_id=summary.user_id,
+        as_of=summary.as_of,
+        current_streak_days=summary.current_streak_days,
+        longest_streak_days=summary.longest_streak_days,
+        weekly_sets_done=summary.weekly_sets_done,
+        weekly_volume_kg=summary.weekly_volume_kg,
+        weekly_reading_minutes=summary.weekly_reading_minutes,
+        weekly_pages_read=summary.weekly_pages_read,
+        monthly_reading_minutes=summary.monthly_reading_minutes,
+    )
+
+
+@router.get("/{user_id}/daily-stats/{stat_date}", response_model=DailyStatsResponse)
+def get_daily_stats(
+    user_id: UUID,
+    stat_date: date,
+    service: Annotated[DailyStatsService, Depends(get_daily_stats_service)],
+) -> DailyStatsResponse:
+    stats = service.get_daily_stats(user_id, stat_date)
+    if stats is None:
+        return DailyStatsResponse(user_id=user_id, stat_date=stat_date)
+    return DailyStatsResponse(
+        user_id=stats.user_id,
+        stat_date=stats.stat_date,
+        sets_done=stats.sets_done,
+        volume_kg=stats.volume_kg,
+        reading_minutes=stats.reading_minutes,
+        pages_read=stats.pages_read,
+        streak_days=stats.streak_days,
+    )
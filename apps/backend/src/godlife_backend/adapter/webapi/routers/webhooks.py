@@ -3,36 +3,109 @@ from __future__ import annotations
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from godlife_backend.adapter.webapi.dependencies import get_webhook_service
-from godlife_backend.application.services.webhook_service import WebhookService
+from godlife_backend.adapter.webapi.json_codec import (
+    body_openapi,
+    ndjson_documents,
+    parse_body,
+    parse_each,
+    parse_model,
+    type_adapter,
+    validate_each,
+)
+from godlife_backend.application.services.webhook_service import (
+    WebhookIngestStatus,
+    WebhookService,
+)
 from godlife_backend.domain.entities import WebhookEvent
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
+MAX_BATCH_SIZE = 1000
+MAX_BATCH_BYTES = 8 * 1024 * 1024
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+PROVIDER_MISMATCH = "provider mismatch between path and body"
+
 
 class WebhookPayload(BaseModel):
     provider: str
     event_type: str
     user_id: UUID | None = None
+    kakao_user_id: str | None = None
     event_id: str | None = None
     raw_payload: dict[str, object] = Field(default_factory=dict)
 
 
-@router.post("/{provider}")
-def ingest_webhook(
-    provider: str,
-    payload: WebhookPayload,
-    service: Annotated[WebhookService, Depends(get_webhook_service)],
-) -> dict[str, str]:
-    if payload.provider != provider:
-        raise HTTPException(
-            status_code=400,
-            detail="provider mismatch between path and body",
-        )
+class WebhookBatchItemResponse(BaseModel):
+    index: int
+    status: str
+    id: UUID | None = None
+    detail: str | None = None
+
+
+class WebhookBatchResponse(BaseModel):
+    accepted: int
+    duplicates: int
+    rejected: int
+    results: list[WebhookBatchItemResponse]
+
+
+_DOCUMENTS_ADAPTER = TypeAdapter(list[object])
+
+
+async def read_webhook_payload(request: Request) -> WebhookPayload:
+    # Decode the raw body once instead of json.loads followed by model validation
+    # of the resulting dict; ``raw_payload`` can be large and deeply nested.
+    return parse_model(WebhookPayload, await request.body())
+
+
+async def read_webhook_batch(request: Request) -> list[WebhookPayload | str]:
+    """Read a batch, validating each item on its own.
+
+    Size limits are enforced before any item is validated: the body against
+    ``MAX_BATCH_BYTES`` while it streams in, then the document count against
+    ``MAX_BATCH_SIZE``. An invalid item is returned as its error description.
+    """
+
+    body = await _read_limited(request, MAX_BATCH_BYTES)
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith(NDJSON_MEDIA_TYPE):
+        documents = ndjson_documents(body)
+        _check_batch_size(len(documents))
+        return parse_each(type_adapter(WebhookPayload), documents)
+    values = parse_body(_DOCUMENTS_ADAPTER, body)
+    _check_batch_size(len(values))
+    return validate_each(type_adapter(WebhookPayload), values)
+
+
+async def _read_limited(request: Request, limit: int) -> bytes:
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise _too_large(f"batch exceeds {limit} bytes")
+    chunks: list[bytes] = []
+    size = 0
+    # Chunked bodies carry no length, so the limit is also checked as they stream.
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            raise _too_large(f"batch exceeds {limit} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _check_batch_size(count: int) -> None:
+    if count > MAX_BATCH_SIZE:
+        raise _too_large(f"batch exceeds {MAX_BATCH_SIZE} events")
 
-    event = WebhookEvent(
+
+def _too_large(detail: str) -> HTTPException:
+    return HTTPException(status_code=413, detail=detail)
+
+
+def _to_event(provider: str, payload: WebhookPayload) -> WebhookEvent:
+    return WebhookEvent(
         provider=provider,
         event_type=payload.event_type,
         user_id=payload.user_id,
@@ -43,9 +116,71 @@ def ingest_webhook(
         raw_payload=payload.raw_payload,
     )
 
+
+@router.post("/{provider}", openapi_extra=body_openapi(WebhookPayload))
+def ingest_webhook(
+    provider: str,
+    payload: Annotated[WebhookPayload, Depends(read_webhook_payload)],
+    service: Annotated[WebhookService, Depends(get_webhook_service)],
+) -> dict[str, str]:
+    if payload.provider != provider:
+        raise HTTPException(status_code=400, detail=PROVIDER_MISMATCH)
+
+    event = _to_event(provider, payload)
+    service.assign_user_ids([(event, payload.kakao_user_id)])
     try:
         service.handle_event(event)
     except NotImplementedError as exc:
         raise HTTPException(status_code=501, detail=str(exc)) from exc
 
     return {"result": "accepted"}
+
+
+@router.post(
+    "/{provider}/batch",
+    openapi_extra=body_openapi(
+        list[WebhookPayload], "application/json", NDJSON_MEDIA_TYPE
+    ),
+)
+def ingest_webhook_batch(
+    provider: str,
+    payloads: Annotated[list[WebhookPayload | str], Depends(read_webhook_batch)],
+    service: Annotated[WebhookService, Depends(get_webhook_service)],
+) -> WebhookBatchResponse:
+    """Accept a JSON array or NDJSON stream; one insert and outbox flush per call.
+
+    Items that fail validation or whose provider does not match the path are
+    rejected individually instead of failing the whole batch.
+    """
+
+    results: dict[int, WebhookBatchItemResponse] = {}
+    pending: list[tuple[int, WebhookEvent, str | None]] = []
+    for index, payload in enumerate(payloads):
+        if isinstance(payload, str):
+            results[index] = WebhookBatchItemResponse(
+                index=index, status="rejected", detail=payload
+            )
+            continue
+        if payload.provider != provider:
+            results[index] = WebhookBatchItemResponse(
+                index=index, status="rejected", detail=PROVIDER_MISMATCH
+            )
+            continue
+        pending.append((index, _to_event(provider, payload), payload.kakao_user_id))
+
+    service.assign_user_ids([(event, kakao_id) for _, event, kakao_id in pending])
+    statuses = service.ingest_batch([event for _, event, _ in pending])
+    for (index, event, _), status in zip(pending, statuses, strict=True):
+        results[index] = WebhookBatchItemResponse(
+            index=index,
+            status=status,
+            id=event.id if status == WebhookIngestStatus.ACCEPTED else None,
+        )
+
+    ordered = [results[index] for index in range(len(payloads))]
+    return WebhookBatchResponse(
+        accepted=sum(item.status == "accepted" for item in ordered),
+        duplicates=sum(item.status == "duplicate" for item in ordered),
+        rejected=len(payloads) - len(pending),
+        results=ordered,
+    )
@@ -0,0 +1,411 @@
+"""Prefork production server: preload once, fork workers, restart them in turn.
+
+The master process builds the app, configures the ORM mappers and warms the
+Kakao id index before forking, so workers share that memory copy-on-write
+instead of each paying for it. Every worker serves the same listening socket
+with uvicorn.
+
+Signals to the master:
+
+- ``SIGTERM``/``SIGINT``: stop all workers gracefully and exit.
+- ``SIGHUP``: reload. The master re-executes its own command line in place
+  (same pid), keeping the listening socket and the running workers. The new
+  master preloads the new code, forks a full set of workers from it and only
+  then asks the old ones to finish their requests. A child interpreter first
+  checks that the app still builds; if it does not, the reload is abandoned
+  and the current workers keep serving. The environment is inherited, so
+  changed environment variables need a full restart.
+- ``SIGTTIN``/``SIGTTOU``: add or remove one worker.
+
+Workers that die unexpectedly are replaced.
+
+Workers publish their ``/metrics`` histograms to ``GODLIFE_METRICS_DIR``
+(a fresh temporary directory unless set) so any worker can report the sum.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import FrameType
+from typing import NoReturn
+
+from fastapi import FastAPI
+from godlife_backend.adapter.persistence.session import dispose_engines
+
+logger = logging.getLogger(__name__)
+
+WorkerTarget = Callable[[FastAPI, socket.socket], None]
+
+# Handed from a master to the process it re-executes into on SIGHUP.
+_REEXEC_SOCKET_ENV = "GODLIFE_REEXEC_SOCKET_FD"
+_REEXEC_WORKERS_ENV = "GODLIFE_REEXEC_WORKER_PIDS"
+_METRICS_TEMPORARY_ENV = "GODLIFE_METRICS_DIR_TEMPORARY"
+_RELOAD_CHECK = (
+    "from godlife_backend.adapter.webapi.app import create_app; create_app()"
+)
+
+
+def _default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+@dataclass(frozen=True, slots=True)
+class ServerSettings:
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = field(default_factory=_default_workers)
+    backlog: int = 2048
+    # Seconds a worker gets to finish in-flight requests after SIGTERM.
+    graceful_timeout: float = 30.0
+    # Pause after forking a replacement before retiring the worker it replaces.
+    restart_interval: float = 1.0
+
+    @classmethod
+    def from_env(cls) -> ServerSettings:
+        defaults = cls()
+        return cls(
+            host=os.getenv("HOST", defaults.host),
+            port=int(os.getenv("PORT", str(defaults.port))),
+            workers=int(os.getenv("GODLIFE_WORKERS", "0")) or defaults.workers,
+            graceful_timeout=float(
+                os.getenv("GODLIFE_GRACEFUL_TIMEOUT", str(defaults.graceful_timeout))
+            ),
+        )
+
+
+def prepare_metrics_directory(reloaded: bool = False) -> tuple[Path, bool]:
+    """Empty the shared metrics directory; return it and whether it is ours.
+
+    Must run before :func:`preload`, which builds the registry. Snapshots from
+    a previous server run are removed, which scrapers see as a counter reset;
+    a master re-executed by a reload keeps them.
+    """
+
+    configured = os.getenv("GODLIFE_METRICS_DIR")
+    if reloaded and configured:
+        return Path(configured), os.getenv(_METRICS_TEMPORARY_ENV) == "1"
+    if not configured:
+        directory = Path(tempfile.mkdtemp(prefix="godlife-metrics-"))
+        os.environ["GODLIFE_METRICS_DIR"] = str(directory)
+        os.environ[_METRICS_TEMPORARY_ENV] = "1"
+        return directory, True
+    directory = Path(configured)
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in directory.glob("*.json"):
+        stale.unlink()
+    return directory, False
+
+
+def preload() -> FastAPI:
+    """Build everything workers can share before the first fork."""
+
+    from godlife_backend.adapter.webapi.app import create_app
+    from godlife_backend.adapter.webapi.dependencies import warm_kakao_user_resolver
+    from sqlalchemy.orm import configure_mappers
+
+    app = create_app()
+    configure_mappers()
+    warm_kakao_user_resolver()
+    # The warm-up used a pooled connection; children must not inherit it.
+    dispose_engines()
+    return app
+
+
+def serve_uvicorn(app: FastAPI, sock: socket.socket) -> None:
+    import uvicorn
+
+    config = uvicorn.Config(app, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def inherited_listener() -> tuple[socket.socket, frozenset[int]] | None:
+    """The socket and workers left by the master this process replaced, if any."""
+
+    fd = os.environ.pop(_REEXEC_SOCKET_ENV, None)
+    pids = os.environ.pop(_REEXEC_WORKERS_ENV, "")
+    if fd is None:
+        return None
+    sock = socket.socket(fileno=int(fd))
+    sock.set_inheritable(False)
+    return sock, frozenset(int(pid) for pid in pids.split(",") if pid)
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    return sock
+
+
+class PreforkServer:
+    """Supervise ``settings.workers`` forked processes serving one socket."""
+
+    def __init__(
+        self,
+        app: FastAPI,
+        settings: ServerSettings,
+        target: WorkerTarget = serve_uvicorn,
+        sock: socket.socket | None = None,
+        inherited_workers: Iterable[int] = (),
+    ) -> None:
+        self._app = app
+        self._settings = settings
+        self._target = target
+        self._socket = sock
+        self._inherited = set(inherited_workers)
+        self._workers: set[int] = set()
+        self._wanted = settings.workers
+        self._stopping = False
+        self._reload_requested = False
+
+    @property
+    def workers(self) -> frozenset[int]:
+        return frozenset(self._workers)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        if self._socket is None:
+            raise RuntimeError("server is not started")
+        host, port = self._socket.getsockname()[:2]
+        return host, port
+
+    def start(self) -> None:
+        if self._socket is None:
+            self._socket = bind_socket(
+                self._settings.host, self._settings.port, self._settings.backlog
+            )
+        for _ in range(self._wanted):
+            self._spawn()
+        logger.info(
+            "serving on %s:%d with %d workers", *self.address, len(self._workers)
+        )
+        if self._inherited:
+            # Workers of the master this process replaced on reload: the new
+            # set is already serving, so they can all drain at once.
+            time.sleep(self._settings.restart_interval)
+            for pid in self._inherited:
+                self._signal(pid, signal.SIGTERM)
+            for pid in sorted(self._inherited):
+                self._retire(pid)
+            logger.info("reloaded; retired %d old workers", len(self._inherited))
+            self._inherited.clear()
+
+    def run(self) -> None:
+        """Start, then supervise until a stop signal arrives."""
+
+        # Installed first: after a reload, start() drains the old workers.
+        self._install_signal_handlers()
+        self.start()
+        try:
+            while not self._stopping:
+                self.reap()
+                if self._reload_requested:
+                    self._reload_requested = False
+                    self.reload()
+                self._scale()
+                time.sleep(0.2)
+        finally:
+            self.stop()
+
+    def reap(self) -> set[int]:
+        """Collect exited workers and, unless stopping, replace them."""
+
+        exited = {pid for pid in self._workers if self._has_exited(pid)}
+        self._workers -= exited
+        if not self._stopping:
+            for pid in exited:
+                logger.warning("worker %d exited unexpectedly; replacing it", pid)
+                self._spawn()
+        return exited
+
+    def reload(self) -> None:
+        """Re-execute the master in place so workers run the current code.
+
+        Does not return unless the new code fails the import check, in which
+        case the current workers keep serving.
+        """
+
+        if self._socket is None:
+            raise RuntimeError("server is not started")
+        check = subprocess.run(
+            [sys.executable, "-c", _RELOAD_CHECK],
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, sys.path))},
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if check.returncode != 0:
+            logger.error("reload abandoned; the app failed to load:\n%s", check.stderr)
+            return
+        self._socket.set_inheritable(True)
+        os.environ[_REEXEC_SOCKET_ENV] = str(self._socket.fileno())
+        os.environ[_REEXEC_WORKERS_ENV] = ",".join(map(str, sorted(self._workers)))
+        logger.info("reloading: re-executing master %d", os.getpid())
+        for stream in (sys.stdout, sys.stderr):
+            stream.flush()
+        os.execv(sys.executable, [sys.executable, *sys.orig_argv[1:]])
+
+    def restart_workers(self) -> None:
+        """Replace every worker one by one, keeping the others serving.
+
+        Workers are forked from the already loaded app, so this recycles
+        processes without picking up new code; :meth:`reload` does that.
+        """
+
+        for old_pid in sorted(self._workers):
+            if self._stopping:
+                return
+            self._spawn()
+            time.sleep(self._settings.restart_interval)
+            self._retire(old_pid)
+
+    def stop(self) -> None:
+        self._stopping = True
+        for pid in list(self._workers):
+            self._signal(pid, signal.SIGTERM)
+        self._wait_all(self._settings.graceful_timeout)
+        for pid in list(self._workers):
+            logger.warning("worker %d did not stop in time; killing it", pid)
+            self._signal(pid, signal.SIGKILL)
+        self._wait_all(timeout=5.0)
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def _spawn(self) -> int:
+        if self._socket is None:
+            raise RuntimeError("server is not started")
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker(self._socket)
+        self._workers.add(pid)
+        return pid
+
+    def _run_worker(self, sock: socket.socket) -> NoReturn:
+        # The child must never return into the master's supervision loop.
+        code = 0
+        try:
+            for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+                signal.signal(signum, signal.SIG_DFL)
+            for signum in (signal.SIGTTIN, signal.SIGTTOU):
+                signal.signal(signum, signal.SIG_IGN)
+            self._target(self._app, sock)
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+        except BaseException:
+            logger.exception("worker %d crashed", os.getpid())
+            code = 1
+        finally:
+            os._exit(code)
+
+    def _retire(self, pid: int) -> None:
+        self._signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self._settings.graceful_timeout
+        while not self._has_exited(pid):
+            if time.monotonic() >= deadline:
+                self._signal(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                break
+            time.sleep(0.05)
+        self._workers.discard(pid)
+
+    def _scale(self) -> None:
+        while len(self._workers) < self._wanted:
+            self._spawn()
+        while len(self._workers) > self._wanted:
+            self._retire(max(self._workers))
+
+    def _wait_all(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while self._workers and time.monotonic() < deadline:
+            self._workers -= {pid for pid in self._workers if self._has_exited(pid)}
+            if self._workers:
+                time.sleep(0.05)
+
+    @staticmethod
+    def _has_exited(pid: int) -> bool:
+        try:
+            waited, _ = os.waitpid(pid, os.WNOHANG)
+        except ChildProcessError:
+            return True
+        return waited == pid
+
+    @staticmethod
+    def _signal(pid: int, signum: signal.Signals) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _install_signal_handlers(self) -> None:
+        def _stop(signum: int, frame: FrameType | None) -> None:
+            self._stopping = True
+
+        def _reload(signum: int, frame: FrameType | None) -> None:
+            self._reload_requested = True
+
+        def _more(signum: int, frame: FrameType | None) -> None:
+            self._wanted += 1
+
+        def _fewer(signum: int, frame: FrameType | None) -> None:
+            self._wanted = max(1, self._wanted - 1)
+
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
+        signal.signal(signal.SIGHUP, _reload)
+        signal.signal(signal.SIGTTIN, _more)
+        signal.signal(signal.SIGTTOU, _fewer)
+
+
+def main(argv: list[str] | None = None) -> None:
+    defaults = ServerSettings.from_env()
+    parser = argparse.ArgumentParser(description="Run the prefork API server.")
+    parser.add_argument("--host", default=defaults.host)
+    parser.add_argument("--port", type=int, default=defaults.port)
+    parser.add_argument("--workers", type=int, default=defaults.workers)
+    parser.add_argument(
+        "--graceful-timeout", type=float, default=defaults.graceful_timeout
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    settings = ServerSettings(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        graceful_timeout=args.graceful_timeout,
+    )
+    inherited = inherited_listener()
+    sock, old_workers = inherited or (None, frozenset[int]())
+    metrics_directory, temporary = prepare_metrics_directory(
+        reloaded=inherited is not None
+    )
+    try:
+        try:
+            app = preload()
+        except BaseException:
+            # Nothing would supervise the previous master's workers.
+            for pid in old_workers:
+                PreforkServer._signal(pid, signal.SIGTERM)
+            raise
+        PreforkServer(app, settings, sock=sock, inherited_workers=old_workers).run()
+    finally:
+        if temporary:
+            shutil.rmtree(metrics_directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
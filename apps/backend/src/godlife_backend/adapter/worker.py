@@ -0,0 +1,87 @@
+"""Outbox worker process entry point.
+
+Only persistence and application modules are imported here; the web stack
+(FastAPI, Starlette, pydantic) never loads, which keeps worker cold starts
+short when they are autoscaled.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import signal
+import threading
+from collections.abc import Callable
+from types import FrameType
+
+from godlife_backend.adapter.persistence.session import _session_factory
+from godlife_backend.adapter.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from godlife_backend.application.services.daily_stats_service import (
+    DailyStatsService,
+)
+from godlife_backend.application.services.outbox_dispatcher import OutboxDispatcher
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def build_dispatcher(uow: SqlAlchemyUnitOfWork) -> OutboxDispatcher:
+    """Register the handlers that run out of band of API requests."""
+
+    dispatcher = OutboxDispatcher(uow.outbox, savepoint=uow.savepoint)
+    DailyStatsService(uow.daily_stats).register(dispatcher)
+    return dispatcher
+
+
+def run_once(session_factory: Callable[[], Session], batch_size: int = 100) -> int:
+    """Dispatch one leased batch in its own transaction."""
+
+    with SqlAlchemyUnitOfWork(session_factory()) as uow:
+        return build_dispatcher(uow).dispatch_pending(limit=batch_size)
+
+
+def run(
+    session_factory: Callable[[], Session],
+    *,
+    batch_size: int = 100,
+    idle_seconds: float = 1.0,
+    stop: threading.Event | None = None,
+) -> None:
+    """Dispatch until ``stop`` is set, sleeping only when a batch comes back short."""
+
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        if run_once(session_factory, batch_size) < batch_size:
+            stop.wait(idle_seconds)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Dispatch pending outbox events.")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--idle-seconds", type=float, default=1.0)
+    parser.add_argument("--once", action="store_true")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.once:
+        completed = run_once(_session_factory(), args.batch_size)
+        logger.info("outbox events dispatched: %d", completed)
+        return
+
+    stop = threading.Event()
+
+    def _stop(signum: int, frame: FrameType | None) -> None:
+        stop.set()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    run(
+        _session_factory(),
+        batch_size=args.batch_size,
+        idle_seconds=args.idle_seconds,
+        stop=stop,
+    )
+
+
+if __name__ == "__main__":
+    main()
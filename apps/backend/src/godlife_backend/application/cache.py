@@ -0,0 +1,115 @@
+"""Bounded in-process caches shared by application services."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from threading import Lock
+from typing import Protocol
+
+
+class TtlLruCache[K: Hashable, V]:
+    """Thread-safe LRU cache whose entries also expire after ``ttl_seconds``."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self._ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SharedCache(Protocol):
+    """Out-of-process cache tier (e.g. Redis) shared by every worker."""
+
+    def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+
+class TieredCache[V]:
+    """Read-through lookups in a local TTL+LRU tier, then an optional shared one.
+
+    Shared-tier hits are decoded once and promoted into the local tier. Keep the
+    local TTL short: only the process that handles an invalidation drops its
+    local entry, every other worker waits for expiry.
+    """
+
+    def __init__(
+        self,
+        local: TtlLruCache[str, V],
+        encode: Callable[[V], bytes],
+        decode: Callable[[bytes], V],
+        shared: SharedCache | None = None,
+        shared_ttl_seconds: float = 300.0,
+    ) -> None:
+        self._local = local
+        self._encode = encode
+        self._decode = decode
+        self._shared = shared
+        self._shared_ttl_seconds = shared_ttl_seconds
+
+    def get(self, key: str) -> V | None:
+        value = self._local.get(key)
+        if value is not None or self._shared is None:
+            return value
+        data = self._shared.get(key)
+        if data is None:
+            return None
+        value = self._decode(data)
+        self._local.put(key, value)
+        return value
+
+    def put(self, key: str, value: V) -> None:
+        self._local.put(key, value)
+        if self._shared is not None:
+            self._shared.set(key, self._encode(value), self._shared_ttl_seconds)
+
+    def invalidate(self, *keys: str) -> None:
+        for key in keys:
+            self._local.invalidate(key)
+        if self._shared is not None and keys:
+            self._shared.delete(*keys)
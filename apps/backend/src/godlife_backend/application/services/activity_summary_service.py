@@ -0,0 +1,167 @@
+"""User activity summary served from a bounded, array-backed series cache."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from uuid import UUID
+
+from godlife_backend.application.cache import TtlLruCache
+from godlife_backend.application.services.outbox_broadcast import OutboxBroadcast
+from godlife_backend.domain.entities import OutboxEvent, UserDailyStats
+from godlife_backend.domain.events import (
+    EXERCISE_SET_STATUS_CHANGED,
+    READING_LOG_RECORDED,
+)
+from godlife_backend.domain.ports import UserDailyStatsRepository, UserRepository
+from godlife_backend.domain.stats import user_zone
+
+HISTORY_DAYS = 365
+WEEK_DAYS = 7
+MONTH_DAYS = 30
+
+
+@dataclass(slots=True, frozen=True)
+class ActivitySummary:
+    user_id: UUID
+    as_of: date
+    current_streak_days: int
+    longest_streak_days: int
+    weekly_sets_done: int
+    weekly_volume_kg: float
+    weekly_reading_minutes: float
+    weekly_pages_read: int
+    monthly_reading_minutes: float
+
+
+class ActivitySeries:
+    """One slot per day for each stat column, oldest day first.
+
+    Columns are contiguous ``array`` buffers and the active-day mask is a
+    ``bytes`` object, so window sums and streak scans run in C over the buffer
+    instead of looping over dataclasses.
+    """
+
+    __slots__ = (
+        "end_date",
+        "sets_done",
+        "volume_kg",
+        "reading_minutes",
+        "pages_read",
+        "_active",
+    )
+
+    def __init__(self, end_date: date, days: int = HISTORY_DAYS) -> None:
+        self.end_date = end_date
+        self.sets_done = array("l", [0]) * days
+        self.volume_kg = array("d", [0.0]) * days
+        self.reading_minutes = array("d", [0.0]) * days
+        self.pages_read = array("l", [0]) * days
+        self._active = bytes(days)
+
+    @classmethod
+    def from_stats(
+        cls,
+        rows: Sequence[UserDailyStats],
+        end_date: date,
+        days: int = HISTORY_DAYS,
+    ) -> ActivitySeries:
+        series = cls(end_date, days)
+        start_date = end_date - timedelta(days=days - 1)
+        active = bytearray(days)
+        for row in rows:
+            slot = (row.stat_date - start_date).days
+            if not 0 <= slot < days:
+                continue
+            series.sets_done[slot] = row.sets_done
+            series.volume_kg[slot] = row.volume_kg
+            series.reading_minutes[slot] = row.reading_minutes
+            series.pages_read[slot] = row.pages_read
+            active[slot] = row.is_active
+        series._active = bytes(active)
+        return series
+
+    def current_streak(self) -> int:
+        # Today still counts as part of yesterday's streak until the day ends.
+        end = len(self._active)
+        if end and not self._active[-1]:
+            end -= 1
+        return end - self._active.rfind(b"\x00", 0, end) - 1
+
+    def longest_streak(self) -> int:
+        return max(map(len, self._active.split(b"\x00")))
+
+    def summarize(self, user_id: UUID) -> ActivitySummary:
+        return ActivitySummary(
+            user_id=user_id,
+            as_of=self.end_date,
+            current_streak_days=self.current_streak(),
+            longest_streak_days=self.longest_streak(),
+            weekly_sets_done=sum(self.sets_done[-WEEK_DAYS:]),
+            weekly_volume_kg=sum(self.volume_kg[-WEEK_DAYS:]),
+            weekly_reading_minutes=sum(self.reading_minutes[-WEEK_DAYS:]),
+            weekly_pages_read=sum(self.pages_read[-WEEK_DAYS:]),
+            monthly_reading_minutes=sum(self.reading_minutes[-MONTH_DAYS:]),
+        )
+
+
+ActivitySeriesCache = TtlLruCache[UUID, ActivitySeries]
+
+
+def register_activity_cache_invalidation(
+    broadcast: OutboxBroadcast, cache: ActivitySeriesCache
+) -> None:
+    """Drop a user's cached series when a set or reading log is recorded.
+
+    Registered on the process's :class:`OutboxBroadcast`, so every API process
+    evicts the series, not only the worker that leases the event.
+    """
+
+    def _on_activity_recorded(event: OutboxEvent) -> None:
+        cache.invalidate(UUID(str(event.payload["user_id"])))
+
+    for event_type in (EXERCISE_SET_STATUS_CHANGED, READING_LOG_RECORDED):
+        broadcast.register(event_type, _on_activity_recorded)
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+class ActivitySummaryService:
+    """Summaries over the cached series of each user's last ``HISTORY_DAYS``.
+
+    The cache is per process. Each process evicts a user's series when the
+    outbox broadcast delivers one of their stats events (see
+    :func:`register_activity_cache_invalidation`). The projection worker may
+    apply the event after that eviction, and a read in between caches the old
+    rows again; the cache TTL bounds how long such a series is served.
+    """
+
+    def __init__(
+        self,
+        stats_repository: UserDailyStatsRepository,
+        user_repository: UserRepository,
+        cache: ActivitySeriesCache,
+        clock: Callable[[], datetime] = _utc_now,
+    ) -> None:
+        self._stats_repository = stats_repository
+        self._user_repository = user_repository
+        self._cache = cache
+        self._clock = clock
+
+    def get_summary(self, user_id: UUID) -> ActivitySummary:
+        # "Today" is the user's local date, the calendar stats are bucketed on.
+        user = self._user_repository.get_by_id(user_id)
+        zone = user_zone(user.timezone if user is not None else "")
+        today = self._clock().astimezone(zone).date()
+        series = self._cache.get(user_id)
+        if series is None or series.end_date != today:
+            rows = self._stats_repository.list_range(
+                user_id, today - timedelta(days=HISTORY_DAYS - 1), today
+            )
+            series = ActivitySeries.from_stats(rows, end_date=today)
+            self._cache.put(user_id, series)
+        return series.summarize(user_id)
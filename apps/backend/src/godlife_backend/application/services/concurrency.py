@@ -0,0 +1,29 @@
+"""Retry helpers for optimistic concurrency conflicts."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from godlife_backend.domain.errors import ConcurrencyConflictError
+
+DEFAULT_CONFLICT_ATTEMPTS = 3
+
+
+def retry_on_conflict[T](
+    operation: Callable[[], T], *, attempts: int = DEFAULT_CONFLICT_ATTEMPTS
+) -> T:
+    """Run ``operation`` again when a versioned write loses a race.
+
+    The operation must reload whatever it mutates so each attempt works on the
+    latest committed version.
+    """
+
+    if attempts < 1:
+        raise ValueError("attempts must be at least 1")
+    for attempt in range(1, attempts + 1):
+        try:
+            return operation()
+        except ConcurrencyConflictError:
+            if attempt == attempts:
+                raise
+    raise AssertionError("unreachable")
@@ -0,0 +1,66 @@
+"""Incremental per-user daily stats projection fed by outbox events."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from uuid import UUID
+
+from godlife_backend.application.services.outbox_dispatcher import OutboxDispatcher
+from godlife_backend.domain.entities import OutboxEvent, UserDailyStats
+from godlife_backend.domain.events import (
+    DAILY_STAT_FIELDS,
+    EXERCISE_SET_STATUS_CHANGED,
+    READING_LOG_RECORDED,
+)
+from godlife_backend.domain.ports import UserDailyStatsRepository
+
+
+class DailyStatsService:
+    def __init__(self, stats_repository: UserDailyStatsRepository) -> None:
+        self._stats_repository = stats_repository
+
+    def register(self, dispatcher: OutboxDispatcher) -> None:
+        for event_type in (EXERCISE_SET_STATUS_CHANGED, READING_LOG_RECORDED):
+            dispatcher.register(event_type, self.apply_event)
+
+    def apply_event(self, event: OutboxEvent) -> None:
+        payload = event.payload
+        deltas: dict[str, float] = {
+            name: value
+            for name in DAILY_STAT_FIELDS
+            if isinstance(value := payload.get(name), int | float) and value
+        }
+        if not deltas:
+            return
+        user_id = UUID(str(payload["user_id"]))
+        stat_date = date.fromisoformat(str(payload["stat_date"]))
+        row = self._stats_repository.increment(user_id, stat_date, deltas)
+        self._refresh_streak(row)
+
+    def get_daily_stats(self, user_id: UUID, stat_date: date) -> UserDailyStats | None:
+        return self._stats_repository.get(user_id, stat_date)
+
+    def _refresh_streak(self, row: UserDailyStats) -> None:
+        # A day's streak changes only when it flips between active and inactive.
+        # Events can arrive out of order, so the new value is carried forward
+        # over the following active days until an existing streak already agrees.
+        if row.is_active == (row.streak_days > 0):
+            return
+        streak = 0
+        if row.is_active:
+            previous = self._stats_repository.get(
+                row.user_id, row.stat_date - timedelta(days=1)
+            )
+            streak = 1 + (previous.streak_days if previous else 0)
+        self._stats_repository.set_streak(row.user_id, row.stat_date, streak)
+
+        stat_date = row.stat_date
+        while True:
+            stat_date += timedelta(days=1)
+            following = self._stats_repository.get(row.user_id, stat_date)
+            if following is None or not following.is_active:
+                return
+            streak += 1
+            if following.streak_days == streak:
+                return
+            self._stats_repository.set_streak(row.user_id, stat_date, streak)
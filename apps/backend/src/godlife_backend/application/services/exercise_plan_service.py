@@ -3,16 +3,28 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import date
+from datetime import UTC, date, datetime
 from uuid import UUID
 
-from godlife_backend.domain.entities import ExercisePlan
+from godlife_backend.application.services.concurrency import (
+    DEFAULT_CONFLICT_ATTEMPTS,
+    retry_on_conflict,
+)
+from godlife_backend.db.enums import PlanStatus, SetStatus
+from godlife_backend.domain.entities import (
+    ExercisePlan,
+    ExerciseSetState,
+    OutboxEvent,
+)
+from godlife_backend.domain.events import EXERCISE_SET_STATUS_CHANGED
 from godlife_backend.domain.ports import (
     ExercisePlanRepository,
     ExerciseSessionRepository,
     ExerciseSetStateRepository,
     OutboxEventRepository,
 )
+from godlife_backend.domain.progress import set_counter_deltas
+from godlife_backend.domain.stats import done_set_volume
 
 
 @dataclass(slots=True)
@@ -22,6 +34,16 @@ class GeneratePlanCommand:
     source: str = "rule"
 
 
+@dataclass(slots=True)
+class RecordSetResultCommand:
+    session_id: UUID
+    set_no: int
+    status: SetStatus
+    performed_reps: int | None = None
+    performed_weight_kg: float | None = None
+    actual_rest_sec: int | None = None
+
+
 class ExercisePlanService:
     def __init__(
         self,
@@ -29,11 +51,13 @@ class ExercisePlanService:
         session_repository: ExerciseSessionRepository,
         set_state_repository: ExerciseSetStateRepository,
         outbox_repository: OutboxEventRepository,
+        conflict_attempts: int = DEFAULT_CONFLICT_ATTEMPTS,
     ) -> None:
         self._plan_repository = plan_repository
         self._session_repository = session_repository
         self._set_state_repository = set_state_repository
         self._outbox_repository = outbox_repository
+        self._conflict_attempts = conflict_attempts
 
     def generate_plan(self, command: GeneratePlanCommand) -> ExercisePlan:
         raise NotImplementedError(
@@ -41,11 +65,111 @@ class ExercisePlanService:
         )
 
     def complete_active_plan(self, plan_id: UUID) -> ExercisePlan | None:
-        existing = self._plan_repository.get_by_id(plan_id)
-        if existing is None:
+        return retry_on_conflict(
+            lambda: self._complete_plan(plan_id),
+            attempts=self._conflict_attempts,
+        )
+
+    def _complete_plan(self, plan_id: UUID) -> ExercisePlan | None:
+        plan = self._plan_repository.get_by_id(plan_id)
+        if plan is None:
             return None
-        raise NotImplementedError(
-            "PR-01: Plan completion transition is not implemented yet."
+        # Counters are maintained per set transition, so completion never has
+        # to rescan sessions and sets. A plan with open sets stays ACTIVE.
+        if plan.status != PlanStatus.ACTIVE or plan.pending_sets > 0:
+            return plan
+
+        plan.status = PlanStatus.DONE
+        plan.summary = (
+            f"done={plan.done_sets} skipped={plan.skipped_sets} "
+            f"failed={plan.failed_sets}"
+        )
+        plan.updated_at = datetime.now(UTC)
+        return self._plan_repository.save(plan)
+
+    def record_set_result(
+        self, command: RecordSetResultCommand
+    ) -> ExerciseSetState | None:
+        return retry_on_conflict(
+            lambda: self._apply_set_result(command),
+            attempts=self._conflict_attempts,
+        )
+
+    def _apply_set_result(
+        self, command: RecordSetResultCommand
+    ) -> ExerciseSetState | None:
+        state = self._set_state_repository.get(command.session_id, command.set_no)
+        if state is None:
+            return None
+        if (
+            state.status == command.status
+            and state.performed_reps == command.performed_reps
+            and state.performed_weight_kg == command.performed_weight_kg
+            and state.actual_rest_sec == command.actual_rest_sec
+        ):
+            # Double-tap or a retried request that already won: nothing to write.
+            return state
+
+        session = self._session_repository.get_by_id(state.session_id)
+        if session is None:
+            return None
+
+        previous_sets_done, previous_volume = done_set_volume(state)
+        now = datetime.now(UTC)
+        state.performed_reps = command.performed_reps
+        state.performed_weight_kg = command.performed_weight_kg
+        state.actual_rest_sec = command.actual_rest_sec
+        state.completed_at = now if command.status == SetStatus.DONE else None
+        state.skipped_at = now if command.status == SetStatus.SKIPPED else None
+        state.updated_at = now
+        previous_status = state.status
+        state.status = command.status
+        saved = self._set_state_repository.save(state)
+
+        # The set CAS above only succeeds once per transition, so each winning
+        # transition moves the session and plan counters exactly once.
+        deltas = set_counter_deltas(previous_status, command.status)
+        if deltas:
+            self._session_repository.increment_set_counters(session.id, deltas)
+            self._plan_repository.increment_set_counters(session.plan_id, deltas)
+
+        sets_done, volume = done_set_volume(saved)
+        if sets_done != previous_sets_done or volume != previous_volume:
+            self._emit_set_stats_event(
+                saved,
+                plan_id=session.plan_id,
+                previous_status=previous_status,
+                sets_done=sets_done - previous_sets_done,
+                volume_kg=volume - previous_volume,
+            )
+        return saved
+
+    def _emit_set_stats_event(
+        self,
+        state: ExerciseSetState,
+        *,
+        plan_id: UUID,
+        previous_status: SetStatus,
+        sets_done: int,
+        volume_kg: float,
+    ) -> None:
+        plan = self._plan_repository.get_by_id(plan_id)
+        if plan is None:
+            return
+        self._outbox_repository.save(
+            OutboxEvent(
+                aggregate_type="exercise_set",
+                aggregate_id=state.id,
+                event_type=EXERCISE_SET_STATUS_CHANGED,
+                payload={
+                    "user_id": str(plan.user_id),
+                    "stat_date": plan.target_date.isoformat(),
+                    "from_status": str(previous_status),
+                    "to_status": str(state.status),
+                    "sets_done": sets_done,
+                    "volume_kg": volume_kg,
+                },
+            )
         )
 
     @property
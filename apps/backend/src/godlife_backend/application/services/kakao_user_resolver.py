@@ -0,0 +1,128 @@
+"""Process-wide ``kakao_user_id -> users.id`` index used to route webhooks."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Collection
+from uuid import UUID
+
+from godlife_backend.application.cache import TtlLruCache
+from godlife_backend.application.services.outbox_broadcast import OutboxBroadcast
+from godlife_backend.domain.entities import OutboxEvent
+from godlife_backend.domain.events import USER_CHANGED
+from godlife_backend.domain.ports import UserRepository
+
+
+class KakaoUserResolver:
+    """Resolve Kakao ids from memory, batching every miss into one query.
+
+    Known ids live in plain dicts holding each user id as its 128-bit integer,
+    which is roughly half the size of keeping ``UUID`` objects. Ids the database
+    does not know are negative-cached for ``negative_ttl_seconds`` so a burst of
+    webhooks from an unregistered user costs a single lookup.
+
+    Known ids expire too, without a timestamp per entry: new entries go into
+    the current generation, and every ``ttl_seconds`` the current generation
+    becomes the previous one and the previous one is dropped. An entry is thus
+    served for between one and two TTLs before it is looked up again, which
+    bounds how long a deleted or re-mapped ``kakao_user_id`` can be served when
+    its ``user.changed`` event is missed.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1_000_000,
+        ttl_seconds: float = 600.0,
+        negative_max_entries: int = 100_000,
+        negative_ttl_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._user_ids: dict[str, int] = {}
+        self._previous_user_ids: dict[str, int] = {}
+        self._rotated_at = clock()
+        self._unknown: TtlLruCache[str, bool] = TtlLruCache(
+            max_entries=negative_max_entries,
+            ttl_seconds=negative_ttl_seconds,
+            clock=clock,
+        )
+
+    def __len__(self) -> int:
+        return len(self._user_ids) + len(self._previous_user_ids)
+
+    def warm(self, users: UserRepository, batch_size: int = 10_000) -> int:
+        """Load known mappings up to ``max_entries`` and return how many were added."""
+
+        loaded = 0
+        for kakao_user_id, user_id in users.iter_kakao_user_ids(batch_size):
+            if len(self) >= self._max_entries:
+                break
+            self._user_ids[kakao_user_id] = user_id.int
+            loaded += 1
+        return loaded
+
+    def resolve(self, kakao_user_id: str, users: UserRepository) -> UUID | None:
+        return self.resolve_many([kakao_user_id], users).get(kakao_user_id)
+
+    def resolve_many(
+        self, kakao_user_ids: Collection[str], users: UserRepository
+    ) -> dict[str, UUID]:
+        """Return the known ids; everything else costs at most one repository call."""
+
+        self._expire()
+        resolved: dict[str, UUID] = {}
+        missing: set[str] = set()
+        for kakao_user_id in kakao_user_ids:
+            user_int = self._user_ids.get(kakao_user_id)
+            if user_int is None:
+                user_int = self._previous_user_ids.get(kakao_user_id)
+            if user_int is not None:
+                resolved[kakao_user_id] = UUID(int=user_int)
+            elif self._unknown.get(kakao_user_id) is None:
+                missing.add(kakao_user_id)
+        if not missing:
+            return resolved
+
+        found = users.map_kakao_user_ids(missing)
+        for kakao_user_id in missing:
+            user_id = found.get(kakao_user_id)
+            if user_id is None:
+                self._unknown.put(kakao_user_id, True)
+                continue
+            if len(self) < self._max_entries:
+                self._user_ids[kakao_user_id] = user_id.int
+            resolved[kakao_user_id] = user_id
+        return resolved
+
+    def forget(self, *kakao_user_ids: str) -> None:
+        for kakao_user_id in kakao_user_ids:
+            self._user_ids.pop(kakao_user_id, None)
+            self._previous_user_ids.pop(kakao_user_id, None)
+            self._unknown.invalidate(kakao_user_id)
+
+    def _expire(self) -> None:
+        now = self._clock()
+        elapsed = now - self._rotated_at
+        if elapsed < self._ttl_seconds:
+            return
+        # After two idle TTLs the current generation is stale as well.
+        stale = elapsed >= 2 * self._ttl_seconds
+        self._previous_user_ids = {} if stale else self._user_ids
+        self._user_ids = {}
+        self._rotated_at = now
+
+    def register(self, broadcast: OutboxBroadcast) -> None:
+        """Forget ids touched by user saves so the next lookup re-reads them.
+
+        Registered on the process's :class:`OutboxBroadcast`, so every API
+        process drops the ids, not only the worker that leases the event.
+        """
+
+        def _on_user_changed(event: OutboxEvent) -> None:
+            kakao_user_ids = event.payload.get("kakao_user_ids")
+            if isinstance(kakao_user_ids, list):
+                self.forget(*(str(value) for value in kakao_user_ids))
+
+        broadcast.register(USER_CHANGED, _on_user_changed)
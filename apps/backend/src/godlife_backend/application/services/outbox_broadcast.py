@@ -0,0 +1,97 @@
+"""Fan recent outbox events out to every process that polls for them."""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from threading import Lock
+from uuid import UUID
+
+from godlife_backend.application.services.outbox_dispatcher import OutboxHandler
+from godlife_backend.domain.ports import OutboxEventRepository
+
+logger = logging.getLogger(__name__)
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes for timezone-aware columns.
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+class OutboxBroadcast:
+    """Deliver outbox events to local handlers without leasing them.
+
+    ``OutboxDispatcher`` hands each event to exactly one worker, which is right
+    for projections but cannot invalidate caches held by every API process.
+    Each process therefore tails the outbox on its own: ``poll`` reads events
+    created since the previous poll minus ``lookback_seconds`` and runs the
+    handlers for those it has not seen yet.
+
+    The lookback covers events committed after later-stamped ones (long
+    transactions, clock skew between hosts), so it must exceed both. Handlers
+    must be idempotent; an event older than the lookback when it commits is
+    missed, and callers keep a TTL as the backstop.
+    """
+
+    def __init__(
+        self,
+        lookback_seconds: float = 30.0,
+        batch_size: int = 1000,
+        clock: Callable[[], datetime] = _utc_now,
+    ) -> None:
+        self._lookback = timedelta(seconds=lookback_seconds)
+        self._batch_size = batch_size
+        self._clock = clock
+        self._handlers: defaultdict[str, list[OutboxHandler]] = defaultdict(list)
+        self._seen: dict[UUID, datetime] = {}
+        self._since: datetime | None = None
+        self._lock = Lock()
+
+    def register(self, event_type: str, handler: OutboxHandler) -> None:
+        self._handlers[event_type].append(handler)
+
+    def poll(self, outbox_repository: OutboxEventRepository) -> int:
+        """Run handlers for new events and return how many were delivered."""
+
+        if not self._handlers:
+            return 0
+        with self._lock:
+            now = self._clock()
+            # Events from before this process started concern caches it never
+            # filled, so the first poll starts at the current time.
+            since = (self._since or now) - self._lookback
+            delivered = 0
+            while True:
+                events = outbox_repository.list_recent(
+                    self._handlers.keys(), since, limit=self._batch_size
+                )
+                for event in events:
+                    if event.id in self._seen:
+                        continue
+                    self._seen[event.id] = _aware(event.created_at)
+                    delivered += 1
+                    for handler in self._handlers.get(event.event_type, ()):
+                        try:
+                            handler(event)
+                        except Exception:
+                            logger.exception(
+                                "broadcast handler failed for %s", event.id
+                            )
+                last = _aware(events[-1].created_at) if events else since
+                if len(events) < self._batch_size or last <= since:
+                    break
+                since = last
+            self._since = now
+            cutoff = now - self._lookback
+            self._seen = {
+                event_id: created_at
+                for event_id, created_at in self._seen.items()
+                if created_at >= cutoff
+            }
+            return delivered
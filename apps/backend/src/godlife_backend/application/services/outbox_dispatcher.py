@@ -0,0 +1,57 @@
+"""Outbox dispatcher that fans leased events out to registered handlers."""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+
+from godlife_backend.domain.entities import OutboxEvent
+from godlife_backend.domain.ports import OutboxEventRepository
+
+logger = logging.getLogger(__name__)
+
+OutboxHandler = Callable[[OutboxEvent], None]
+Savepoint = Callable[[], AbstractContextManager[object]]
+
+
+class OutboxDispatcher:
+    def __init__(
+        self,
+        outbox_repository: OutboxEventRepository,
+        savepoint: Savepoint = nullcontext,
+    ) -> None:
+        self._outbox_repository = outbox_repository
+        self._savepoint = savepoint
+        self._handlers: defaultdict[str, list[OutboxHandler]] = defaultdict(list)
+
+    def register(self, event_type: str, handler: OutboxHandler) -> None:
+        self._handlers[event_type].append(handler)
+
+    def dispatch_pending(self, limit: int = 100) -> int:
+        """Lease up to ``limit`` events, run their handlers and acknowledge them.
+
+        Returns the number of events acknowledged as complete. Handler side
+        effects and the acknowledgement share the caller's transaction, so a
+        crash before commit redelivers the event instead of losing it.
+
+        Each event's handlers run inside ``savepoint()``, which must undo their
+        writes when it exits with an exception. A failing event then records
+        FAILED without the partial writes of its handlers, and a database error
+        in one handler does not abort the rest of the batch.
+        """
+
+        completed = 0
+        for event in self._outbox_repository.lease_pending(limit=limit):
+            try:
+                with self._savepoint():
+                    for handler in self._handlers.get(event.event_type, ()):
+                        handler(event)
+            except Exception as exc:
+                logger.exception("outbox handler failed for %s", event.id)
+                self._outbox_repository.mark_failed(event.id, str(exc))
+                continue
+            self._outbox_repository.mark_complete(event.id)
+            completed += 1
+        return completed
@@ -0,0 +1,76 @@
+"""Reading log use cases."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+
+from godlife_backend.domain.entities import OutboxEvent, ReadingLog
+from godlife_backend.domain.events import READING_LOG_RECORDED
+from godlife_backend.domain.ports import (
+    OutboxEventRepository,
+    ReadingLogRepository,
+    UserRepository,
+)
+from godlife_backend.domain.stats import reading_log_contribution, user_zone
+
+
+class ReadingLogService:
+    def __init__(
+        self,
+        reading_log_repository: ReadingLogRepository,
+        outbox_repository: OutboxEventRepository,
+        user_repository: UserRepository,
+    ) -> None:
+        self._reading_log_repository = reading_log_repository
+        self._outbox_repository = outbox_repository
+        self._user_repository = user_repository
+
+    def record_log(self, log: ReadingLog) -> ReadingLog:
+        # Logs are bucketed on the user's local calendar, like plan dates.
+        user = self._user_repository.get_by_id(log.user_id)
+        zone = user_zone(user.timezone) if user is not None else user_zone("")
+        existing = self._reading_log_repository.get_by_id(log.id)
+        previous = (
+            None if existing is None else reading_log_contribution(existing, zone)
+        )
+        saved = self._reading_log_repository.save(log)
+
+        # Emit only the difference against what was already counted, split per
+        # day so a log moved to another date is subtracted from the old one.
+        minutes_by_day: defaultdict[date, float] = defaultdict(float)
+        pages_by_day: defaultdict[date, int] = defaultdict(int)
+        if previous is not None:
+            minutes_by_day[previous[0]] -= previous[1]
+            pages_by_day[previous[0]] -= previous[2]
+        current = reading_log_contribution(saved, zone)
+        if current is not None:
+            minutes_by_day[current[0]] += current[1]
+            pages_by_day[current[0]] += current[2]
+
+        for stat_date, minutes in minutes_by_day.items():
+            pages = pages_by_day[stat_date]
+            if not minutes and not pages:
+                continue
+            self._outbox_repository.save(
+                OutboxEvent(
+                    aggregate_type="reading_log",
+                    aggregate_id=saved.id,
+                    event_type=READING_LOG_RECORDED,
+                    payload={
+                        "user_id": str(saved.user_id),
+                        "stat_date": stat_date.isoformat(),
+                        "reading_minutes": minutes,
+                        "pages_read": pages,
+                    },
+                )
+            )
+        return saved
+
+    @property
+    def repositories(self) -> tuple:
+        return (
+            self._reading_log_repository,
+            self._outbox_repository,
+            self._user_repository,
+        )
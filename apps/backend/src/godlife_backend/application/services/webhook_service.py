@@ -2,8 +2,24 @@
 
 from __future__ import annotations
 
-from godlife_backend.domain.entities import WebhookEvent
-from godlife_backend.domain.ports import OutboxEventRepository, WebhookEventRepository
+from collections.abc import Sequence
+from enum import StrEnum
+
+from godlife_backend.application.services.kakao_user_resolver import (
+    KakaoUserResolver,
+)
+from godlife_backend.domain.entities import OutboxEvent, WebhookEvent
+from godlife_backend.domain.events import WEBHOOK_RECEIVED
+from godlife_backend.domain.ports import (
+    OutboxEventRepository,
+    UserRepository,
+    WebhookEventRepository,
+)
+
+
+class WebhookIngestStatus(StrEnum):
+    ACCEPTED = "accepted"
+    DUPLICATE = "duplicate"
 
 
 class WebhookService:
@@ -11,9 +27,79 @@ class WebhookService:
         self,
         webhook_event_repository: WebhookEventRepository,
         outbox_repository: OutboxEventRepository,
+        user_repository: UserRepository | None = None,
+        user_resolver: KakaoUserResolver | None = None,
     ) -> None:
         self._webhook_event_repository = webhook_event_repository
         self._outbox_repository = outbox_repository
+        self._user_repository = user_repository
+        self._user_resolver = user_resolver
+
+    def assign_user_ids(
+        self, events: Sequence[tuple[WebhookEvent, str | None]]
+    ) -> None:
+        """Fill ``user_id`` from each event's Kakao id with one batched lookup.
+
+        Events that already carry a user id, or whose Kakao id is unknown, are
+        left untouched. Without a resolver the events are not modified.
+        """
+
+        if self._user_repository is None or self._user_resolver is None:
+            return
+        pending = [
+            (event, kakao_user_id)
+            for event, kakao_user_id in events
+            if event.user_id is None and kakao_user_id
+        ]
+        if not pending:
+            return
+        resolved = self._user_resolver.resolve_many(
+            {kakao_user_id for _, kakao_user_id in pending}, self._user_repository
+        )
+        for event, kakao_user_id in pending:
+            event.user_id = resolved.get(kakao_user_id)
+
+    def ingest_batch(self, events: Sequence[WebhookEvent]) -> list[WebhookIngestStatus]:
+        """Store unseen events with one insert and enqueue one outbox row each.
+
+        Events repeating an idempotency key or event id already seen earlier in
+        the batch are dropped before touching the database; the insert skips
+        the ones stored by earlier deliveries. Statuses align with ``events``.
+        """
+
+        seen: set[tuple[str, str, str]] = set()
+        unique: list[WebhookEvent] = []
+        for event in events:
+            keys = {(event.provider, "idempotency_key", event.idempotency_key)}
+            if event.event_id is not None:
+                keys.add((event.provider, "event_id", event.event_id))
+            if seen.isdisjoint(keys):
+                seen.update(keys)
+                unique.append(event)
+
+        inserted = self._webhook_event_repository.insert_new(unique)
+        for event in unique:
+            if event.id in inserted:
+                self._outbox_repository.save(
+                    OutboxEvent(
+                        aggregate_type="webhook_event",
+                        aggregate_id=event.id,
+                        event_type=WEBHOOK_RECEIVED,
+                        payload={
+                            "provider": event.provider,
+                            "event_type": event.event_type,
+                            "user_id": None
+                            if event.user_id is None
+                            else str(event.user_id),
+                        },
+                    )
+                )
+        return [
+            WebhookIngestStatus.ACCEPTED
+            if event.id in inserted
+            else WebhookIngestStatus.DUPLICATE
+            for event in events
+        ]
 
     def handle_event(self, event: WebhookEvent) -> WebhookEvent:
         raise NotImplementedError(
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import uuid
+from collections.abc import Mapping
 from datetime import date, datetime, time
 
 import sqlalchemy as sa
@@ -19,7 +20,7 @@ from sqlalchemy import (
 from sqlalchemy import (
     Enum as SqlEnum,
 )
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -31,6 +32,13 @@ from .enums import (
     SetStatus,
     UserStatus,
 )
+from .types import JsonPayloadType
+
+# Predicates of partial indexes; each matches its hot query's WHERE clause
+# verbatim so both PostgreSQL and SQLite can prove the index applies.
+DUE_NOTIFICATIONS = sa.text("status IN ('SCHEDULED', 'RETRY_SCHEDULED')")
+PENDING_OUTBOX = sa.text("status = 'PENDING'")
+UNPROCESSED_WEBHOOKS = sa.text("processed = FALSE")
 
 
 class User(Base):
@@ -114,6 +122,21 @@ class ExercisePlan(Base):
         SqlEnum(PlanStatus), nullable=False, default=PlanStatus.DRAFT
     )
     summary: Mapped[str | None] = mapped_column(Text)
+    pending_sets: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    done_sets: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    skipped_sets: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    failed_sets: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=sa.func.now()
     )
@@ -154,6 +177,18 @@ class ExerciseSession(Base):
     target_weight_kg: Mapped[float | None] = mapped_column(sa.Float())
     target_rest_sec: Mapped[int | None] = mapped_column(Integer)
     notes: Mapped[str | None] = mapped_column(Text)
+    pending_sets: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    done_sets: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    skipped_sets: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    failed_sets: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=sa.func.now()
     )
@@ -190,6 +225,9 @@ class ExerciseSetState(Base):
     actual_rest_sec: Mapped[int | None] = mapped_column(Integer)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     skipped_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=sa.func.now()
     )
@@ -272,6 +310,38 @@ class ReadingLog(Base):
     )
 
 
+class UserDailyStats(Base):
+    __tablename__ = "user_daily_stats"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    stat_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    sets_done: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    volume_kg: Mapped[float] = mapped_column(
+        sa.Float(), nullable=False, default=0.0, server_default="0"
+    )
+    reading_minutes: Mapped[float] = mapped_column(
+        sa.Float(), nullable=False, default=0.0, server_default="0"
+    )
+    pages_read: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    streak_days: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=sa.func.now(),
+        onupdate=func.now(),
+    )
+
+
 class Notification(Base):
     __tablename__ = "notifications"
 
@@ -298,7 +368,9 @@ class Notification(Base):
     idempotency_key: Mapped[str] = mapped_column(
         String(255), unique=True, nullable=False
     )
-    payload: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    payload: Mapped[Mapping[str, object]] = mapped_column(
+        JsonPayloadType, nullable=False, default=dict
+    )
     provider_msg_id: Mapped[str | None] = mapped_column(String(255))
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=sa.func.now()
@@ -324,6 +396,12 @@ class Notification(Base):
         Index(
             "ix_notifications_user_status_schedule", "user_id", "status", "schedule_at"
         ),
+        Index(
+            "ix_notifications_due",
+            "schedule_at",
+            postgresql_where=DUE_NOTIFICATIONS,
+            sqlite_where=DUE_NOTIFICATIONS,
+        ),
     )
 
 
@@ -343,25 +421,60 @@ class WebhookEvent(Base):
     schema_version: Mapped[str] = mapped_column(
         String(16), nullable=False, default="v1"
     )
-    raw_payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    raw_payload: Mapped[Mapping[str, object]] = mapped_column(
+        JsonPayloadType, nullable=False
+    )
     processed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     request_id: Mapped[str | None] = mapped_column(String(255))
     signature_state: Mapped[str | None] = mapped_column(String(120))
     reason_code: Mapped[str | None] = mapped_column(String(128))
     retry_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Part of the primary key because PostgreSQL range-partitions on it.
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=sa.func.now()
+        DateTime(timezone=True),
+        primary_key=True,
+        nullable=False,
+        server_default=sa.func.now(),
     )
 
+    # Uniqueness lives in ``webhook_event_keys``: a partitioned table cannot
+    # enforce a unique constraint that leaves out the partition key.
     __table_args__ = (
-        UniqueConstraint(
-            "provider", "idempotency_key", name="uq_webhook_events_provider_idempotency"
+        Index("ix_webhook_events_provider_key", "provider", "idempotency_key"),
+        Index("ix_webhook_events_provider_event_id", "provider", "event_id"),
+        # Archive and retention scans walk old rows in ``(created_at, id)`` order.
+        Index("ix_webhook_events_created", "created_at", "id"),
+        Index("ix_webhook_events_signature_state", "signature_state"),
+        Index(
+            "ix_webhook_events_unprocessed",
+            "created_at",
+            "id",
+            postgresql_where=UNPROCESSED_WEBHOOKS,
+            sqlite_where=UNPROCESSED_WEBHOOKS,
         ),
+    )
+
+
+class WebhookEventKey(Base):
+    """Idempotency keys of stored webhook events, kept outside the partitions."""
+
+    __tablename__ = "webhook_event_keys"
+
+    provider: Mapped[str] = mapped_column(String(80), primary_key=True)
+    idempotency_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    event_id: Mapped[str | None] = mapped_column(String(255))
+    webhook_event_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=sa.func.now()
+    )
+
+    __table_args__ = (
         UniqueConstraint(
-            "provider", "event_id", name="uq_webhook_events_provider_event_id"
+            "provider", "event_id", name="uq_webhook_event_keys_provider_event_id"
         ),
-        Index("ix_webhook_events_processed_created", "processed", "created_at"),
-        Index("ix_webhook_events_signature_state", "signature_state"),
+        Index("ix_webhook_event_keys_created_at", "created_at"),
     )
 
 
@@ -374,15 +487,21 @@ class OutboxEvent(Base):
     aggregate_type: Mapped[str] = mapped_column(String(64), nullable=False)
     aggregate_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
     event_type: Mapped[str] = mapped_column(String(128), nullable=False)
-    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    payload: Mapped[Mapping[str, object]] = mapped_column(
+        JsonPayloadType, nullable=False
+    )
     status: Mapped[OutboxStatus] = mapped_column(
         SqlEnum(OutboxStatus),
         nullable=False,
         default=OutboxStatus.PENDING,
     )
     retry_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Part of the primary key because PostgreSQL range-partitions on it.
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=sa.func.now()
+        DateTime(timezone=True),
+        primary_key=True,
+        nullable=False,
+        server_default=sa.func.now(),
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -391,4 +510,14 @@ class OutboxEvent(Base):
         onupdate=func.now(),
     )
 
-    __table_args__ = (Index("ix_outbox_events_status", "status", "retry_count"),)
+    __table_args__ = (
+        Index("ix_outbox_events_created", "created_at", "id"),
+        # Covers the lease subquery (``SELECT id ... ORDER BY updated_at``).
+        Index(
+            "ix_outbox_events_pending",
+            "updated_at",
+            "id",
+            postgresql_where=PENDING_OUTBOX,
+            sqlite_where=PENDING_OUTBOX,
+        ),
+    )
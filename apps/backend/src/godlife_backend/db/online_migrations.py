@@ -0,0 +1,324 @@
+"""Alembic helpers for changing large PostgreSQL tables without blocking writers.
+
+Every migration runs in its own transaction (see ``migrations/env.py``) with a
+short ``lock_timeout``, so DDL that cannot get its lock promptly fails instead
+of queueing every writer behind it. The helpers below cover the operations
+that would otherwise hold a lock for as long as the table is large:
+
+- :func:`create_index_concurrently` / :func:`drop_index_concurrently` build or
+  drop an index outside the migration transaction, partition by partition on
+  partitioned tables.
+- :func:`add_check_not_valid` / :func:`add_foreign_key_not_valid` followed by
+  :func:`validate_constraint` split a constraint into an instant catalog change
+  and a scan that only takes a ``SHARE UPDATE EXCLUSIVE`` lock.
+- :func:`set_not_null` uses a validated ``CHECK`` so ``SET NOT NULL`` skips its
+  full-table scan.
+- :func:`backfill` updates rows in keyset-paged batches, each committed on its
+  own, pausing between batches and logging progress.
+
+On other dialects (SQLite in development) each helper falls back to the plain
+Alembic operation.
+
+Revisions copy the helpers they use instead of importing them (see revisions
+006 and 007), so editing a helper never changes a released migration.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+import sqlalchemy as sa
+from alembic import op
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 1_000
+BACKFILL_PAUSE_SECONDS = 0.05
+PROGRESS_INTERVAL_SECONDS = 10.0
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def _scalar(sql: str, **params: object) -> object:
+    return op.get_bind().scalar(sa.text(sql), params)
+
+
+def create_index_concurrently(
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    *,
+    where: str | None = None,
+    unique: bool = False,
+) -> None:
+    """Build an index without blocking writes to ``table``.
+
+    An invalid index left behind by an interrupted ``CONCURRENTLY`` build is
+    dropped and rebuilt, so the migration can simply be rerun.
+    """
+
+    if not _is_postgresql():
+        op.create_index(
+            name,
+            table,
+            list(columns),
+            unique=unique,
+            sqlite_where=None if where is None else sa.text(where),
+        )
+        return
+
+    partitions = _partitions(table)
+    with op.get_context().autocommit_block():
+        if not partitions:
+            _build_concurrently(name, table, columns, where, unique)
+            return
+        # CONCURRENTLY is not allowed on a partitioned parent: create the
+        # parent index on it alone (invalid, instant), build each partition's
+        # index concurrently and attach it; the parent turns valid once all are.
+        op.execute(_index_sql(name, table, columns, where, unique, only=True))
+        for partition in partitions:
+            child = f"{name}_{partition.removeprefix(table + '_')}"[:63]
+            _build_concurrently(child, partition, columns, where, unique)
+            if not _is_attached(child):
+                op.execute(f"ALTER INDEX {name} ATTACH PARTITION {child}")
+
+
+def drop_index_concurrently(name: str, table: str) -> None:
+    """Drop an index without blocking writes to ``table``."""
+
+    if not _is_postgresql():
+        op.drop_index(name, table_name=table)
+        return
+    with op.get_context().autocommit_block():
+        if _partitions(table):
+            # A partitioned index cannot be dropped concurrently; dropping the
+            # parent only updates the catalog and drops the attached children.
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+        else:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def _build_concurrently(
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    where: str | None,
+    unique: bool,
+) -> None:
+    valid = _scalar(
+        "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid"
+        " WHERE c.relname = :name AND pg_table_is_visible(c.oid)",
+        name=name,
+    )
+    if valid is True:
+        return
+    if valid is False:
+        logger.warning("dropping invalid index %s left by an earlier build", name)
+        op.execute(f"DROP INDEX CONCURRENTLY {name}")
+    op.execute(_index_sql(name, table, columns, where, unique, concurrently=True))
+
+
+def _index_sql(
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    where: str | None,
+    unique: bool,
+    *,
+    concurrently: bool = False,
+    only: bool = False,
+) -> str:
+    sql = (
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX "
+        f"{'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {name} "
+        f"ON {'ONLY ' if only else ''}{table} ({', '.join(columns)})"
+    )
+    return sql if where is None else f"{sql} WHERE {where}"
+
+
+def _partitions(table: str) -> list[str]:
+    rows = op.get_bind().scalars(
+        sa.text(
+            "SELECT c.relname FROM pg_inherits i"
+            " JOIN pg_class c ON c.oid = i.inhrelid"
+            " JOIN pg_class p ON p.oid = i.inhparent"
+            " WHERE p.relname = :table AND pg_table_is_visible(p.oid)"
+            " ORDER BY c.relname"
+        ),
+        {"table": table},
+    )
+    return list(rows)
+
+
+def _is_attached(index: str) -> bool:
+    return bool(
+        _scalar(
+            "SELECT EXISTS (SELECT 1 FROM pg_inherits i"
+            " JOIN pg_class c ON c.oid = i.inhrelid WHERE c.relname = :index)",
+            index=index,
+        )
+    )
+
+
+def add_check_not_valid(name: str, table: str, condition: str) -> None:
+    """Add a CHECK that new rows must satisfy, without scanning existing ones."""
+
+    if not _is_postgresql():
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.create_check_constraint(name, sa.text(condition))
+        return
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {name} CHECK ({condition}) NOT VALID"
+    )
+
+
+def add_foreign_key_not_valid(
+    name: str,
+    table: str,
+    referent: str,
+    local_columns: Sequence[str],
+    remote_columns: Sequence[str],
+    *,
+    ondelete: str | None = None,
+) -> None:
+    """Add a foreign key enforced for new rows only, until validated."""
+
+    if not _is_postgresql():
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.create_foreign_key(
+                name,
+                referent,
+                list(local_columns),
+                list(remote_columns),
+                ondelete=ondelete,
+            )
+        return
+    on_delete = "" if ondelete is None else f" ON DELETE {ondelete}"
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY"
+        f" ({', '.join(local_columns)}) REFERENCES {referent}"
+        f" ({', '.join(remote_columns)}){on_delete} NOT VALID"
+    )
+
+
+def validate_constraint(name: str, table: str) -> None:
+    """Check existing rows against a ``NOT VALID`` constraint.
+
+    Runs in its own transaction: validation scans the table but only takes a
+    ``SHARE UPDATE EXCLUSIVE`` lock, so reads and writes continue meanwhile.
+    """
+
+    if not _is_postgresql():
+        return
+    with op.get_context().autocommit_block():
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+
+
+def set_not_null(table: str, column: str) -> None:
+    """Make ``column`` NOT NULL without an exclusive-lock table scan.
+
+    Backfill the column first. PostgreSQL 12+ skips the ``SET NOT NULL`` scan
+    when a validated ``CHECK (column IS NOT NULL)`` already proves it.
+    """
+
+    if not _is_postgresql():
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, nullable=False)
+        return
+    check = f"ck_{table}_{column}_not_null"[:63]
+    add_check_not_valid(check, table, f"{column} IS NOT NULL")
+    validate_constraint(check, table)
+    op.alter_column(table, column, nullable=False)
+    op.drop_constraint(check, table, type_="check")
+
+
+@dataclass(slots=True)
+class BackfillProgress:
+    table: str
+    total: int
+    done: int = 0
+    batches: int = 0
+    started: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> float | None:
+        rate = self.rate
+        return (self.total - self.done) / rate if rate > 0 else None
+
+
+def log_progress(progress: BackfillProgress) -> None:
+    eta = progress.eta_seconds
+    logger.info(
+        "backfill %s: %d/%d rows (%.0f rows/s, eta %s)",
+        progress.table,
+        progress.done,
+        progress.total,
+        progress.rate,
+        "?" if eta is None else f"{eta:.0f}s",
+    )
+
+
+def backfill(
+    table: str,
+    assignments: str,
+    where: str,
+    *,
+    key: str = "id",
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    pause_seconds: float = BACKFILL_PAUSE_SECONDS,
+    report: Callable[[BackfillProgress], None] = log_progress,
+    report_every: float = PROGRESS_INTERVAL_SECONDS,
+) -> BackfillProgress:
+    """``UPDATE table SET assignments WHERE where`` in committed batches.
+
+    Rows are visited in ``key`` order, ``batch_size`` at a time, each batch in
+    its own transaction, with a ``pause_seconds`` sleep in between so
+    replication and concurrent writers keep up. ``report`` is called every
+    ``report_every`` seconds and once at the end. Safe to rerun: ``where``
+    should exclude rows that are already done.
+    """
+
+    bind = op.get_bind()
+    total = bind.scalar(sa.text(f"SELECT COUNT(*) FROM {table} WHERE {where}")) or 0
+    progress = BackfillProgress(table, total, started=time.monotonic())
+
+    def batch(after: bool) -> sa.TextClause:
+        keyset = f" AND {key} > :last" if after else ""
+        return sa.text(
+            f"UPDATE {table} SET {assignments} WHERE {key} IN ("
+            f"SELECT {key} FROM {table} WHERE ({where}){keyset}"
+            f" ORDER BY {key} LIMIT :batch_size) RETURNING {key}"
+        )
+
+    first, following = batch(after=False), batch(after=True)
+    last: object = None
+    reported = progress.started
+    with op.get_context().autocommit_block():
+        while True:
+            params: dict[str, object] = {"batch_size": batch_size}
+            if last is not None:
+                params["last"] = last
+            keys = bind.execute(first if last is None else following, params)
+            updated = keys.scalars().all()
+            if not updated:
+                break
+            last = max(updated)
+            progress.done += len(updated)
+            progress.batches += 1
+            if time.monotonic() - reported >= report_every:
+                report(progress)
+                reported = time.monotonic()
+            if pause_seconds:
+                time.sleep(pause_seconds)
+    report(progress)
+    return progress
@@ -0,0 +1,72 @@
+"""Column types shared by the persistence models."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Dialect
+
+from godlife_backend.domain.payload import JsonPayload
+
+if TYPE_CHECKING:
+    from sqlalchemy.sql.type_api import _BindProcessorType, _ResultProcessorType
+
+
+def payload_json(value: Mapping[str, object]) -> str:
+    """JSON text of a payload, reusing the stored bytes when it is unchanged."""
+
+    return JsonPayload.of(value).to_json().decode()
+
+
+class JsonPayloadType(sa.types.TypeDecorator[Mapping[str, object]]):
+    """JSONB column read as :class:`JsonPayload` and written from its bytes.
+
+    The JSON serializer and deserializer of the underlying type are bypassed:
+    loaded payloads keep their text until a field is read, and unchanged ones
+    are bound as that same text. Plain dicts are encoded as usual.
+    """
+
+    impl = JSONB
+    cache_ok = True
+
+    def bind_processor(
+        self, dialect: Dialect
+    ) -> _BindProcessorType[Mapping[str, object]]:
+        def process(value: Mapping[str, object] | None) -> str | None:
+            return None if value is None else payload_json(value)
+
+        return process
+
+    def result_processor(
+        self,
+        dialect: Dialect,
+        coltype: Any,  # noqa: ANN401
+    ) -> _ResultProcessorType[Mapping[str, object]]:
+        def process(value: Any) -> JsonPayload | None:  # noqa: ANN401
+            if value is None:
+                return None
+            if isinstance(value, str | bytes):
+                return JsonPayload.from_json(value)
+            # The driver decoded it already (psycopg without the text loaders).
+            return JsonPayload(value)
+
+        return process
+
+
+def keep_json_encoded(engine: sa.Engine) -> sa.Engine:
+    """Have psycopg hand JSON columns over as text instead of decoding them."""
+
+    if engine.dialect.driver == "psycopg":
+        event.listen(engine, "connect", _register_json_text_loaders)
+    return engine
+
+
+def _register_json_text_loaders(dbapi_connection: Any, _record: object) -> None:  # noqa: ANN401
+    from psycopg.types.string import TextLoader
+
+    for name in ("json", "jsonb"):
+        dbapi_connection.adapters.register_loader(name, TextLoader)
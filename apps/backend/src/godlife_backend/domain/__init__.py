@@ -9,9 +9,11 @@ from .entities import (
     ReadingLog,
     ReadingPlan,
     User,
+    UserDailyStats,
     UserProfile,
     WebhookEvent,
 )
+from .errors import ConcurrencyConflictError
 from .ports import (
     ExercisePlanRepository,
     ExerciseSessionRepository,
@@ -20,6 +22,7 @@ from .ports import (
     OutboxEventRepository,
     ReadingLogRepository,
     ReadingPlanRepository,
+    UserDailyStatsRepository,
     UserProfileRepository,
     UserRepository,
     WebhookEventRepository,
@@ -34,8 +37,10 @@ __all__ = [
     "ReadingLog",
     "ReadingPlan",
     "User",
+    "UserDailyStats",
     "UserProfile",
     "WebhookEvent",
+    "ConcurrencyConflictError",
     "ExercisePlanRepository",
     "ExerciseSetStateRepository",
     "ExerciseSessionRepository",
@@ -43,6 +48,7 @@ __all__ = [
     "OutboxEventRepository",
     "ReadingLogRepository",
     "ReadingPlanRepository",
+    "UserDailyStatsRepository",
     "UserProfileRepository",
     "UserRepository",
     "WebhookEventRepository",
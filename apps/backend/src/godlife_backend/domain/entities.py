@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from datetime import UTC, date, datetime, time
 from uuid import UUID, uuid4
@@ -14,6 +15,7 @@ from godlife_backend.db.enums import (
     SetStatus,
     UserStatus,
 )
+from godlife_backend.domain.payload import JsonPayload
 
 
 def _now() -> datetime:
@@ -55,6 +57,11 @@ class ExercisePlan:
     source: str = "rule"
     status: PlanStatus = PlanStatus.DRAFT
     summary: str | None = None
+    pending_sets: int = 0
+    done_sets: int = 0
+    skipped_sets: int = 0
+    failed_sets: int = 0
+    version: int = 0
     created_at: datetime = field(default_factory=_now)
     updated_at: datetime = field(default_factory=_now)
 
@@ -71,6 +78,10 @@ class ExerciseSession:
     target_weight_kg: float | None = None
     target_rest_sec: int | None = None
     notes: str | None = None
+    pending_sets: int = 0
+    done_sets: int = 0
+    skipped_sets: int = 0
+    failed_sets: int = 0
     created_at: datetime = field(default_factory=_now)
     updated_at: datetime = field(default_factory=_now)
 
@@ -86,6 +97,7 @@ class ExerciseSetState:
     actual_rest_sec: int | None = None
     completed_at: datetime | None = None
     skipped_at: datetime | None = None
+    version: int = 0
     created_at: datetime = field(default_factory=_now)
     updated_at: datetime = field(default_factory=_now)
 
@@ -115,6 +127,22 @@ class ReadingLog:
     updated_at: datetime = field(default_factory=_now)
 
 
+@dataclass(slots=True)
+class UserDailyStats:
+    user_id: UUID = field(default_factory=uuid4)
+    stat_date: date = field(default_factory=date.today)
+    sets_done: int = 0
+    volume_kg: float = 0.0
+    reading_minutes: float = 0.0
+    pages_read: int = 0
+    streak_days: int = 0
+    updated_at: datetime = field(default_factory=_now)
+
+    @property
+    def is_active(self) -> bool:
+        return self.sets_done > 0 or self.reading_minutes > 0
+
+
 @dataclass(slots=True)
 class Notification:
     id: UUID = field(default_factory=uuid4)
@@ -126,7 +154,7 @@ class Notification:
     sent_at: datetime | None = None
     retry_count: int = 0
     idempotency_key: str = ""
-    payload: dict[str, object] = field(default_factory=dict)
+    payload: Mapping[str, object] = field(default_factory=JsonPayload)
     created_at: datetime = field(default_factory=_now)
     updated_at: datetime = field(default_factory=_now)
 
@@ -140,7 +168,7 @@ class WebhookEvent:
     idempotency_key: str = ""
     event_id: str | None = None
     schema_version: str = "v1"
-    raw_payload: dict[str, object] = field(default_factory=dict)
+    raw_payload: Mapping[str, object] = field(default_factory=JsonPayload)
     processed: bool = False
     reason_code: str | None = None
     retry_count: int = 0
@@ -153,7 +181,7 @@ class OutboxEvent:
     aggregate_type: str = ""
     aggregate_id: UUID = field(default_factory=uuid4)
     event_type: str = ""
-    payload: dict[str, object] = field(default_factory=dict)
+    payload: Mapping[str, object] = field(default_factory=JsonPayload)
     status: OutboxStatus = OutboxStatus.PENDING
     retry_count: int = 0
     created_at: datetime = field(default_factory=_now)
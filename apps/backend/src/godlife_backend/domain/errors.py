@@ -0,0 +1,18 @@
+"""Domain error types shared by services and persistence adapters."""
+
+from __future__ import annotations
+
+from uuid import UUID
+
+
+class ConcurrencyConflictError(Exception):
+    """Raised when a versioned write loses against a concurrent update."""
+
+    def __init__(self, entity: str, entity_id: UUID, expected_version: int) -> None:
+        super().__init__(
+            f"{entity} {entity_id} was modified concurrently "
+            f"(expected version {expected_version})"
+        )
+        self.entity = entity
+        self.entity_id = entity_id
+        self.expected_version = expected_version
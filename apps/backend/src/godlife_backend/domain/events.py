@@ -0,0 +1,11 @@
+"""Outbox event types and payload fields shared across services."""
+
+from __future__ import annotations
+
+EXERCISE_SET_STATUS_CHANGED = "exercise_set.status_changed"
+READING_LOG_RECORDED = "reading_log.recorded"
+USER_CHANGED = "user.changed"
+USER_PROFILE_CHANGED = "user_profile.changed"
+WEBHOOK_RECEIVED = "webhook.received"
+
+DAILY_STAT_FIELDS = ("sets_done", "volume_kg", "reading_minutes", "pages_read")
@@ -0,0 +1,116 @@
+"""JSON payloads that stay encoded until one of their fields is read.
+
+Webhook, notification and outbox payloads mostly pass through untouched on
+their way from webhook to outbox to dispatcher: handlers read a few fields,
+and ``mark_failed`` adds one. :class:`JsonPayload` keeps the JSON bytes it was
+loaded from, decodes them on first field access, and records changes as a
+top-level patch. As a result:
+
+- an unchanged payload is written back as its original bytes, not re-encoded;
+- a patch can be applied inside the database without reading or rewriting
+  the stored document;
+- a payload nobody reads is never decoded.
+
+Payloads are immutable: :meth:`JsonPayload.patched` returns a new one.
+Decoding uses ``orjson`` when the optional ``fastjson`` extra is installed.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator, Mapping
+from types import MappingProxyType
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when the extra is absent
+    orjson = None  # type: ignore[assignment]
+
+
+def _loads(raw: bytes) -> dict[str, Any]:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _dumps(value: Mapping[str, object]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+class JsonPayload(Mapping[str, object]):
+    """Read-only JSON object decoded lazily from its stored bytes."""
+
+    __slots__ = ("_data", "_patch", "_raw")
+
+    def __init__(self, data: Mapping[str, object] | None = None) -> None:
+        self._raw: bytes | None = None
+        self._data: dict[str, Any] | None = {} if data is None else dict(data)
+        self._patch: dict[str, object] = {}
+
+    @classmethod
+    def from_json(cls, raw: bytes | str) -> JsonPayload:
+        """Wrap stored JSON text without decoding it."""
+
+        payload = cls.__new__(cls)
+        payload._raw = raw.encode() if isinstance(raw, str) else raw
+        payload._data = None
+        payload._patch = {}
+        return payload
+
+    @classmethod
+    def of(cls, value: Mapping[str, object]) -> JsonPayload:
+        return value if isinstance(value, JsonPayload) else cls(value)
+
+    @property
+    def is_decoded(self) -> bool:
+        return self._data is not None
+
+    @property
+    def patch(self) -> Mapping[str, object]:
+        """Top-level keys set since the payload was loaded."""
+
+        return MappingProxyType(self._patch)
+
+    @property
+    def stored_json(self) -> bytes | None:
+        """The JSON bytes the payload was loaded from, if any."""
+
+        return self._raw
+
+    def patched(self, changes: Mapping[str, object]) -> JsonPayload:
+        """Return a copy with ``changes`` set; nothing is decoded."""
+
+        payload = JsonPayload.__new__(JsonPayload)
+        payload._raw = self._raw
+        payload._data = None if self._data is None else {**self._data, **changes}
+        payload._patch = {**self._patch, **changes}
+        return payload
+
+    def to_json(self) -> bytes:
+        """Encoded payload; the stored bytes themselves when nothing changed."""
+
+        if self._raw is not None and not self._patch:
+            return self._raw
+        return _dumps(self._decoded())
+
+    def _decoded(self) -> dict[str, Any]:
+        if self._data is None:
+            data = _loads(self._raw or b"{}")
+            data.update(self._patch)
+            self._data = data
+        return self._data
+
+    def __getitem__(self, key: str) -> object:
+        if key in self._patch:
+            return self._patch[key]
+        return self._decoded()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._decoded())
+
+    def __len__(self) -> int:
+        return len(self._decoded())
+
+    def __repr__(self) -> str:
+        return f"JsonPayload({self._decoded()!r})"
@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
-from datetime import date
+from collections.abc import Collection, Iterator, Mapping, Sequence
+from datetime import date, datetime
 from typing import Protocol
 from uuid import UUID
 
@@ -17,6 +17,7 @@ from godlife_backend.domain.entities import (
     ReadingLog,
     ReadingPlan,
     User,
+    UserDailyStats,
     UserProfile,
     WebhookEvent,
 )
@@ -29,6 +30,15 @@ class UserRepository(Protocol):
     def get_by_kakao_user_id(self, kakao_user_id: str) -> User | None:
         raise NotImplementedError
 
+    def map_kakao_user_ids(self, kakao_user_ids: Collection[str]) -> dict[str, UUID]:
+        """Resolve many Kakao ids to user ids in one lookup; unknown ids are absent."""
+        raise NotImplementedError
+
+    def iter_kakao_user_ids(
+        self, batch_size: int = 10_000
+    ) -> Iterator[tuple[str, UUID]]:
+        raise NotImplementedError
+
     def save(self, user: User) -> User:
         raise NotImplementedError
 
@@ -64,6 +74,9 @@ class ExercisePlanRepository(Protocol):
     def save(self, plan: ExercisePlan) -> ExercisePlan:
         raise NotImplementedError
 
+    def increment_set_counters(self, plan_id: UUID, deltas: Mapping[str, int]) -> None:
+        raise NotImplementedError
+
 
 class ExerciseSessionRepository(Protocol):
     def list_by_plan(self, plan_id: UUID) -> list[ExerciseSession]:
@@ -75,6 +88,11 @@ class ExerciseSessionRepository(Protocol):
     def save(self, session: ExerciseSession) -> ExerciseSession:
         raise NotImplementedError
 
+    def increment_set_counters(
+        self, session_id: UUID, deltas: Mapping[str, int]
+    ) -> None:
+        raise NotImplementedError
+
 
 class ExerciseSetStateRepository(Protocol):
     def get(self, session_id: UUID, set_no: int) -> ExerciseSetState | None:
@@ -84,6 +102,8 @@ class ExerciseSetStateRepository(Protocol):
         raise NotImplementedError
 
     def save(self, state: ExerciseSetState) -> ExerciseSetState:
+        """Insert or CAS-update a set; an insert also counts the new set on its
+        session and plan in the same transaction."""
         raise NotImplementedError
 
 
@@ -111,6 +131,24 @@ class ReadingLogRepository(Protocol):
         raise NotImplementedError
 
 
+class UserDailyStatsRepository(Protocol):
+    def get(self, user_id: UUID, stat_date: date) -> UserDailyStats | None:
+        raise NotImplementedError
+
+    def list_range(
+        self, user_id: UUID, from_date: date, to_date: date
+    ) -> list[UserDailyStats]:
+        raise NotImplementedError
+
+    def increment(
+        self, user_id: UUID, stat_date: date, deltas: Mapping[str, float]
+    ) -> UserDailyStats:
+        raise NotImplementedError
+
+    def set_streak(self, user_id: UUID, stat_date: date, streak_days: int) -> None:
+        raise NotImplementedError
+
+
 class NotificationRepository(Protocol):
     def get_by_id(self, notification_id: UUID) -> Notification | None:
         raise NotImplementedError
@@ -127,6 +165,13 @@ class NotificationRepository(Protocol):
     ) -> Sequence[Notification]:
         raise NotImplementedError
 
+    def list_due(self, before: datetime, limit: int = 100) -> Sequence[Notification]:
+        """Scheduled or retry-scheduled notifications due before ``before``.
+
+        Across all users, oldest ``schedule_at`` first.
+        """
+        raise NotImplementedError
+
     def save(self, notification: Notification) -> Notification:
         raise NotImplementedError
 
@@ -138,6 +183,10 @@ class WebhookEventRepository(Protocol):
     def save(self, event: WebhookEvent) -> WebhookEvent:
         raise NotImplementedError
 
+    def insert_new(self, events: Sequence[WebhookEvent]) -> set[UUID]:
+        """Insert events that violate no uniqueness rule; return the inserted ids."""
+        raise NotImplementedError
+
     def get_by_provider_and_event_id(
         self, provider: str, event_id: str
     ) -> WebhookEvent | None:
@@ -159,3 +208,12 @@ class OutboxEventRepository(Protocol):
 
     def mark_failed(self, event_id: UUID, reason: str | None) -> OutboxEvent | None:
         raise NotImplementedError
+
+    def list_recent(
+        self, event_types: Collection[str], since: datetime, limit: int = 1000
+    ) -> list[OutboxEvent]:
+        """Events of ``event_types`` created at or after ``since``, oldest first.
+
+        Reads only: the events are neither leased nor acknowledged.
+        """
+        raise NotImplementedError
@@ -0,0 +1,30 @@
+"""Set progress counters kept on exercise plan and session rows."""
+
+from __future__ import annotations
+
+from godlife_backend.db.enums import SetStatus
+
+SET_COUNTER_FIELDS = ("pending_sets", "done_sets", "skipped_sets", "failed_sets")
+
+_COUNTER_BY_STATUS: dict[SetStatus, str] = {
+    SetStatus.PENDING: "pending_sets",
+    SetStatus.IN_PROGRESS: "pending_sets",
+    SetStatus.DONE: "done_sets",
+    SetStatus.SKIPPED: "skipped_sets",
+    SetStatus.FAILED: "failed_sets",
+}
+
+
+def set_counter_deltas(
+    from_status: SetStatus | None, to_status: SetStatus
+) -> dict[str, int]:
+    """Return counter increments for one set moving between statuses.
+
+    ``from_status`` is ``None`` when the set is newly created.
+    """
+
+    deltas = dict.fromkeys(SET_COUNTER_FIELDS, 0)
+    if from_status is not None:
+        deltas[_COUNTER_BY_STATUS[from_status]] -= 1
+    deltas[_COUNTER_BY_STATUS[to_status]] += 1
+    return {name: delta for name, delta in deltas.items() if delta}
@@ -0,0 +1,47 @@
+"""Rules for how exercise sets and reading logs contribute to daily stats."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, tzinfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from godlife_backend.db.enums import SetStatus
+from godlife_backend.domain.entities import ExerciseSetState, ReadingLog
+
+
+def done_set_volume(state: ExerciseSetState) -> tuple[int, float]:
+    """Return ``(sets_done, volume_kg)`` counted for one set state."""
+
+    if state.status != SetStatus.DONE:
+        return 0, 0.0
+    return 1, (state.performed_reps or 0) * (state.performed_weight_kg or 0.0)
+
+
+def user_zone(name: str) -> tzinfo:
+    """Time zone a user's days are counted in; unknown names fall back to UTC."""
+
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return UTC
+
+
+def reading_log_contribution(
+    log: ReadingLog, zone: tzinfo = UTC
+) -> tuple[date, float, int] | None:
+    """Return ``(stat_date, reading_minutes, pages_read)`` for one log.
+
+    ``stat_date`` is the local date of ``start_at`` in the user's ``zone``, the
+    same calendar exercise plans use for ``target_date``.
+    """
+
+    if log.start_at is None:
+        return None
+    minutes = 0.0
+    if log.end_at is not None and log.end_at > log.start_at:
+        minutes = (log.end_at - log.start_at).total_seconds() / 60
+    start_at = log.start_at
+    if start_at.tzinfo is None:
+        # SQLite hands back naive datetimes for timezone-aware columns.
+        start_at = start_at.replace(tzinfo=UTC)
+    return start_at.astimezone(zone).date(), minutes, log.pages_read or 0
@@ -0,0 +1,82 @@
+"""Micro-benchmark for the web API JSON codec.
+
+Compares FastAPI's generic encoding path with ``json_codec`` for domain
+dataclasses and webhook bodies. Response models are left out on purpose:
+FastAPI already dumps them through a prebuilt ``TypeAdapter``.
+
+    uv run --extra fastjson python benchmarks/json_codec.py --number 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from collections.abc import Callable
+
+from fastapi.encoders import jsonable_encoder
+from godlife_backend.adapter.webapi import json_codec
+from godlife_backend.adapter.webapi.routers.webhooks import WebhookPayload
+from godlife_backend.domain.entities import Notification
+
+
+def _notification() -> Notification:
+    return Notification(
+        kind="reading_reminder",
+        payload={"minutes": 20, "book": {"title": "x" * 40, "pages": [1, 2, 3]}},
+    )
+
+
+def _webhook_body() -> bytes:
+    raw_payload = {
+        "user": {"id": "kakao-1", "properties": {"tags": list(range(30))}},
+        "content": "hello " * 20,
+    }
+    return json.dumps(
+        {
+            "provider": "kakao",
+            "event_type": "message",
+            "event_id": "evt-1",
+            "raw_payload": raw_payload,
+        }
+    ).encode()
+
+
+def cases() -> dict[str, tuple[Callable[[], object], Callable[[], object]]]:
+    """Return ``name -> (baseline, codec)`` pairs producing equivalent output."""
+
+    notification = _notification()
+    body = _webhook_body()
+    return {
+        "dataclass -> bytes": (
+            lambda: json.dumps(jsonable_encoder(notification)).encode(),
+            lambda: json_codec.dumps(notification),
+        ),
+        "webhook body -> model": (
+            lambda: WebhookPayload.model_validate(json.loads(body)),
+            lambda: json_codec.parse_model(WebhookPayload, body),
+        ),
+    }
+
+
+def _best_microseconds(func: Callable[[], object], number: int, repeat: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="JSON codec micro-benchmark")
+    parser.add_argument("--number", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    backend = "orjson" if json_codec.HAS_ORJSON else "pydantic"
+    print(f"codec backend: {backend}")
+    print(f"{'case':<26}{'baseline us':>12}{'codec us':>12}{'speedup':>10}")
+    for name, (baseline, codec) in cases().items():
+        before = _best_microseconds(baseline, args.number, args.repeat)
+        after = _best_microseconds(codec, args.number, args.repeat)
+        print(f"{name:<26}{before:>12.2f}{after:>12.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+"""End-to-end HTTP load test with a synthetic user population.
+
+Seeds users, profiles, reading plans, historical reading logs and
+notifications in bulk, then drives a weighted request mix at a fixed
+concurrency and reports throughput and p50/p95/p99 latency per scenario.
+
+- ``plans``: ``POST /plans/generate`` for a random user
+- ``webhooks``: ``POST /webhooks/kakao`` with a fresh event from a known user
+- ``duplicates``: the same few hot events over and over (a duplicate storm),
+  alternating single deliveries with ``/webhooks/kakao/batch`` re-sends
+- ``retry``: ``POST /notifications/retry`` for a stored notification
+
+By default the app runs in-process through ``httpx.ASGITransport`` on a
+temporary SQLite file (or ``--database-url``). With ``--url`` it targets a
+running server instead; pass that server's ``--database-url`` to seed it, or
+``--no-seed`` to reuse what is there.
+
+``501`` responses are counted apart from errors: they mark use cases that are
+still stubs and exercise everything up to the service call. ``--max-p99-ms``
+and ``--min-rps`` turn the run into a release gate (exit code 1).
+
+    uv run python benchmarks/load_test.py --users 10000 --requests 20000 -c 32
+    uv run python benchmarks/load_test.py --url http://127.0.0.1:8000 \\
+        --database-url postgresql+psycopg://localhost/godlife --max-p99-ms 250
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from datetime import time as clock
+from pathlib import Path
+from typing import Any, cast
+from uuid import UUID, uuid4
+
+import httpx
+import sqlalchemy as sa
+from godlife_backend.db import models
+from godlife_backend.db.base import Base
+from godlife_backend.db.enums import NotificationStatus, ReadingLogStatus
+from sqlalchemy.orm import Session
+
+SCENARIOS = ("plans", "webhooks", "duplicates", "retry")
+DEFAULT_MIX = "plans=1,webhooks=4,duplicates=2,retry=1"
+HOT_EVENTS = 8
+SEED_CHUNK = 5_000
+_TODAY = date(2026, 1, 1)
+
+
+@dataclass(frozen=True, slots=True)
+class Population:
+    user_ids: list[UUID]
+    kakao_ids: list[str]
+    notification_ids: list[UUID]
+
+
+def seed(
+    engine: sa.Engine,
+    users: int,
+    *,
+    logs_per_user: int = 30,
+    notifications_per_user: int = 3,
+    rng: random.Random,
+) -> Population:
+    """Bulk insert the population with executemany batches of ``SEED_CHUNK``."""
+
+    run = uuid4().hex[:8]
+    user_ids = [uuid4() for _ in range(users)]
+    kakao_ids = [f"load-{run}-{n}" for n in range(users)]
+    plan_ids = [uuid4() for _ in range(users)]
+    notification_ids: list[UUID] = []
+    now = datetime.now(UTC)
+
+    def user_rows(start: int, stop: int) -> Iterator[tuple[sa.Table, list[dict]]]:
+        span = range(start, stop)
+        yield (
+            _table(models.User),
+            [
+                {"id": user_ids[n], "kakao_user_id": kakao_ids[n], "name": f"user {n}"}
+                for n in span
+            ],
+        )
+        yield (
+            _table(models.UserProfile),
+            [
+                {
+                    "id": uuid4(),
+                    "user_id": user_ids[n],
+                    "age": rng.randint(18, 70),
+                    "max_daily_minutes": rng.choice([20, 30, 45, 60]),
+                }
+                for n in span
+            ],
+        )
+        yield (
+            _table(models.ReadingPlan),
+            [
+                {
+                    "id": plan_ids[n],
+                    "user_id": user_ids[n],
+                    "remind_time": clock(rng.randint(6, 22)),
+                    "goal_minutes": 30,
+                }
+                for n in span
+            ],
+        )
+        logs = []
+        for n in span:
+            for day in range(logs_per_user):
+                started = datetime.combine(_TODAY - timedelta(days=day), clock(21), UTC)
+                logs.append(
+                    {
+                        "id": uuid4(),
+                        "user_id": user_ids[n],
+                        "reading_plan_id": plan_ids[n],
+                        "start_at": started,
+                        "end_at": started + timedelta(minutes=rng.randint(5, 60)),
+                        "pages_read": rng.randint(1, 40),
+                        "status": ReadingLogStatus.DONE,
+                        "created_at": started,
+                    }
+                )
+        yield _table(models.ReadingLog), logs
+        notifications = []
+        for n in span:
+            for k in range(notifications_per_user):
+                notification_id = uuid4()
+                notification_ids.append(notification_id)
+                notifications.append(
+                    {
+                        "id": notification_id,
+                        "user_id": user_ids[n],
+                        "kind": "reading_reminder",
+                        "status": NotificationStatus.FAILED,
+                        "schedule_at": now - timedelta(days=k),
+                        "idempotency_key": f"load-{run}-{n}-{k}",
+                        "payload": {},
+                    }
+                )
+        yield _table(models.Notification), notifications
+
+    with Session(engine) as session:
+        for start in range(0, users, SEED_CHUNK):
+            for table, rows in user_rows(start, min(users, start + SEED_CHUNK)):
+                if rows:
+                    session.execute(sa.insert(table), rows)
+            session.commit()
+    return Population(user_ids, kakao_ids, notification_ids)
+
+
+def _table(model: type[Base]) -> sa.Table:
+    return cast(sa.Table, model.__table__)
+
+
+@dataclass(frozen=True, slots=True)
+class PlannedRequest:
+    scenario: str
+    path: str
+    body: Any
+
+
+def parse_mix(spec: str) -> dict[str, int]:
+    mix: dict[str, int] = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise ValueError(f"unknown scenario {name!r}; expected {SCENARIOS}")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+def plan_requests(
+    population: Population, mix: dict[str, int], rng: random.Random
+) -> Iterator[PlannedRequest]:
+    """Endless weighted stream of requests against ``population``."""
+
+    names = [name for name in mix if mix[name] > 0]
+    weights = [mix[name] for name in names]
+    hot = [
+        _webhook(population, rng, event_id=f"hot-{n}", user=n)
+        for n in range(HOT_EVENTS)
+    ]
+    sequence = 0
+    while True:
+        sequence += 1
+        scenario = rng.choices(names, weights)[0]
+        if scenario == "plans":
+            yield PlannedRequest(
+                scenario,
+                "/plans/generate",
+                {
+                    "user_id": str(rng.choice(population.user_ids or [uuid4()])),
+                    "target_date": _TODAY.isoformat(),
+                },
+            )
+        elif scenario == "webhooks":
+            body = _webhook(population, rng, event_id=f"evt-{uuid4().hex}")
+            yield PlannedRequest(scenario, "/webhooks/kakao", body)
+        elif scenario == "duplicates":
+            if sequence % 2:
+                yield PlannedRequest(scenario, "/webhooks/kakao", rng.choice(hot))
+            else:
+                yield PlannedRequest(scenario, "/webhooks/kakao/batch", hot)
+        else:
+            notification_id = rng.choice(population.notification_ids or [uuid4()])
+            yield PlannedRequest(
+                scenario,
+                "/notifications/retry",
+                {"notification_id": str(notification_id)},
+            )
+
+
+def _webhook(
+    population: Population,
+    rng: random.Random,
+    *,
+    event_id: str,
+    user: int | None = None,
+) -> dict[str, Any]:
+    kakao_ids = population.kakao_ids or ["unknown"]
+    kakao_id = kakao_ids[user % len(kakao_ids)] if user is not None else None
+    return {
+        "provider": "kakao",
+        "event_type": "message",
+        "event_id": event_id,
+        "kakao_user_id": kakao_id or rng.choice(kakao_ids),
+        "raw_payload": {"content": "읽기 완료", "pages": rng.randint(1, 40)},
+    }
+
+
+@dataclass(slots=True)
+class ScenarioStats:
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter[int] = field(default_factory=Counter)
+
+    def record(self, status: int, seconds: float) -> None:
+        self.latencies.append(seconds)
+        self.statuses[status] += 1
+
+    @property
+    def errors(self) -> int:
+        # 501 is a stubbed use case, not a failure of the serving path.
+        return sum(
+            count
+            for status, count in self.statuses.items()
+            if (status >= 500 and status != 501) or status == 0
+        )
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    requests: Iterator[PlannedRequest],
+    *,
+    total: int,
+    concurrency: int,
+    duration: float | None,
+) -> tuple[dict[str, ScenarioStats], float]:
+    """Send up to ``total`` requests (or for ``duration`` s) from N workers."""
+
+    stats = {name: ScenarioStats() for name in SCENARIOS}
+    deadline = None if duration is None else time.perf_counter() + duration
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0 and (deadline is None or time.perf_counter() < deadline):
+            remaining -= 1
+            planned = next(requests)
+            started = time.perf_counter()
+            try:
+                response = await client.post(planned.path, json=planned.body)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            stats[planned.scenario].record(status, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return stats, time.perf_counter() - started
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(stats: dict[str, ScenarioStats], elapsed: float) -> dict[str, Any]:
+    rows: dict[str, Any] = {}
+    overall = ScenarioStats()
+    for name, scenario in stats.items():
+        if scenario.latencies:
+            rows[name] = _summary(scenario, elapsed)
+            overall.latencies += scenario.latencies
+            overall.statuses.update(scenario.statuses)
+    rows["total"] = _summary(overall, elapsed)
+    return rows
+
+
+def _summary(stats: ScenarioStats, elapsed: float) -> dict[str, Any]:
+    latencies = sorted(stats.latencies)
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "errors": stats.errors,
+        "statuses": {str(status): n for status, n in sorted(stats.statuses.items())},
+    }
+
+
+def gate_failures(
+    summary: dict[str, Any], *, max_p99_ms: float | None, min_rps: float | None
+) -> list[str]:
+    total = summary["total"]
+    failures = []
+    if total["errors"]:
+        failures.append(f"{total['errors']} failed requests")
+    if max_p99_ms is not None and total["p99_ms"] > max_p99_ms:
+        failures.append(f"p99 {total['p99_ms']:.1f} ms > {max_p99_ms} ms")
+    if min_rps is not None and total["rps"] < min_rps:
+        failures.append(f"{total['rps']:.0f} req/s < {min_rps} req/s")
+    return failures
+
+
+def _client(url: str | None, concurrency: int) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=concurrency)
+    if url is not None:
+        return httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0)
+    from godlife_backend.adapter.webapi.app import create_app
+
+    transport = httpx.ASGITransport(app=create_app())
+    return httpx.AsyncClient(transport=transport, base_url="http://loadtest")
+
+
+async def _run(args: argparse.Namespace, population: Population) -> dict[str, Any]:
+    requests = plan_requests(population, parse_mix(args.mix), random.Random(args.seed))
+    async with _client(args.url, args.concurrency) as client:
+        stats, elapsed = await drive(
+            client,
+            requests,
+            total=args.requests,
+            concurrency=args.concurrency,
+            duration=args.duration,
+        )
+    return summarize(stats, elapsed)
+
+
+def _print_summary(summary: dict[str, Any]) -> None:
+    print(
+        f"{'scenario':<12} {'requests':>9} {'req/s':>9} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'p99 ms':>8} {'errors':>7}  statuses"
+    )
+    for name, row in summary.items():
+        statuses = " ".join(f"{k}:{v}" for k, v in row["statuses"].items())
+        print(
+            f"{name:<12} {row['requests']:>9,} {row['rps']:>9,.0f} "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} "
+            f"{row['errors']:>7}  {statuses}"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="HTTP API load test")
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--logs-per-user", type=int, default=30)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--duration", type=float, help="stop after N seconds")
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--url", help="target a running server instead of ASGI")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--no-seed", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="write the summary here")
+    parser.add_argument("--max-p99-ms", type=float)
+    parser.add_argument("--min-rps", type=float)
+    args = parser.parse_args(argv)
+    if args.url is not None and args.database_url is None and not args.no_seed:
+        parser.error("--url needs --database-url to seed, or --no-seed")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{Path(tmp) / 'load.db'}"
+        # The in-process app reads DATABASE_URL when it opens its first session.
+        os.environ["DATABASE_URL"] = url
+        population = Population([], [], [])
+        if not args.no_seed:
+            engine = sa.create_engine(url)
+            Base.metadata.create_all(engine)
+            started = time.perf_counter()
+            population = seed(
+                engine,
+                args.users,
+                logs_per_user=args.logs_per_user,
+                rng=random.Random(args.seed),
+            )
+            engine.dispose()
+            print(
+                f"seeded {args.users:,} users in {time.perf_counter() - started:.1f}s"
+            )
+        summary = asyncio.run(_run(args, population))
+
+    _print_summary(summary)
+    if args.json is not None:
+        args.json.write_text(json.dumps(summary, indent=2) + "\n")
+    failures = gate_failures(summary, max_p99_ms=args.max_p99_ms, min_rps=args.min_rps)
+    if failures:
+        raise SystemExit("load test gate failed: " + "; ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""Outbox drain benchmark: dispatcher throughput with 1..N workers.
+
+Fills ``outbox_events`` with ``--events`` rows spread over ``--event-types``
+types, then for every handler latency model and worker count:
+
+1. resets every benchmark row to ``PENDING`` with ``created_at`` = now (one UPDATE);
+2. starts N worker threads, each looping ``OutboxDispatcher.dispatch_pending``
+   in its own unit of work (exactly what ``adapter.worker.run_once`` does) until
+   nothing is left to lease;
+3. reports the drain rate, lease cost and contention (mean lease time, short
+   leases, lock errors), duplicate deliveries and the enqueue-to-handled lag.
+
+Handler latency models (``--handler``, repeatable):
+
+- ``fixed:MS``: sleep MS milliseconds per event
+- ``lognormal:MEDIAN_MS,SIGMA``: lognormally distributed sleep
+- ``failing:RATE[,MS]``: fail a RATE fraction of events (after MS ms)
+
+SQLite serializes writers, so more workers mostly show lock contention there;
+size worker counts against PostgreSQL via ``--database-url``. Use a scratch
+database: the workers lease every pending row, not only the benchmark's.
+
+    uv run python benchmarks/outbox_dispatch.py --events 1000000 --workers 1 2 4 8
+    uv run python benchmarks/outbox_dispatch.py --handler lognormal:2,0.8 \\
+        --handler failing:0.05,1 --database-url postgresql+psycopg://localhost/bench
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import cast
+from uuid import UUID, uuid4
+
+import sqlalchemy as sa
+from godlife_backend.adapter.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from godlife_backend.application.services import outbox_dispatcher as dispatcher_module
+from godlife_backend.application.services.outbox_dispatcher import OutboxDispatcher
+from godlife_backend.db import models
+from godlife_backend.db.base import Base
+from godlife_backend.db.enums import OutboxStatus
+from godlife_backend.domain.entities import OutboxEvent
+from godlife_backend.domain.ports import OutboxEventRepository
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+_OUTBOX = cast(sa.Table, models.OutboxEvent.__table__)
+SEED_CHUNK = 20_000
+AGGREGATE_TYPE = "bench"
+
+
+@dataclass(frozen=True, slots=True)
+class LatencyModel:
+    spec: str
+    sample: Callable[[random.Random], float]
+    failure_rate: float = 0.0
+
+
+def parse_model(spec: str) -> LatencyModel:
+    kind, _, raw = spec.partition(":")
+    values = [float(value) for value in raw.split(",") if value]
+    if kind == "fixed" and len(values) == 1:
+        seconds = values[0] / 1000
+        return LatencyModel(spec, lambda rng: seconds)
+    if kind == "lognormal" and len(values) == 2:
+        mu, sigma = math.log(values[0] / 1000), values[1]
+        return LatencyModel(spec, lambda rng: rng.lognormvariate(mu, sigma))
+    if kind == "failing" and len(values) in (1, 2):
+        seconds = values[1] / 1000 if len(values) == 2 else 0.0
+        return LatencyModel(spec, lambda rng: seconds, failure_rate=values[0])
+    raise ValueError(f"bad handler model {spec!r}")
+
+
+@dataclass(slots=True)
+class RunStats:
+    deliveries: Counter[UUID] = field(default_factory=Counter)
+    lags: list[float] = field(default_factory=list)
+    completed: int = 0
+    failed: int = 0
+    leases: int = 0
+    short_leases: int = 0
+    lease_seconds: float = 0.0
+    lock_errors: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def duplicates(self) -> int:
+        return sum(count - 1 for count in self.deliveries.values() if count > 1)
+
+
+class _TimedOutbox(OutboxEventRepository):
+    """Delegate to the unit of work's outbox, timing and counting leases."""
+
+    def __init__(self, inner: OutboxEventRepository, stats: RunStats) -> None:
+        self._inner = inner
+        self._stats = stats
+        self.leased = 0
+
+    def lease_pending(self, limit: int = 100) -> list[OutboxEvent]:
+        started = time.perf_counter()
+        events = self._inner.lease_pending(limit)
+        elapsed = time.perf_counter() - started
+        self.leased = len(events)
+        with self._stats.lock:
+            self._stats.leases += 1
+            self._stats.lease_seconds += elapsed
+            self._stats.short_leases += 0 < len(events) < limit
+        return events
+
+    def save(self, event: OutboxEvent) -> OutboxEvent:
+        return self._inner.save(event)
+
+    def mark_complete(self, event_id: UUID) -> OutboxEvent | None:
+        return self._inner.mark_complete(event_id)
+
+    def mark_failed(self, event_id: UUID, reason: str | None) -> OutboxEvent | None:
+        return self._inner.mark_failed(event_id, reason)
+
+
+def seed(engine: sa.Engine, events: int, event_types: int) -> None:
+    """Replace earlier benchmark rows with ``events`` fresh pending ones."""
+
+    now = datetime.now(UTC)
+    with Session(engine) as session:
+        session.execute(
+            sa.delete(_OUTBOX).where(_OUTBOX.c.aggregate_type == AGGREGATE_TYPE)
+        )
+        for start in range(0, events, SEED_CHUNK):
+            session.execute(
+                sa.insert(_OUTBOX),
+                [
+                    {
+                        "id": uuid4(),
+                        "aggregate_type": AGGREGATE_TYPE,
+                        "aggregate_id": uuid4(),
+                        "event_type": f"bench.type{n % event_types}",
+                        "payload": {"n": n},
+                        "status": OutboxStatus.PENDING,
+                        "retry_count": 0,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for n in range(start, min(events, start + SEED_CHUNK))
+                ],
+            )
+            session.commit()
+
+
+def reset(engine: sa.Engine) -> None:
+    """Make every benchmark row pending again, enqueued now."""
+
+    now = datetime.now(UTC)
+    with Session(engine) as session:
+        session.execute(
+            sa.update(_OUTBOX)
+            .where(_OUTBOX.c.aggregate_type == AGGREGATE_TYPE)
+            .values(status=OutboxStatus.PENDING, created_at=now, updated_at=now)
+        )
+        session.commit()
+
+
+def _worker(
+    engine: sa.Engine,
+    model: LatencyModel,
+    event_types: list[str],
+    stats: RunStats,
+    batch_size: int,
+    seed: int,
+) -> None:
+    rng = random.Random(seed)
+
+    def handler(event: OutboxEvent) -> None:
+        time.sleep(model.sample(rng))
+        lag = datetime.now(UTC) - _aware(event.created_at)
+        with stats.lock:
+            stats.deliveries[event.id] += 1
+            stats.lags.append(lag.total_seconds())
+        if rng.random() < model.failure_rate:
+            raise RuntimeError("simulated handler failure")
+
+    while True:
+        try:
+            with SqlAlchemyUnitOfWork(Session(engine)) as uow:
+                outbox = _TimedOutbox(uow.outbox, stats)
+                dispatcher = OutboxDispatcher(outbox, savepoint=uow.savepoint)
+                for event_type in event_types:
+                    dispatcher.register(event_type, handler)
+                completed = dispatcher.dispatch_pending(limit=batch_size)
+        except OperationalError:
+            # SQLite "database is locked" and PostgreSQL serialization errors.
+            with stats.lock:
+                stats.lock_errors += 1
+            continue
+        with stats.lock:
+            stats.completed += completed
+            stats.failed += outbox.leased - completed
+        if outbox.leased == 0:
+            return
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes for timezone-aware columns.
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+@dataclass(frozen=True, slots=True)
+class RunResult:
+    model: str
+    workers: int
+    events: int
+    completed: int
+    failed: int
+    seconds: float
+    leases: int
+    short_leases: int
+    mean_lease_ms: float
+    lock_errors: int
+    duplicates: int
+    lag_p50_s: float
+    lag_p99_s: float
+
+    @property
+    def drain_rate(self) -> float:
+        return (self.completed + self.failed) / self.seconds
+
+
+def run(
+    engine: sa.Engine,
+    model: LatencyModel,
+    workers: int,
+    *,
+    event_types: list[str],
+    batch_size: int,
+) -> RunResult:
+    reset(engine)
+    stats = RunStats()
+    threads = [
+        threading.Thread(
+            target=_worker,
+            args=(engine, model, event_types, stats, batch_size, n),
+            name=f"dispatcher-{n}",
+        )
+        for n in range(workers)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+    lags = sorted(stats.lags)
+    return RunResult(
+        model=model.spec,
+        workers=workers,
+        events=len(stats.deliveries),
+        completed=stats.completed,
+        failed=stats.failed,
+        seconds=seconds,
+        leases=stats.leases,
+        short_leases=stats.short_leases,
+        mean_lease_ms=stats.lease_seconds / max(1, stats.leases) * 1000,
+        lock_errors=stats.lock_errors,
+        duplicates=stats.duplicates,
+        lag_p50_s=lags[len(lags) // 2] if lags else 0.0,
+        lag_p99_s=lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else 0.0,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Outbox dispatch benchmark")
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--event-types", type=int, default=4)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--handler", action="append", type=parse_model, dest="models")
+    parser.add_argument(
+        "--database-url", default=os.getenv("BENCH_DATABASE_URL") or None
+    )
+    args = parser.parse_args(argv)
+    # Simulated failures are expected; keep their tracebacks out of the table.
+    logging.getLogger(dispatcher_module.__name__).setLevel(logging.CRITICAL)
+    models_ = args.models or [parse_model("fixed:0.2")]
+    event_types = [f"bench.type{n}" for n in range(args.event_types)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{Path(tmp) / 'outbox.db'}"
+        connect_args = {"timeout": 30} if url.startswith("sqlite") else {}
+        engine = sa.create_engine(
+            url, pool_size=max(args.workers) + 1, connect_args=connect_args
+        )
+        Base.metadata.create_all(engine, tables=[_OUTBOX])
+        started = time.perf_counter()
+        seed(engine, args.events, args.event_types)
+        print(f"seeded {args.events:,} events in {time.perf_counter() - started:.1f}s")
+
+        print(
+            f"{'handler':<22} {'workers':>7} {'events/s':>10} {'done':>9} "
+            f"{'failed':>7} {'lease ms':>9} {'short':>6} {'locked':>7} "
+            f"{'dupes':>6} {'lag p50':>8} {'lag p99':>8}"
+        )
+        for model in models_:
+            for workers in args.workers:
+                r = run(
+                    engine,
+                    model,
+                    workers,
+                    event_types=event_types,
+                    batch_size=args.batch_size,
+                )
+                print(
+                    f"{r.model:<22} {r.workers:>7} {r.drain_rate:>10,.0f} "
+                    f"{r.completed:>9,} {r.failed:>7,} {r.mean_lease_ms:>9.2f} "
+                    f"{r.short_leases:>6} {r.lock_errors:>7} {r.duplicates:>6} "
+                    f"{r.lag_p50_s:>7.2f}s {r.lag_p99_s:>7.2f}s"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
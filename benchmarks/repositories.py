@@ -0,0 +1,505 @@
+"""Run the same repository scenarios against the in-memory and SQLAlchemy adapters.
+
+Scenarios, each timed per operation:
+
+- ``webhook_lookup``: ``get_by_provider_and_key`` for a random stored event
+- ``notification_lookup``: ``get_by_idempotency_key`` for a random notification
+- ``notification_list``: ``list(user_id)`` for a random user (~100 rows)
+- ``outbox_cycle``: ``lease_pending(100)`` + ``mark_complete`` per event, committed
+- ``plan_load``: plan + sessions + pending sets of a random plan
+
+``--rows`` sets the notification, webhook and outbox row counts; plans are a
+hundredth of that, each with 5 sessions of 4 sets. SQLAlchemy runs on a
+temporary SQLite file unless ``--database-url`` (or ``BENCH_DATABASE_URL``)
+points at PostgreSQL. Each run is appended to a JSON history file;
+``--compare`` prints the ratio against an earlier run by commit.
+
+    uv run python benchmarks/repositories.py --rows 10000 100000
+    uv run python benchmarks/repositories.py --rows 1000000 --backend sqlalchemy
+    uv run python benchmarks/repositories.py --rows 10000 --compare 4686790
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, Protocol
+
+import sqlalchemy as sa
+from godlife_backend.adapter.persistence.bulk_loader import bulk_load
+from godlife_backend.adapter.persistence.repositories.sqlalchemy_repositories import (
+    SqlAlchemyExercisePlanRepository,
+    SqlAlchemyExerciseSessionRepository,
+    SqlAlchemyExerciseSetStateRepository,
+    SqlAlchemyNotificationRepository,
+    SqlAlchemyOutboxEventRepository,
+    SqlAlchemyWebhookEventRepository,
+)
+from godlife_backend.adapter.test_doubles import (
+    InMemoryExercisePlanRepository,
+    InMemoryExerciseSessionRepository,
+    InMemoryExerciseSetStateRepository,
+    InMemoryNotificationRepository,
+    InMemoryOutboxEventRepository,
+    InMemoryWebhookEventRepository,
+)
+from godlife_backend.db.base import Base
+from godlife_backend.domain.entities import (
+    ExercisePlan,
+    ExerciseSession,
+    ExerciseSetState,
+    Notification,
+    OutboxEvent,
+    User,
+    WebhookEvent,
+)
+from godlife_backend.domain.ports import (
+    ExercisePlanRepository,
+    ExerciseSessionRepository,
+    ExerciseSetStateRepository,
+    NotificationRepository,
+    OutboxEventRepository,
+    WebhookEventRepository,
+)
+from sqlalchemy.orm import Session
+
+HISTORY = Path(__file__).resolve().parent / "results" / "repositories.json"
+SCENARIOS = (
+    "webhook_lookup",
+    "notification_lookup",
+    "notification_list",
+    "outbox_cycle",
+    "plan_load",
+)
+SESSIONS_PER_PLAN = 5
+SETS_PER_SESSION = 4
+NOTIFICATIONS_PER_USER = 100
+SEED_CHUNK = 10_000
+_EPOCH = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+@dataclass(slots=True)
+class Dataset:
+    users: list[User]
+    notifications: list[Notification]
+    webhooks: list[WebhookEvent]
+    outbox: list[OutboxEvent]
+    plans: list[ExercisePlan]
+    sessions: list[ExerciseSession]
+    sets: list[ExerciseSetState]
+
+
+def build_dataset(rows: int) -> Dataset:
+    users = [
+        User(kakao_user_id=f"kakao-{n}", name="bench")
+        for n in range(max(1, rows // NOTIFICATIONS_PER_USER))
+    ]
+    notifications = [
+        Notification(
+            user_id=users[n % len(users)].id,
+            kind="reminder",
+            schedule_at=_EPOCH + timedelta(minutes=n),
+            idempotency_key=f"reminder-{n}",
+            payload={"n": n},
+        )
+        for n in range(rows)
+    ]
+    webhooks = [
+        WebhookEvent(
+            provider="kakao",
+            event_type="message",
+            event_id=str(n),
+            idempotency_key=f"kakao:message:{n}",
+            raw_payload={"content": "hello"},
+        )
+        for n in range(rows)
+    ]
+    outbox = [
+        OutboxEvent(
+            aggregate_type="bench",
+            event_type="bench.created",
+            updated_at=_EPOCH + timedelta(seconds=n),
+        )
+        for n in range(rows)
+    ]
+    plans = [
+        ExercisePlan(user_id=users[n % len(users)].id, target_date=_EPOCH.date())
+        for n in range(max(1, rows // 100))
+    ]
+    sessions = [
+        ExerciseSession(plan_id=plan.id, order_no=order, exercise_name="squat")
+        for plan in plans
+        for order in range(SESSIONS_PER_PLAN)
+    ]
+    sets = [
+        ExerciseSetState(session_id=session.id, set_no=set_no)
+        for session in sessions
+        for set_no in range(1, SETS_PER_SESSION + 1)
+    ]
+    return Dataset(users, notifications, webhooks, outbox, plans, sessions, sets)
+
+
+class Repositories(Protocol):
+    notifications: NotificationRepository
+    webhooks: WebhookEventRepository
+    outbox: OutboxEventRepository
+    plans: ExercisePlanRepository
+    sessions: ExerciseSessionRepository
+    sets: ExerciseSetStateRepository
+
+    def commit(self) -> None: ...
+
+
+class MemoryRepositories:
+    def __init__(self, data: Dataset) -> None:
+        self.notifications = InMemoryNotificationRepository()
+        self.webhooks = InMemoryWebhookEventRepository()
+        self.outbox = InMemoryOutboxEventRepository()
+        self.plans = InMemoryExercisePlanRepository()
+        self.sessions = InMemoryExerciseSessionRepository()
+        self.sets = InMemoryExerciseSetStateRepository()
+        for notification in data.notifications:
+            self.notifications.save(notification)
+        for webhook in data.webhooks:
+            self.webhooks.save(webhook)
+        for event in data.outbox:
+            self.outbox.save(event)
+        for plan in data.plans:
+            self.plans.save(plan)
+        for session in data.sessions:
+            self.sessions.save(session)
+        for state in data.sets:
+            self.sets.save(state)
+
+    def commit(self) -> None:
+        pass
+
+
+class SqlRepositories:
+    def __init__(self, session: Session) -> None:
+        self._session = session
+        self.notifications = SqlAlchemyNotificationRepository(session)
+        self.webhooks = SqlAlchemyWebhookEventRepository(session)
+        self.outbox = SqlAlchemyOutboxEventRepository(session)
+        self.plans = SqlAlchemyExercisePlanRepository(session)
+        self.sessions = SqlAlchemyExerciseSessionRepository(session)
+        self.sets = SqlAlchemyExerciseSetStateRepository(session)
+
+    def commit(self) -> None:
+        self._session.commit()
+
+
+def seed_database(engine: sa.Engine, data: Dataset) -> None:
+    """Bulk load the dataset; versioned entities start at version 1."""
+
+    with Session(engine) as session:
+        for entity_type, entities in [
+            (User, data.users),
+            (Notification, data.notifications),
+            (WebhookEvent, data.webhooks),
+            (OutboxEvent, data.outbox),
+            (ExercisePlan, data.plans),
+            (ExerciseSession, data.sessions),
+            (ExerciseSetState, data.sets),
+        ]:
+            bulk_load(session, entity_type, entities, chunk_size=SEED_CHUNK)
+            session.commit()
+
+
+def _scenarios(
+    repos: Repositories, data: Dataset, rng: random.Random
+) -> dict[str, Callable[[], object]]:
+    def webhook_lookup() -> object:
+        event = rng.choice(data.webhooks)
+        return repos.webhooks.get_by_provider_and_key("kakao", event.idempotency_key)
+
+    def notification_lookup() -> object:
+        key = rng.choice(data.notifications).idempotency_key
+        return repos.notifications.get_by_idempotency_key(key)
+
+    def notification_list() -> object:
+        return repos.notifications.list(rng.choice(data.users).id)
+
+    def outbox_cycle() -> object:
+        leased = repos.outbox.lease_pending(100)
+        for event in leased:
+            repos.outbox.mark_complete(event.id)
+        repos.commit()
+        return leased
+
+    def plan_load() -> object:
+        plan = repos.plans.get_by_id(rng.choice(data.plans).id)
+        assert plan is not None
+        return [
+            repos.sets.list_pending(session.id)
+            for session in repos.sessions.list_by_plan(plan.id)
+        ]
+
+    return {
+        "webhook_lookup": webhook_lookup,
+        "notification_lookup": notification_lookup,
+        "notification_list": notification_list,
+        "outbox_cycle": outbox_cycle,
+        "plan_load": plan_load,
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class Result:
+    scenario: str
+    backend: str
+    rows: int
+    ops: int
+    mean_us: float
+    p50_us: float
+    p95_us: float
+    ops_per_s: float
+
+
+def measure(
+    scenario: str,
+    backend: str,
+    rows: int,
+    operation: Callable[[], object],
+    *,
+    max_ops: int,
+    max_seconds: float,
+) -> Result:
+    """Time ``operation`` until ``max_ops`` runs or ``max_seconds`` elapse."""
+
+    operation()  # warm statement caches and code paths
+    samples: list[float] = []
+    deadline = time.perf_counter() + max_seconds
+    while len(samples) < max_ops and (
+        len(samples) < 3 or time.perf_counter() < deadline
+    ):
+        started = time.perf_counter()
+        operation()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    total = sum(samples)
+    return Result(
+        scenario=scenario,
+        backend=backend,
+        rows=rows,
+        ops=len(samples),
+        mean_us=total / len(samples) * 1e6,
+        p50_us=samples[len(samples) // 2] * 1e6,
+        p95_us=samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1e6,
+        ops_per_s=len(samples) / total if total else float("inf"),
+    )
+
+
+def run(
+    rows: int,
+    backends: Iterable[str],
+    database_url: str | None,
+    *,
+    max_ops: int,
+    max_seconds: float,
+    seed: int = 0,
+) -> list[Result]:
+    results: list[Result] = []
+    for backend in backends:
+        # Scenarios mutate entities (outbox leases), so each backend gets its own.
+        data = build_dataset(rows)
+        rng = random.Random(seed)
+        if backend == "memory":
+            results += _run_scenarios(
+                MemoryRepositories(data), data, rng, backend, rows, max_ops, max_seconds
+            )
+            continue
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = sa.create_engine(
+                database_url or f"sqlite:///{Path(tmp) / 'bench.db'}"
+            )
+            Base.metadata.drop_all(engine)
+            Base.metadata.create_all(engine)
+            seed_database(engine, data)
+            with Session(engine) as session:
+                results += _run_scenarios(
+                    SqlRepositories(session),
+                    data,
+                    rng,
+                    engine.dialect.name,
+                    rows,
+                    max_ops,
+                    max_seconds,
+                )
+            engine.dispose()
+    return results
+
+
+def _run_scenarios(
+    repos: Repositories,
+    data: Dataset,
+    rng: random.Random,
+    backend: str,
+    rows: int,
+    max_ops: int,
+    max_seconds: float,
+) -> list[Result]:
+    scenarios = _scenarios(repos, data, rng)
+    # Every outbox cycle drains 100 events; stop before the table runs dry.
+    limits = {"outbox_cycle": max(1, len(data.outbox) // 100 - 1)}
+    return [
+        measure(
+            name,
+            backend,
+            rows,
+            scenarios[name],
+            max_ops=min(max_ops, limits.get(name, max_ops)),
+            max_seconds=max_seconds,
+        )
+        for name in SCENARIOS
+    ]
+
+
+def _git_commit() -> str:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def load_history(path: Path) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    return json.loads(path.read_text())
+
+
+def append_history(path: Path, results: list[Result]) -> dict[str, Any]:
+    entry = {
+        "commit": _git_commit(),
+        "recorded_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": [asdict(result) for result in results],
+    }
+    history = load_history(path)
+    history.append(entry)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(history, indent=2) + "\n")
+    return entry
+
+
+def find_baseline(
+    history: list[dict[str, Any]], commit: str | None
+) -> dict[str, Any] | None:
+    """Latest earlier entry whose commit starts with ``commit`` (default: any)."""
+
+    for entry in reversed(history[:-1]):
+        if commit is None or entry["commit"].startswith(commit):
+            return entry
+    return None
+
+
+def compare(baseline: dict[str, Any], results: list[Result]) -> list[str]:
+    """One line per result found in ``baseline``: p50 before, after and ratio."""
+
+    before = {
+        (r["scenario"], r["backend"], r["rows"]): r["p50_us"]
+        for r in baseline["results"]
+    }
+    lines: list[str] = []
+    for result in results:
+        old = before.get((result.scenario, result.backend, result.rows))
+        if old is None:
+            continue
+        lines.append(
+            f"{result.scenario:<20} {result.backend:<10} {result.rows:>9,} "
+            f"{old:>11.1f} {result.p50_us:>11.1f} {result.p50_us / old:>7.2f}x"
+        )
+    return lines
+
+
+def _print_results(results: list[Result]) -> None:
+    print(
+        f"{'scenario':<20} {'backend':<10} {'rows':>9} {'ops':>6} "
+        f"{'p50 us':>11} {'p95 us':>11} {'ops/s':>11}"
+    )
+    for r in results:
+        print(
+            f"{r.scenario:<20} {r.backend:<10} {r.rows:>9,} {r.ops:>6} "
+            f"{r.p50_us:>11.1f} {r.p95_us:>11.1f} {r.ops_per_s:>11,.0f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Repository micro-benchmarks")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000])
+    parser.add_argument(
+        "--backend",
+        nargs="+",
+        choices=["memory", "sqlalchemy"],
+        default=["memory", "sqlalchemy"],
+    )
+    parser.add_argument(
+        "--database-url", default=os.getenv("BENCH_DATABASE_URL") or None
+    )
+    parser.add_argument("--max-ops", type=int, default=1_000)
+    parser.add_argument("--max-seconds", type=float, default=2.0)
+    parser.add_argument("--history", type=Path, default=HISTORY)
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument(
+        "--compare",
+        nargs="?",
+        const="",
+        metavar="COMMIT",
+        help="compare p50 with the latest run of COMMIT (default: previous run)",
+    )
+    args = parser.parse_args(argv)
+
+    results: list[Result] = []
+    for rows in args.rows:
+        results += run(
+            rows,
+            args.backend,
+            args.database_url,
+            max_ops=args.max_ops,
+            max_seconds=args.max_seconds,
+        )
+    _print_results(results)
+
+    if args.no_save:
+        return
+    append_history(args.history, results)
+    print(f"\nappended to {args.history}")
+    if args.compare is not None:
+        baseline = find_baseline(load_history(args.history), args.compare or None)
+        if baseline is None:
+            print("no baseline run found")
+            return
+        print(f"\np50 against {baseline['commit']} ({baseline['recorded_at']}):")
+        print(
+            f"{'scenario':<20} {'backend':<10} {'rows':>9} "
+            f"{'before us':>11} {'after us':>11} {'ratio':>8}"
+        )
+        for line in compare(baseline, results):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare per-event webhook ingestion with ``WebhookService.ingest_batch``.
+
+Each delivery runs in its own unit of work, as one HTTP request would, against
+a fresh SQLite file (or ``--database-url``).
+
+    uv run python benchmarks/webhook_batch.py --events 5000 --batch-size 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import sqlalchemy as sa
+from godlife_backend.adapter.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from godlife_backend.adapter.webapi.dependencies import (
+    get_user_repository,
+    get_webhook_service,
+)
+from godlife_backend.db.base import Base
+from godlife_backend.domain.entities import WebhookEvent
+from sqlalchemy.orm import Session
+
+
+def _events(prefix: str, count: int) -> Iterator[WebhookEvent]:
+    for n in range(count):
+        yield WebhookEvent(
+            provider="kakao",
+            event_type="message",
+            event_id=f"{prefix}-{n}",
+            idempotency_key=f"kakao:message:{prefix}-{n}",
+            raw_payload={"user": {"id": f"kakao-{n % 97}"}, "content": "hello"},
+        )
+
+
+def _deliver(engine: sa.Engine, events: list[WebhookEvent], batch_size: int) -> float:
+    started = time.perf_counter()
+    for start in range(0, len(events), batch_size):
+        with SqlAlchemyUnitOfWork(Session(engine)) as uow:
+            get_webhook_service(uow, get_user_repository(uow)).ingest_batch(
+                events[start : start + batch_size]
+            )
+    return len(events) / (time.perf_counter() - started)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Webhook batch ingestion benchmark")
+    parser.add_argument("--events", type=int, default=5_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--database-url")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{Path(tmp) / 'bench.db'}"
+        engine = sa.create_engine(url)
+        Base.metadata.create_all(engine)
+        single = _deliver(engine, list(_events("single", args.events)), 1)
+        batched = _deliver(engine, list(_events("batch", args.events)), args.batch_size)
+        engine.dispose()
+
+    print(f"per-event : {single:>10,.0f} events/s")
+    print(f"batch {args.batch_size:<4}: {batched:>10,.0f} events/s")
+    print(f"speedup   : {batched / single:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from godlife_backend.adapter.persistence.query_recorder import (
+    QueryBudget,
+    QueryRecording,
+    record_queries,
+)
+
+
+@pytest.fixture
+def query_budget(request: pytest.FixtureRequest) -> Iterator[QueryRecording]:
+    """Record the test's statements and fail it if it breaks its query budget.
+
+    Limits come from ``@pytest.mark.query_budget(...)`` (``QueryBudget`` fields);
+    without the marker the default N+1 and slow-statement checks apply.
+    """
+
+    marker = request.node.get_closest_marker("query_budget")
+    budget = QueryBudget(**marker.kwargs) if marker else QueryBudget()
+    with record_queries(explain=not budget.allow_sequential_scans) as recording:
+        yield recording
+    violations = budget.violations(recording)
+    if violations:
+        pytest.fail("query budget exceeded:\n" + "\n".join(violations))
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, time, timedelta
+from uuid import UUID, uuid4
+
+import pytest
+import sqlalchemy as sa
+from godlife_backend.db import models
+from godlife_backend.db.base import Base
+from godlife_backend.db.enums import ReadingLogStatus
+from sqlalchemy.orm import Session
+
+np = pytest.importorskip("numpy")
+
+from godlife_backend.adapter.persistence.reading_analytics import (  # noqa: E402
+    build_cohort_report,
+    goal_attainment,
+    load_reading_log_columns,
+)
+
+
+@pytest.fixture
+def session() -> Iterator[Session]:
+    engine = sa.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _add_log(
+    session: Session,
+    user_id: UUID,
+    start_at: datetime,
+    minutes: int | None,
+    pages: int | None,
+    plan_id: UUID | None = None,
+) -> None:
+    session.execute(
+        sa.insert(models.ReadingLog).values(
+            id=uuid4(),
+            user_id=user_id,
+            reading_plan_id=plan_id,
+            start_at=start_at,
+            end_at=None if minutes is None else start_at + timedelta(minutes=minutes),
+            pages_read=pages,
+            status=ReadingLogStatus.DONE,
+        )
+    )
+
+
+def test_reading_analytics_loads_columns_and_builds_cohort_report(
+    session: Session,
+) -> None:
+    first, second = uuid4(), uuid4()
+    plan_id = uuid4()
+    session.execute(
+        sa.insert(models.ReadingPlan).values(
+            id=plan_id, user_id=first, remind_time=time(21, 0), goal_minutes=30
+        )
+    )
+    day = datetime(2026, 2, 1, 20, 0, tzinfo=UTC)
+    _add_log(session, first, day, 20, 10, plan_id)
+    _add_log(session, first, day + timedelta(hours=2), 15, 6, plan_id)
+    _add_log(session, first, day + timedelta(days=1), 10, 5, plan_id)
+    _add_log(session, second, day, 40, 40)
+    _add_log(session, second, day + timedelta(days=1), None, 8)
+    _add_log(session, second, day + timedelta(days=30), 60, 60)
+
+    columns = load_reading_log_columns(
+        session,
+        from_date=date(2026, 2, 1),
+        to_date=date(2026, 2, 2),
+        batch_size=2,
+    )
+
+    assert len(columns) == 5
+    assert set(columns.user_ids) == {first, second}
+    np.testing.assert_allclose(
+        np.sort(columns.durations_minutes[~np.isnan(columns.durations_minutes)]),
+        [10.0, 15.0, 20.0, 40.0],
+    )
+    np.testing.assert_allclose(
+        np.sort(columns.pages_per_minute[~np.isnan(columns.pages_per_minute)]),
+        [0.4, 0.5, 0.5, 1.0],
+    )
+
+    attainment = goal_attainment(columns)
+    np.testing.assert_allclose(np.sort(attainment.minutes), [10.0, 35.0])
+    assert attainment.rate_by_user(columns.user_ids) == {first: 0.5}
+
+    report = build_cohort_report(columns, percentiles=(50.0, 100.0))
+    assert (report.users, report.logs) == (2, 5)
+    assert report.total_minutes == pytest.approx(85.0)
+    assert report.total_pages == 69
+    assert (report.goal_days, report.goal_attained_days) == (2, 1)
+    assert report.goal_attainment_rate == 0.5
+    assert report.minutes_percentiles == pytest.approx({50.0: 17.5, 100.0: 40.0})
+
+    only_second = load_reading_log_columns(
+        session,
+        from_date=date(2026, 2, 1),
+        to_date=date(2026, 3, 31),
+        user_ids=[second],
+    )
+    assert only_second.user_ids == (second,)
+    assert len(only_second) == 3
+
+
+def test_reading_analytics_handles_empty_range(session: Session) -> None:
+    columns = load_reading_log_columns(
+        session, from_date=date(2026, 1, 1), to_date=date(2026, 1, 31)
+    )
+
+    report = build_cohort_report(columns)
+    assert (report.users, report.logs, report.goal_days) == (0, 0, 0)
+    assert report.minutes_percentiles == {}
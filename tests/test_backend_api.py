@@ -0,0 +1,462 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import threading
+from datetime import UTC, date, datetime
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+import sqlalchemy as sa
+from fastapi.testclient import TestClient
+from godlife_backend.adapter.persistence import session as session_module
+from godlife_backend.adapter.persistence.query_stats import (
+    QueryStats,
+    instrument_engine,
+)
+from godlife_backend.adapter.test_doubles import (
+    InMemoryOutboxEventRepository,
+    InMemoryUserDailyStatsRepository,
+    InMemoryUserRepository,
+    InMemoryWebhookEventRepository,
+)
+from godlife_backend.adapter.webapi import json_codec
+from godlife_backend.adapter.webapi.app import create_app
+from godlife_backend.adapter.webapi.dependencies import (
+    get_activity_summary_service,
+    get_webhook_service,
+)
+from godlife_backend.adapter.webapi.metrics import MetricsRegistry
+from godlife_backend.adapter.webapi.routers.webhooks import MAX_BATCH_BYTES
+from godlife_backend.application.services.activity_summary_service import (
+    ActivitySeriesCache,
+    ActivitySummaryService,
+)
+from godlife_backend.application.services.webhook_service import WebhookService
+from godlife_backend.db.base import Base
+from godlife_backend.domain.entities import (
+    Notification,
+    NotificationStatus,
+    User,
+    WebhookEvent,
+)
+from godlife_backend.domain.payload import JsonPayload
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+
+
+def test_user_summary_endpoint_reports_streak_and_weekly_totals() -> None:
+    stats = InMemoryUserDailyStatsRepository()
+    user_id = uuid4()
+    today = date(2026, 3, 31)
+    stats.increment(user_id, date(2026, 3, 30), {"sets_done": 2, "volume_kg": 120.0})
+    stats.increment(user_id, today, {"reading_minutes": 20.0, "pages_read": 9})
+    users = InMemoryUserRepository()
+    users.save(User(id=user_id, timezone="Asia/Seoul"))
+    service = ActivitySummaryService(
+        stats,
+        users,
+        ActivitySeriesCache(max_entries=4, ttl_seconds=60.0),
+        # 00:30 on March 31st in Seoul, still March 30th in UTC.
+        clock=lambda: datetime(2026, 3, 30, 15, 30, tzinfo=UTC),
+    )
+    app = create_app()
+    app.dependency_overrides[get_activity_summary_service] = lambda: service
+
+    response = TestClient(app).get(f"/users/{user_id}/summary")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["as_of"] == "2026-03-31"
+    assert body["current_streak_days"] == 2
+    assert body["weekly_sets_done"] == 2
+    assert body["weekly_volume_kg"] == 120.0
+    assert body["monthly_reading_minutes"] == 20.0
+
+
+class _CountingSession(Session):
+    created = 0
+
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        type(self).created += 1
+        super().__init__(*args, **kwargs)  # type: ignore[arg-type]
+
+
+def test_rejected_webhook_never_checks_out_a_connection(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = sa.create_engine("sqlite://")
+    checkouts: list[object] = []
+    event.listen(engine, "checkout", lambda *args: checkouts.append(args))
+    monkeypatch.setitem(
+        session_module._SESSION_FACTORIES,
+        "default",
+        sessionmaker(bind=engine, class_=_CountingSession),
+    )
+
+    response = TestClient(create_app()).post(
+        "/webhooks/kakao", json={"provider": "stripe", "event_type": "message"}
+    )
+
+    assert response.status_code == 400
+    assert checkouts == []
+    assert _CountingSession.created == 0
+    engine.dispose()
+
+
+class _RecordingWebhookService(WebhookService):
+    def __init__(self) -> None:
+        super().__init__(
+            InMemoryWebhookEventRepository(), InMemoryOutboxEventRepository()
+        )
+        self.handled: list[WebhookEvent] = []
+
+    def handle_event(self, event: WebhookEvent) -> WebhookEvent:
+        self.handled.append(event)
+        return event
+
+
+def test_webhook_body_is_decoded_once_with_nested_raw_payload() -> None:
+    service = _RecordingWebhookService()
+    app = create_app()
+    app.dependency_overrides[get_webhook_service] = lambda: service
+    raw_payload = {"user": {"id": "k-1", "tags": [1, 2, {"deep": None}]}}
+
+    response = TestClient(app).post(
+        "/webhooks/kakao",
+        json={
+            "provider": "kakao",
+            "event_type": "message",
+            "event_id": "evt-1",
+            "raw_payload": raw_payload,
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"result": "accepted"}
+    [event] = service.handled
+    assert event.raw_payload == raw_payload
+    assert event.idempotency_key == "kakao:message:evt-1"
+
+
+@pytest.mark.parametrize(
+    ("content", "loc"),
+    [
+        (b"{not json", ["body"]),
+        (b'{"provider": "kakao"}', ["body", "event_type"]),
+    ],
+)
+def test_invalid_webhook_body_is_a_422(
+    codec_backend: str, content: bytes, loc: list[str]
+) -> None:
+    response = TestClient(create_app()).post(
+        "/webhooks/kakao",
+        content=content,
+        headers={"content-type": "application/json"},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == loc
+
+
+def test_webhook_body_schema_is_still_published() -> None:
+    schema = create_app().openapi()
+
+    operation = schema["paths"]["/webhooks/{provider}"]["post"]
+    body_schema = operation["requestBody"]["content"]["application/json"]["schema"]
+    assert set(body_schema["required"]) == {"provider", "event_type"}
+
+
+@pytest.fixture(params=["orjson", "pydantic"])
+def codec_backend(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> str:
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(json_codec, "orjson", None)
+    return request.param
+
+
+def test_dumps_encodes_domain_dataclasses_directly(codec_backend: str) -> None:
+    notification = Notification(
+        kind="reminder",
+        status=NotificationStatus.SENT,
+        payload={"minutes": 20, "tags": ["a"]},
+    )
+
+    decoded = json_codec.loads(json_codec.dumps(notification))
+
+    assert decoded["id"] == str(notification.id)
+    assert decoded["status"] == NotificationStatus.SENT.value
+    assert decoded["payload"] == {"minutes": 20, "tags": ["a"]}
+    assert json_codec.loads(json_codec.FastJSONResponse([notification.id]).body) == [
+        str(notification.id)
+    ]
+
+    stored = JsonPayload.from_json(b'{"minutes":20,"tags":["a"]}')
+    decoded = json_codec.loads(json_codec.dumps(Notification(payload=stored)))
+    assert decoded["payload"] == {"minutes": 20, "tags": ["a"]}
+    if codec_backend == "orjson":
+        assert not stored.is_decoded
+
+
+def _batch_app() -> tuple[TestClient, InMemoryOutboxEventRepository]:
+    outbox = InMemoryOutboxEventRepository()
+    service = WebhookService(InMemoryWebhookEventRepository(), outbox)
+    app = create_app()
+    app.dependency_overrides[get_webhook_service] = lambda: service
+    return TestClient(app), outbox
+
+
+def test_webhook_batch_reports_per_item_results() -> None:
+    client, outbox = _batch_app()
+    items = [
+        {"provider": "kakao", "event_type": "message", "event_id": "e1"},
+        {"provider": "kakao", "event_type": "message", "event_id": "e1"},
+        {"provider": "stripe", "event_type": "payment", "event_id": "e2"},
+        {"provider": "kakao", "event_type": "message", "event_id": "e3"},
+    ]
+
+    response = client.post("/webhooks/kakao/batch", json=items)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["accepted"], body["duplicates"], body["rejected"]) == (2, 1, 1)
+    assert [item["status"] for item in body["results"]] == [
+        "accepted",
+        "duplicate",
+        "rejected",
+        "accepted",
+    ]
+    assert body["results"][1]["id"] is None
+    assert len(outbox.lease_pending()) == 2
+
+    replay = client.post("/webhooks/kakao/batch", json=items[:1])
+    assert replay.json()["results"][0]["status"] == "duplicate"
+
+
+def test_webhook_batch_accepts_ndjson(codec_backend: str) -> None:
+    client, _ = _batch_app()
+    lines = [
+        json_codec.dumps({"provider": "kakao", "event_type": "m", "event_id": str(n)})
+        for n in range(3)
+    ]
+
+    response = client.post(
+        "/webhooks/kakao/batch",
+        content=b"\n".join(lines) + b"\n\n",
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.json()["accepted"] == 3
+
+    broken = client.post(
+        "/webhooks/kakao/batch",
+        content=lines[0] + b"\n{oops\n",
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert broken.status_code == 200
+    body = broken.json()
+    assert (body["accepted"], body["duplicates"], body["rejected"]) == (0, 1, 1)
+    assert body["results"][1]["status"] == "rejected"
+    assert "JSON" in body["results"][1]["detail"]
+
+
+def test_webhook_batch_rejects_invalid_items_individually() -> None:
+    client, outbox = _batch_app()
+    items = [
+        {"provider": "kakao", "event_type": "message", "event_id": "e1"},
+        {"provider": "kakao", "event_id": "e2"},
+        {"provider": "kakao", "event_type": "message", "user_id": "not-a-uuid"},
+        "not an object",
+    ]
+
+    response = client.post("/webhooks/kakao/batch", json=items)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["accepted"], body["rejected"]) == (1, 3)
+    details = [item["detail"] for item in body["results"][1:]]
+    assert details[0] == "event_type: Field required"
+    assert details[1].startswith("user_id: Input should be a valid UUID")
+    assert details[2].startswith("Input should be a valid dictionary")
+    assert len(outbox.lease_pending()) == 1
+
+    not_a_list = client.post("/webhooks/kakao/batch", json={"provider": "kakao"})
+    assert not_a_list.status_code == 422
+
+
+def test_webhook_batch_rejects_oversized_batches() -> None:
+    client, outbox = _batch_app()
+    item = {"provider": "kakao", "event_type": "message"}
+
+    response = client.post("/webhooks/kakao/batch", json=[item] * 1001)
+
+    assert response.status_code == 413
+    assert outbox.lease_pending() == []
+
+    # Counted before validation: invalid lines do not get per-item results.
+    lines = client.post(
+        "/webhooks/kakao/batch",
+        content=b"{}\n" * 1001,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert lines.status_code == 413
+
+    oversized = client.post(
+        "/webhooks/kakao/batch",
+        content=b" " * (MAX_BATCH_BYTES + 1),
+        headers={"content-type": "application/json"},
+    )
+    assert oversized.status_code == 413
+    assert oversized.json()["detail"].endswith("bytes")
+
+
+def test_metrics_report_latency_and_db_statements_per_route(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    engine = instrument_engine(sa.create_engine(f"sqlite:///{tmp_path / 'm.db'}"))
+    Base.metadata.create_all(engine)
+    monkeypatch.setitem(
+        session_module._SESSION_FACTORIES, "default", sessionmaker(bind=engine)
+    )
+    monkeypatch.setenv("GODLIFE_SERVER_TIMING", "true")
+    client = TestClient(create_app())
+    items = [
+        {"provider": "kakao", "event_type": "message", "event_id": str(n)}
+        for n in range(3)
+    ]
+
+    response = client.post("/webhooks/kakao/batch", json=items)
+    client.get("/no/such/path")
+    metrics = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert metrics.headers["content-type"].startswith("text/plain; version=0.0.4")
+    labels = 'method="POST",route="/webhooks/{provider}/batch",status="200"'
+    lines = metrics.text.splitlines()
+    assert f"godlife_http_request_duration_seconds_count{{{labels}}} 1" in lines
+    [statements] = [
+        line
+        for line in lines
+        if line.startswith(f"godlife_db_statements_per_request_sum{{{labels}}}")
+    ]
+    assert float(statements.rsplit(" ", 1)[1]) >= 2
+    assert any('route="<unmatched>",status="404"' in line for line in lines)
+    engine.dispose()
+
+
+def test_metrics_sum_every_worker_snapshot_in_the_shared_directory(
+    tmp_path: Path,
+) -> None:
+    # Two registries stand in for two prefork workers.
+    first = MetricsRegistry(tmp_path)
+    second = MetricsRegistry(tmp_path)
+    count = 'godlife_http_request_duration_seconds_count{method="GET",route="/x"'
+
+    def observe(registry: MetricsRegistry) -> None:
+        registry.observe_request(
+            method="GET", route="/x", status=200, seconds=0.01, queries=QueryStats()
+        )
+
+    for registry in (first, first, second):
+        observe(registry)
+    assert f'{count},status="200"}} 2' in first.render().splitlines()
+
+    second.flush()
+    assert f'{count},status="200"}} 3' in first.render().splitlines()
+    assert f'{count},status="200"}} 3' in second.render().splitlines()
+
+    observe(second)
+    stop = threading.Event()
+    stop.set()
+    second.publish(stop)  # a worker shutting down flushes once more
+    del second
+    assert f'{count},status="200"}} 4' in first.render().splitlines()
+
+
+def _exited_pid() -> int:
+    child = subprocess.run(
+        [sys.executable, "-c", "import os; print(os.getpid())"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return int(child.stdout)
+
+
+def test_metrics_fold_snapshots_of_exited_workers_into_one_file(
+    tmp_path: Path,
+) -> None:
+    count = (
+        'godlife_http_request_duration_seconds_count{method="GET",route="/x",'
+        'status="200"} '
+    )
+
+    def exited_worker(requests: int) -> Path:
+        registry = MetricsRegistry(tmp_path)
+        for _ in range(requests):
+            registry.observe_request(
+                method="GET", route="/x", status=200, seconds=0.01, queries=QueryStats()
+            )
+        before = set(tmp_path.glob("*.json"))
+        registry.flush()
+        [snapshot] = set(tmp_path.glob("*.json")) - before
+        # Re-stamp the snapshot with the pid of a process that has exited.
+        suffix = snapshot.name.split("-", 1)[1]
+        return snapshot.rename(tmp_path / f"{_exited_pid()}-{suffix}")
+
+    live = MetricsRegistry(tmp_path)
+    exited_worker(2)
+    exited_worker(3)
+    assert f"{count}5" in live.render().splitlines()
+    remaining = {path.name for path in tmp_path.glob("*.json")}
+    assert "aggregate.json" in remaining and len(remaining) == 2
+    aggregate = json.loads((tmp_path / "aggregate.json").read_text())
+    assert len(aggregate["folded"]) == 2
+
+    # A fold interrupted before deleting its inputs does not count them twice.
+    leftover = exited_worker(4)
+    contents = leftover.read_bytes()
+    assert f"{count}9" in live.render().splitlines()
+    leftover.write_bytes(contents)
+    assert f"{count}9" in live.render().splitlines()
+    assert not leftover.exists()
+
+
+def test_metrics_can_be_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GODLIFE_METRICS", "false")
+    client = TestClient(create_app())
+
+    assert client.get("/metrics").status_code == 404
+    assert "server-timing" not in client.get("/healthz").headers
+
+
+def test_query_audit_logs_budget_violations_per_route(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    Base.metadata.create_all(engine)
+    monkeypatch.setitem(
+        session_module._SESSION_FACTORIES, "default", sessionmaker(bind=engine)
+    )
+    monkeypatch.setenv("GODLIFE_QUERY_AUDIT", "true")
+    monkeypatch.setenv("GODLIFE_SLOW_QUERY_MS", "-1")
+    client = TestClient(create_app())
+
+    with caplog.at_level("WARNING", logger="godlife_backend.adapter.webapi"):
+        response = client.post(
+            "/webhooks/kakao/batch",
+            json=[{"provider": "kakao", "event_type": "message", "event_id": "1"}],
+        )
+
+    assert response.status_code == 200
+    assert caplog.messages
+    assert all(
+        message.startswith("POST /webhooks/{provider}/batch: slow:")
+        for message in caplog.messages
+    )
+    engine.dispose()
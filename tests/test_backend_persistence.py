@@ -0,0 +1,1212 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import Any, cast
+from uuid import UUID, uuid4
+
+import pytest
+import sqlalchemy as sa
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from godlife_backend.adapter.persistence import query_recorder
+from godlife_backend.adapter.persistence import session as session_module
+from godlife_backend.adapter.persistence.archive import (
+    archive_partition,
+    archive_table,
+    read_archive,
+    write_chunk,
+)
+from godlife_backend.adapter.persistence.bulk_loader import bulk_load
+from godlife_backend.adapter.persistence.daily_stats_backfill import (
+    backfill_user_daily_stats,
+)
+from godlife_backend.adapter.persistence.partitions import (
+    add_months,
+    create_default_partition_sql,
+    create_partition_sql,
+    partition_month,
+    run_maintenance,
+)
+from godlife_backend.adapter.persistence.query_recorder import (
+    QueryBudget,
+    QueryRecording,
+    record_queries,
+)
+from godlife_backend.adapter.persistence.repositories.sqlalchemy_repositories import (
+    SqlAlchemyBufferedOutboxEventRepository,
+    SqlAlchemyExercisePlanRepository,
+    SqlAlchemyExerciseSessionRepository,
+    SqlAlchemyExerciseSetStateRepository,
+    SqlAlchemyNotificationRepository,
+    SqlAlchemyOutboxEventRepository,
+    SqlAlchemyReadingLogRepository,
+    SqlAlchemyUserDailyStatsRepository,
+    SqlAlchemyUserProfileRepository,
+    SqlAlchemyUserRepository,
+    SqlAlchemyWebhookEventRepository,
+)
+from godlife_backend.adapter.persistence.session import ReplicaPool, lazy_session
+from godlife_backend.adapter.persistence.unit_of_work import (
+    SqlAlchemyUnitOfWork,
+    get_unit_of_work,
+)
+from godlife_backend.adapter.webapi.dependencies import (
+    get_notification_service,
+    get_plan_service,
+    get_user_repository,
+    get_webhook_service,
+)
+from godlife_backend.adapter.worker import run_once
+from godlife_backend.application.services.outbox_broadcast import OutboxBroadcast
+from godlife_backend.application.services.outbox_dispatcher import OutboxDispatcher
+from godlife_backend.application.services.webhook_service import (
+    WebhookIngestStatus,
+)
+from godlife_backend.db import models, online_migrations
+from godlife_backend.db.base import Base
+from godlife_backend.db.enums import (
+    NotificationStatus,
+    OutboxStatus,
+    PlanStatus,
+    SetStatus,
+)
+from godlife_backend.domain.entities import (
+    ExercisePlan,
+    ExerciseSession,
+    ExerciseSetState,
+    Notification,
+    OutboxEvent,
+    ReadingLog,
+    User,
+    UserProfile,
+    WebhookEvent,
+)
+from godlife_backend.domain.errors import ConcurrencyConflictError
+from godlife_backend.domain.events import READING_LOG_RECORDED, USER_CHANGED
+from godlife_backend.domain.payload import JsonPayload
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+
+@pytest.fixture
+def session() -> Iterator[Session]:
+    engine = sa.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_sqlalchemy_plan_repository_compare_and_swap(session: Session) -> None:
+    repository = SqlAlchemyExercisePlanRepository(session)
+    user_id = uuid4()
+    plan = repository.save(ExercisePlan(user_id=user_id, target_date=date(2026, 1, 1)))
+    assert plan.version == 1
+
+    first = repository.get_by_id(plan.id)
+    second = repository.get_by_id(plan.id)
+    assert first is not None and second is not None
+    first.status = PlanStatus.ACTIVE
+    repository.save(first)
+
+    second.status = PlanStatus.CANCELED
+    with pytest.raises(ConcurrencyConflictError) as conflict:
+        repository.save(second)
+    assert conflict.value.expected_version == 1
+
+    active = repository.get_active_by_user_and_date(user_id, date(2026, 1, 1))
+    assert active is not None
+    assert active.version == 2
+    assert [
+        p.id for p in repository.list_by_user(user_id, status=PlanStatus.ACTIVE)
+    ] == [plan.id]
+
+
+def test_sqlalchemy_set_state_repository_versions_and_pending(
+    session: Session,
+) -> None:
+    repository = SqlAlchemyExerciseSetStateRepository(session)
+    session_id = uuid4()
+    repository.save(ExerciseSetState(session_id=session_id, set_no=2))
+    done = repository.save(
+        ExerciseSetState(session_id=session_id, set_no=1, status=SetStatus.DONE)
+    )
+
+    assert [state.set_no for state in repository.list_pending(session_id)] == [2]
+
+    done.performed_reps = 10
+    repository.save(done)
+    stored = repository.get(session_id, 1)
+    assert stored is not None
+    assert (stored.performed_reps, stored.version) == (10, 2)
+
+    with pytest.raises(ConcurrencyConflictError):
+        repository.save(ExerciseSetState(id=done.id, session_id=session_id, version=1))
+
+
+def test_sqlalchemy_counters_increment_in_place_and_bump_plan_version(
+    session: Session,
+) -> None:
+    plans = SqlAlchemyExercisePlanRepository(session)
+    sessions = SqlAlchemyExerciseSessionRepository(session)
+    plan = plans.save(ExercisePlan(status=PlanStatus.ACTIVE, pending_sets=2))
+    exercise = sessions.save(
+        ExerciseSession(plan_id=plan.id, exercise_name="squat", pending_sets=2)
+    )
+
+    stale = plans.get_by_id(plan.id)
+    deltas = {"pending_sets": -1, "done_sets": 1}
+    plans.increment_set_counters(plan.id, deltas)
+    sessions.increment_set_counters(exercise.id, deltas)
+    exercise.notes = "keep counters"
+    sessions.save(exercise)
+
+    stored_session = sessions.list_by_plan(plan.id)[0]
+    assert (stored_session.pending_sets, stored_session.done_sets) == (1, 1)
+    assert stored_session.notes == "keep counters"
+    stored_plan = plans.get_by_id(plan.id)
+    assert stored_plan is not None
+    assert (stored_plan.pending_sets, stored_plan.done_sets) == (1, 1)
+    assert stored_plan.version == 2
+
+    assert stale is not None
+    stale.status = PlanStatus.DONE
+    with pytest.raises(ConcurrencyConflictError):
+        plans.save(stale)
+
+
+def test_sqlalchemy_set_insert_counts_new_sets_on_session_and_plan(
+    session: Session,
+) -> None:
+    plans = SqlAlchemyExercisePlanRepository(session)
+    sessions = SqlAlchemyExerciseSessionRepository(session)
+    set_states = SqlAlchemyExerciseSetStateRepository(session)
+    plan = plans.save(ExercisePlan(status=PlanStatus.ACTIVE))
+    exercise = sessions.save(ExerciseSession(plan_id=plan.id, exercise_name="squat"))
+    stale = plans.get_by_id(plan.id)
+
+    for set_no in (1, 2):
+        set_states.save(ExerciseSetState(session_id=exercise.id, set_no=set_no))
+    set_states.save(
+        ExerciseSetState(session_id=exercise.id, set_no=3, status=SetStatus.DONE)
+    )
+
+    stored_session = sessions.get_by_id(exercise.id)
+    assert stored_session is not None
+    assert (stored_session.pending_sets, stored_session.done_sets) == (2, 1)
+    stored_plan = plans.get_by_id(plan.id)
+    assert stored_plan is not None
+    assert (stored_plan.pending_sets, stored_plan.done_sets) == (2, 1)
+    assert stored_plan.version == 4
+
+    assert stale is not None
+    stale.status = PlanStatus.DONE
+    with pytest.raises(ConcurrencyConflictError):
+        plans.save(stale)
+
+
+def test_sqlalchemy_daily_stats_increment_upserts(session: Session) -> None:
+    repository = SqlAlchemyUserDailyStatsRepository(session)
+    user_id = uuid4()
+
+    repository.increment(user_id, date(2026, 1, 1), {"sets_done": 1, "volume_kg": 50})
+    row = repository.increment(
+        user_id, date(2026, 1, 1), {"sets_done": 2, "reading_minutes": 15.5}
+    )
+    repository.set_streak(user_id, date(2026, 1, 1), 3)
+
+    assert (row.sets_done, row.volume_kg, row.reading_minutes) == (3, 50.0, 15.5)
+    stored = repository.get(user_id, date(2026, 1, 1))
+    assert stored is not None and stored.streak_days == 3
+    assert repository.list_range(user_id, date(2026, 1, 1), date(2026, 1, 7)) == [
+        stored
+    ]
+
+
+def test_sqlalchemy_outbox_lease_claims_pending_rows_once(session: Session) -> None:
+    repository = SqlAlchemyOutboxEventRepository(session)
+    first = repository.save(OutboxEvent(event_type="a", payload={"k": "v"}))
+    repository.save(OutboxEvent(event_type="b"))
+
+    leased = repository.lease_pending(limit=10)
+
+    assert {event.event_type for event in leased} == {"a", "b"}
+    assert all(event.status == OutboxStatus.IN_FLIGHT for event in leased)
+    assert repository.lease_pending(limit=10) == []
+    failed = repository.mark_failed(first.id, "boom")
+    assert failed is not None
+    assert failed.payload == {"k": "v", "failure_reason": "boom"}
+    assert failed.status == OutboxStatus.FAILED
+
+
+def test_daily_stats_backfill_recomputes_in_parallel_chunks(tmp_path: Path) -> None:
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'backfill.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    users = [User(kakao_user_id=f"kakao-{n}", name=f"user-{n}") for n in range(5)]
+    with factory() as session, session.begin():
+        for user in users:
+            session.add(
+                models.User(id=user.id, kakao_user_id=user.kakao_user_id, name="n")
+            )
+        plans = SqlAlchemyExercisePlanRepository(session)
+        sessions = SqlAlchemyExerciseSessionRepository(session)
+        set_states = SqlAlchemyExerciseSetStateRepository(session)
+        logs = SqlAlchemyReadingLogRepository(session)
+        for offset, user in enumerate(users):
+            for day in (1, 2, 4):
+                plan = plans.save(
+                    ExercisePlan(user_id=user.id, target_date=date(2026, 1, day))
+                )
+                exercise = sessions.save(
+                    ExerciseSession(plan_id=plan.id, exercise_name="row")
+                )
+                set_states.save(
+                    ExerciseSetState(
+                        session_id=exercise.id,
+                        set_no=1,
+                        status=SetStatus.DONE,
+                        performed_reps=10,
+                        performed_weight_kg=20.0 + offset,
+                    )
+                )
+            # 06:00 on January 3rd in the users' default Asia/Seoul zone.
+            logs.save(
+                ReadingLog(
+                    user_id=user.id,
+                    start_at=datetime(2026, 1, 2, 21, 0, tzinfo=UTC),
+                    end_at=datetime(2026, 1, 2, 21, 30, tzinfo=UTC),
+                    pages_read=10,
+                )
+            )
+
+    written = backfill_user_daily_stats(factory, chunk_size=2, workers=2)
+
+    assert written == 20
+    with factory() as session:
+        stats = SqlAlchemyUserDailyStatsRepository(session)
+        rows = stats.list_range(users[1].id, date(2026, 1, 1), date(2026, 1, 4))
+    assert [row.streak_days for row in rows] == [1, 2, 3, 4]
+    assert rows[0].volume_kg == 210.0
+    assert (rows[2].reading_minutes, rows[2].pages_read) == (30.0, 10)
+    engine.dispose()
+
+
+def test_bulk_load_streams_entities_in_chunks(session: Session) -> None:
+    users = [User(kakao_user_id=f"k{n}") for n in range(5)]
+    plan = ExercisePlan(user_id=users[0].id, target_date=date(2026, 1, 1))
+    exercise = ExerciseSession(plan_id=plan.id, exercise_name="squat", target_sets=3)
+    sets = [ExerciseSetState(session_id=exercise.id, set_no=n) for n in range(1, 4)]
+    sets[2].status = SetStatus.DONE
+    statements: list[str] = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    assert bulk_load(session, User, iter(users), chunk_size=2) == 5
+    assert bulk_load(session, ExercisePlan, [plan]) == 1
+    assert bulk_load(session, ExerciseSession, [exercise]) == 1
+    assert bulk_load(session, ExerciseSetState, sets) == 3
+    assert (
+        bulk_load(
+            session,
+            Notification,
+            (
+                Notification(
+                    user_id=user.id, kind="reminder", idempotency_key=user.kakao_user_id
+                )
+                for user in users
+            ),
+        )
+        == 5
+    )
+    session.commit()
+
+    assert len([s for s in statements if s.startswith("INSERT INTO users")]) == 3
+    assert plan.version == 1 and all(state.version == 1 for state in sets)
+    loaded = SqlAlchemyExerciseSetStateRepository(session).list_pending(exercise.id)
+    assert [(state.set_no, state.version) for state in loaded] == [(1, 1), (2, 1)]
+    # Loaded sets are counted on their session and plan, as ``save`` would.
+    [stored_session] = SqlAlchemyExerciseSessionRepository(session).list_by_plan(
+        plan.id
+    )
+    stored_plan = SqlAlchemyExercisePlanRepository(session).get_by_id(plan.id)
+    assert stored_plan is not None
+    for stored in (stored_session, stored_plan):
+        assert (stored.pending_sets, stored.done_sets) == (2, 1)
+    assert stored_plan.version == 2
+    found = SqlAlchemyNotificationRepository(session).get_by_idempotency_key("k3")
+    assert found is not None and found.status == NotificationStatus.SCHEDULED
+
+
+def test_bulk_loaded_webhook_events_claim_their_idempotency_keys(
+    session: Session,
+) -> None:
+    events = [
+        WebhookEvent(
+            provider="kakao",
+            event_type="message",
+            event_id=f"e{n}",
+            idempotency_key=f"kakao:message:e{n}",
+        )
+        for n in range(3)
+    ]
+
+    assert bulk_load(session, WebhookEvent, iter(events), chunk_size=2) == 3
+    session.commit()
+
+    webhooks = SqlAlchemyWebhookEventRepository(session)
+    redelivered = WebhookEvent(
+        provider="kakao",
+        event_type="message",
+        event_id="e1",
+        idempotency_key="kakao:message:e1",
+    )
+    assert webhooks.insert_new([redelivered]) == set()
+    found = webhooks.get_by_provider_and_event_id("kakao", "e1")
+    assert found is not None and found.id == events[1].id
+    with pytest.raises(IntegrityError):
+        bulk_load(session, WebhookEvent, [redelivered])
+    session.rollback()
+
+
+def test_sqlalchemy_user_and_profile_repositories_round_trip(session: Session) -> None:
+    users = SqlAlchemyUserRepository(session)
+    profiles = SqlAlchemyUserProfileRepository(session)
+    user = users.save(User(kakao_user_id="kakao-1", name="tester"))
+    profiles.save(UserProfile(user_id=user.id, max_daily_minutes=40))
+
+    found = users.get_by_kakao_user_id("kakao-1")
+    assert found is not None and found.id == user.id
+    found.timezone = "UTC"
+    users.save(found)
+    reloaded = users.get_by_id(user.id)
+    assert reloaded is not None and reloaded.timezone == "UTC"
+    assert users.get_by_kakao_user_id("missing") is None
+
+    profile = profiles.get_by_user_id(user.id)
+    assert profile is not None and profile.max_daily_minutes == 40
+
+
+def test_sqlalchemy_notification_repository_round_trip_and_listing(
+    session: Session,
+) -> None:
+    user = SqlAlchemyUserRepository(session).save(User(kakao_user_id="k", name="u"))
+    notifications = SqlAlchemyNotificationRepository(session)
+    for day, status in [
+        (1, NotificationStatus.SCHEDULED),
+        (2, NotificationStatus.SENT),
+        (3, NotificationStatus.SCHEDULED),
+    ]:
+        notifications.save(
+            Notification(
+                user_id=user.id,
+                kind="reminder",
+                status=status,
+                schedule_at=datetime(2026, 1, day, 9, 0, tzinfo=UTC),
+                idempotency_key=f"reminder-{day}",
+                payload={"day": day},
+            )
+        )
+
+    found = notifications.get_by_idempotency_key("reminder-2")
+    assert found is not None and found.payload == {"day": 2}
+    found.status = NotificationStatus.FAILED
+    notifications.save(found)
+    reloaded = notifications.get_by_id(found.id)
+    assert reloaded is not None and reloaded.status == NotificationStatus.FAILED
+    assert notifications.get_by_idempotency_key("missing") is None
+
+    listed = notifications.list(user.id)
+    assert [n.idempotency_key for n in listed] == [
+        "reminder-3",
+        "reminder-2",
+        "reminder-1",
+    ]
+    scheduled = notifications.list(
+        user.id,
+        status=NotificationStatus.SCHEDULED,
+        from_at=date(2026, 1, 2),
+        to_at=date(2026, 1, 3),
+    )
+    assert [n.idempotency_key for n in scheduled] == ["reminder-3"]
+
+
+def test_sqlalchemy_payloads_load_lazily_and_write_back_unchanged(
+    session: Session,
+) -> None:
+    user = SqlAlchemyUserRepository(session).save(User(kakao_user_id="k"))
+    notifications = SqlAlchemyNotificationRepository(session)
+    notifications.save(
+        Notification(
+            user_id=user.id,
+            kind="reminder",
+            idempotency_key="n-1",
+            payload={"book": {"title": "t", "pages": list(range(50))}},
+        )
+    )
+    session.commit()
+
+    loaded = notifications.get_by_idempotency_key("n-1")
+    assert loaded is not None and isinstance(loaded.payload, JsonPayload)
+    stored = loaded.payload.stored_json
+    assert stored is not None and not loaded.payload.is_decoded
+    bound: list[object] = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda *args: bound.extend(args[3]),
+    )
+    loaded.status = NotificationStatus.SENT
+    notifications.save(loaded)
+
+    assert stored.decode() in bound
+    assert not loaded.payload.is_decoded
+    reloaded = notifications.get_by_id(loaded.id)
+    assert reloaded is not None and reloaded.payload["book"] == {
+        "title": "t",
+        "pages": list(range(50)),
+    }
+
+
+def test_sqlalchemy_user_repository_batch_maps_kakao_ids(session: Session) -> None:
+    users = SqlAlchemyUserRepository(session)
+    saved = [users.save(User(kakao_user_id=f"kakao-{n}", name="u")) for n in range(5)]
+
+    assert users.map_kakao_user_ids(["kakao-1", "kakao-3", "missing"]) == {
+        "kakao-1": saved[1].id,
+        "kakao-3": saved[3].id,
+    }
+    assert users.map_kakao_user_ids([]) == {}
+    assert dict(users.iter_kakao_user_ids(batch_size=2)) == {
+        user.kakao_user_id: user.id for user in saved
+    }
+
+
+_WEBHOOK_EVENTS = cast(sa.Table, models.WebhookEvent.__table__)
+_OUTBOX_COUNT = sa.select(sa.func.count()).select_from(models.OutboxEvent)
+
+
+def test_unit_of_work_shares_repositories_and_flushes_outbox_once(
+    session: Session,
+) -> None:
+    uow = SqlAlchemyUnitOfWork(session)
+    assert uow.plans is uow.plans
+    plan_service = get_plan_service(uow)
+    notification_service = get_notification_service(uow)
+    assert plan_service.repositories[3] is notification_service.repositories[1]
+
+    inserts: list[str] = []
+
+    def _record(
+        conn: sa.Connection,
+        cursor: object,
+        statement: str,
+        parameters: object,
+        context: object,
+        executemany: bool,
+    ) -> None:
+        if statement.lstrip().upper().startswith("INSERT INTO OUTBOX_EVENTS"):
+            inserts.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        for n in range(3):
+            uow.outbox.save(OutboxEvent(event_type="demo", payload={"n": n}))
+        assert session.scalar(_OUTBOX_COUNT) == 0
+        uow.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert len(inserts) == 1
+    assert session.scalar(_OUTBOX_COUNT) == 3
+
+    uow.outbox.save(OutboxEvent(event_type="demo"))
+    uow.rollback()
+    uow.flush()
+    assert session.scalar(_OUTBOX_COUNT) == 3
+
+
+def test_buffered_outbox_flushes_before_leasing(session: Session) -> None:
+    outbox = SqlAlchemyBufferedOutboxEventRepository(session)
+    event = outbox.save(OutboxEvent(event_type="demo"))
+
+    leased = outbox.lease_pending()
+    assert [row.id for row in leased] == [event.id]
+
+    event.retry_count = 2
+    outbox.save(event)
+    assert outbox.flush() == 1
+    completed = outbox.mark_complete(event.id)
+    assert completed is not None and completed.retry_count == 2
+
+
+def test_lazy_session_defers_checkout_until_first_statement() -> None:
+    engine = sa.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    checkouts: list[object] = []
+    event.listen(engine, "checkout", lambda *args: checkouts.append(args))
+    created: list[Session] = []
+
+    def _factory() -> Session:
+        created.append(Session(engine))
+        return created[-1]
+
+    with SqlAlchemyUnitOfWork(lazy_session(_factory)) as uow:
+        get_plan_service(uow)
+        get_notification_service(uow)
+    assert (created, checkouts) == ([], [])
+
+    with SqlAlchemyUnitOfWork(lazy_session(_factory)) as uow:
+        uow.outbox.save(OutboxEvent(event_type="demo"))
+    assert len(created) == 1 and len(checkouts) == 1
+
+    with Session(engine) as check:
+        assert check.scalar(_OUTBOX_COUNT) == 1
+    engine.dispose()
+
+
+def _replica_stand_ins(tmp_path: Path) -> tuple[sa.Engine, sa.Engine, UUID]:
+    """Primary and replica SQLite files; only the primary holds the user's plan."""
+
+    primary = sa.create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = sa.create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    user = User(kakao_user_id="k")
+    for engine in (primary, replica):
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            SqlAlchemyUserRepository(session).save(user)
+            session.commit()
+    with Session(primary) as session:
+        SqlAlchemyExercisePlanRepository(session).save(
+            ExercisePlan(user_id=user.id, target_date=date(2026, 1, 1))
+        )
+        session.commit()
+    return primary, replica, user.id
+
+
+def test_replica_reads_fall_back_to_primary_while_lagging(tmp_path: Path) -> None:
+    primary, replica, user_id = _replica_stand_ins(tmp_path)
+    lag = {"seconds": 0.0}
+    now = [0.0]
+    pool = ReplicaPool(
+        primary,
+        [replica],
+        max_lag_seconds=5.0,
+        check_interval_seconds=1.0,
+        lag_probe=lambda conn: lag["seconds"],
+        clock=lambda: now[0],
+    )
+
+    def plans_seen() -> int:
+        read_session = lazy_session(lambda: Session(pool.engine()))
+        with SqlAlchemyUnitOfWork(Session(primary), read_session) as uow:
+            return len(uow.plans.list_by_user(user_id))
+
+    assert plans_seen() == 1  # no reading yet: the primary serves
+    pool.refresh()
+    assert plans_seen() == 0
+    lag["seconds"] = 30.0
+    assert plans_seen() == 0  # requests only read the last reading
+    pool.refresh()
+    assert plans_seen() == 1
+    lag["seconds"] = 0.0
+    pool.refresh()
+    assert plans_seen() == 0
+    now[0] = 3.5  # the refresher stalled: the reading is too old to trust
+    assert plans_seen() == 1
+
+    # After the request used its primary session, reads see its writes there.
+    with SqlAlchemyUnitOfWork(Session(primary), Session(replica)) as uow:
+        uow.plans.save(ExercisePlan(user_id=user_id, target_date=date(2026, 1, 2)))
+        assert len(uow.plans.list_by_user(user_id)) == 2
+    primary.dispose()
+    replica.dispose()
+
+
+def test_replica_pool_never_waits_on_a_lag_probe(tmp_path: Path) -> None:
+    primary, replica, _ = _replica_stand_ins(tmp_path)
+    probing, release = threading.Event(), threading.Event()
+
+    def slow_probe(conn: sa.Connection) -> float:
+        probing.set()
+        release.wait(timeout=10)
+        return 0.0
+
+    pool = ReplicaPool(primary, [replica], lag_probe=slow_probe)
+    pool.start()
+    try:
+        assert probing.wait(timeout=10)
+        started = time.perf_counter()
+        assert pool.engine() is primary
+        assert time.perf_counter() - started < 1.0
+        release.set()
+        deadline = time.monotonic() + 10
+        while pool.engine() is not replica and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.engine() is replica
+    finally:
+        release.set()
+        pool.stop()
+    primary.dispose()
+    replica.dispose()
+
+
+def test_replica_urls_route_unit_of_work_reads(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    primary, replica, user_id = _replica_stand_ins(tmp_path)
+    primary.dispose()
+    replica.dispose()
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'primary.db'}")
+    monkeypatch.setenv(
+        "DATABASE_REPLICA_URLS",
+        f"sqlite:///{tmp_path / 'missing' / 'replica.db'}, {replica.url}",
+    )
+    for cache in ("_ENGINES", "_SESSION_FACTORIES", "_REPLICA_POOLS"):
+        monkeypatch.setattr(session_module, cache, {})
+
+    # The unreachable replica is skipped; reads land on the reachable one.
+    unit_of_work = contextmanager(get_unit_of_work)
+    pool = session_module._replica_pool()
+    assert pool is not None
+    pool.refresh()
+    for _ in range(2):
+        with unit_of_work() as uow:
+            assert uow.plans.list_by_user(user_id) == []
+    with contextmanager(session_module.get_read_session)() as read_session:
+        assert read_session.get_bind().engine.url == replica.url
+
+    monkeypatch.setenv("DATABASE_REPLICA_URLS", "")
+    with unit_of_work() as uow:
+        assert uow.read_session is None
+        assert len(uow.plans.list_by_user(user_id)) == 1
+    session_module.dispose_engines()
+
+
+def test_webhook_batch_inserts_once_and_skips_stored_duplicates(
+    session: Session,
+) -> None:
+    def _event(key: str, event_id: str | None) -> WebhookEvent:
+        return WebhookEvent(
+            provider="kakao",
+            event_type="message",
+            idempotency_key=key,
+            event_id=event_id,
+        )
+
+    inserts: list[str] = []
+
+    def _record(
+        conn: sa.Connection,
+        cursor: object,
+        statement: str,
+        parameters: object,
+        context: object,
+        executemany: bool,
+    ) -> None:
+        if statement.lstrip().upper().startswith("INSERT INTO"):
+            inserts.append(statement.split()[2].lower())
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        with SqlAlchemyUnitOfWork(session) as uow:
+            first = get_webhook_service(uow, get_user_repository(uow)).ingest_batch(
+                [_event("k1", "e1"), _event("k2", None), _event("k1", "e3")]
+            )
+        with SqlAlchemyUnitOfWork(session) as uow:
+            second = get_webhook_service(uow, get_user_repository(uow)).ingest_batch(
+                [_event("k9", "e1"), _event("k2", "e4"), _event("k5", "e5")]
+            )
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert first == ["accepted", "accepted", "duplicate"]
+    assert second == [
+        WebhookIngestStatus.DUPLICATE,
+        WebhookIngestStatus.DUPLICATE,
+        WebhookIngestStatus.ACCEPTED,
+    ]
+    assert inserts == ["webhook_event_keys", "webhook_events", "outbox_events"] * 2
+    assert (
+        session.scalar(sa.select(sa.func.count()).select_from(models.WebhookEvent)) == 3
+    )
+    assert session.scalar(_OUTBOX_COUNT) == 3
+
+
+def test_worker_run_once_projects_outbox_events(tmp_path: Path) -> None:
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'worker.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    user_id = uuid4()
+    with SqlAlchemyUnitOfWork(factory()) as uow:
+        uow.outbox.save(
+            OutboxEvent(
+                event_type=READING_LOG_RECORDED,
+                payload={
+                    "user_id": str(user_id),
+                    "stat_date": "2026-03-01",
+                    "reading_minutes": 15.0,
+                    "pages_read": 7,
+                },
+            )
+        )
+
+    assert run_once(factory, batch_size=10) == 1
+    assert run_once(factory, batch_size=10) == 0
+
+    with factory() as session:
+        stats = SqlAlchemyUserDailyStatsRepository(session).get(
+            user_id, date(2026, 3, 1)
+        )
+    assert stats is not None and stats.pages_read == 7
+    engine.dispose()
+
+
+def test_failed_outbox_handler_writes_roll_back_to_savepoint(tmp_path: Path) -> None:
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'savepoint.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    user_id = uuid4()
+    with SqlAlchemyUnitOfWork(factory()) as uow:
+        for minutes in (10.0, 20.0):
+            uow.outbox.save(
+                OutboxEvent(
+                    event_type=READING_LOG_RECORDED,
+                    payload={"user_id": str(user_id), "reading_minutes": minutes},
+                )
+            )
+
+    def write_then_fail(event: OutboxEvent) -> None:
+        minutes = cast(float, event.payload["reading_minutes"])
+        uow.daily_stats.increment(
+            user_id, date(2026, 3, 1), {"reading_minutes": minutes}
+        )
+        uow.outbox.save(OutboxEvent(event_type="follow_up"))
+        if minutes > 15:
+            raise RuntimeError("streak refresh failed")
+
+    with SqlAlchemyUnitOfWork(factory()) as uow:
+        dispatcher = OutboxDispatcher(uow.outbox, savepoint=uow.savepoint)
+        dispatcher.register(READING_LOG_RECORDED, write_then_fail)
+        assert dispatcher.dispatch_pending() == 1
+
+    with factory() as session:
+        stats = SqlAlchemyUserDailyStatsRepository(session).get(
+            user_id, date(2026, 3, 1)
+        )
+        statuses = session.execute(
+            sa.select(models.OutboxEvent.event_type, models.OutboxEvent.status)
+        ).all()
+    assert stats is not None and stats.reading_minutes == 10.0
+    assert sorted(statuses) == [
+        ("follow_up", OutboxStatus.PENDING),
+        (READING_LOG_RECORDED, OutboxStatus.COMPLETED),
+        (READING_LOG_RECORDED, OutboxStatus.FAILED),
+    ]
+    engine.dispose()
+
+
+def test_outbox_broadcast_polls_recent_events_without_leasing(
+    session: Session,
+) -> None:
+    outbox = SqlAlchemyOutboxEventRepository(session)
+    now = datetime.now(UTC)
+    broadcast = OutboxBroadcast(lookback_seconds=30.0, clock=lambda: now)
+    seen: list[object] = []
+    broadcast.register(USER_CHANGED, lambda event: seen.append(event.payload["n"]))
+    assert broadcast.poll(outbox) == 0
+
+    for n, age in enumerate((60, 10, 0)):
+        outbox.save(
+            OutboxEvent(
+                event_type=USER_CHANGED,
+                payload={"n": n},
+                created_at=now - timedelta(seconds=age),
+            )
+        )
+    outbox.save(OutboxEvent(event_type=READING_LOG_RECORDED, created_at=now))
+
+    assert broadcast.poll(outbox) == 2
+    assert broadcast.poll(outbox) == 0
+    assert seen == [1, 2]
+    assert len(outbox.lease_pending()) == 4
+
+
+def test_partition_helpers_name_monthly_ranges() -> None:
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert create_partition_sql("outbox_events", date(2026, 12, 1)) == (
+        "CREATE TABLE IF NOT EXISTS outbox_events_p2026_12 PARTITION OF "
+        "outbox_events FOR VALUES FROM ('2026-12-01 00:00:00+00') "
+        "TO ('2027-01-01 00:00:00+00')"
+    )
+    assert create_default_partition_sql("outbox_events") == (
+        "CREATE TABLE IF NOT EXISTS outbox_events_default PARTITION OF "
+        "outbox_events DEFAULT"
+    )
+
+
+def test_retention_deletes_expired_rows_in_batches_on_unpartitioned_tables(
+    tmp_path: Path,
+) -> None:
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'retention.db'}")
+    Base.metadata.create_all(engine)
+    old, recent = datetime(2026, 1, 15, tzinfo=UTC), datetime(2026, 5, 2, tzinfo=UTC)
+    with SqlAlchemyUnitOfWork(Session(engine)) as uow:
+        for n, created_at in enumerate([old, old, old, recent]):
+            uow.webhook_events.save(
+                WebhookEvent(
+                    provider="kakao",
+                    event_type="message",
+                    idempotency_key=f"k{n}",
+                    created_at=created_at,
+                )
+            )
+        for status in (OutboxStatus.COMPLETED, OutboxStatus.FAILED):
+            uow.outbox.save(OutboxEvent(event_type="x", status=status, created_at=old))
+        uow.outbox.save(
+            OutboxEvent(event_type="x", status=OutboxStatus.PENDING, created_at=old)
+        )
+        uow.outbox.save(
+            OutboxEvent(
+                event_type="x", status=OutboxStatus.COMPLETED, created_at=recent
+            )
+        )
+
+    results = run_maintenance(
+        engine,
+        today=date(2026, 5, 20),
+        retention_months={"webhook_events": 3, "outbox_events": 3},
+        batch_size=2,
+    )
+
+    assert [(r.table, r.cutoff, r.deleted_rows) for r in results] == [
+        ("webhook_events", date(2026, 3, 1), 3),
+        ("outbox_events", date(2026, 3, 1), 2),
+    ]
+    with Session(engine) as session:
+        keys = session.scalars(sa.select(models.WebhookEventKey.idempotency_key))
+        assert list(keys) == ["k3"]
+        statuses = session.scalars(sa.select(models.OutboxEvent.status))
+        assert sorted(statuses) == [OutboxStatus.COMPLETED, OutboxStatus.PENDING]
+    engine.dispose()
+
+
+def _seed_archivable_events(engine: sa.Engine) -> None:
+    old, recent = datetime(2026, 1, 15, tzinfo=UTC), datetime(2026, 5, 2, tzinfo=UTC)
+    with SqlAlchemyUnitOfWork(Session(engine)) as uow:
+        for n, (processed, created_at) in enumerate(
+            [(True, old), (True, old + timedelta(days=1)), (False, old), (True, recent)]
+        ):
+            uow.webhook_events.save(
+                WebhookEvent(
+                    provider="kakao",
+                    event_type="message",
+                    idempotency_key=f"k{n}",
+                    raw_payload={"n": n, "text": "안녕"},
+                    processed=processed,
+                    created_at=created_at,
+                )
+            )
+        for n, (status, created_at) in enumerate(
+            [
+                (OutboxStatus.COMPLETED, old),
+                (OutboxStatus.COMPLETED, old),
+                (OutboxStatus.COMPLETED, old),
+                (OutboxStatus.FAILED, old),
+                (OutboxStatus.COMPLETED, recent),
+            ]
+        ):
+            uow.outbox.save(
+                OutboxEvent(
+                    event_type="x",
+                    payload={"n": n},
+                    status=status,
+                    created_at=created_at,
+                )
+            )
+
+
+def test_archiver_moves_old_processed_rows_to_daily_files(tmp_path: Path) -> None:
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'archive.db'}")
+    Base.metadata.create_all(engine)
+    _seed_archivable_events(engine)
+    root = tmp_path / "archive"
+    now = datetime(2026, 5, 20, tzinfo=UTC)
+
+    webhooks = archive_table(
+        engine, "webhook_events", root, older_than=timedelta(days=30), now=now
+    )
+    outbox = archive_table(
+        engine,
+        "outbox_events",
+        root,
+        older_than=timedelta(days=30),
+        now=now,
+        chunk_size=2,
+        delete_batch_size=1,
+    )
+
+    assert (webhooks.rows, outbox.rows) == (2, 3)
+    assert sorted(path.parent.name for path in webhooks.files) == [
+        "dt=2026-01-15",
+        "dt=2026-01-16",
+    ]
+    assert len(outbox.files) == 2
+    with Session(engine) as session:
+        kept = session.scalars(sa.select(models.OutboxEvent.status))
+        assert sorted(kept) == [OutboxStatus.COMPLETED, OutboxStatus.FAILED]
+        assert session.scalars(sa.select(models.WebhookEvent.processed)).all() == [
+            False,
+            True,
+        ]
+
+    archived = list(read_archive(root, "webhook_events", end=date(2026, 1, 15)))
+    assert [row["raw_payload"] for row in archived] == [{"n": 0, "text": "안녕"}]
+    assert archived[0]["created_at"] == "2026-01-15T00:00:00+00:00"
+    payloads = [row["payload"] for row in read_archive(root, "outbox_events")]
+    assert sorted(payloads, key=str) == [{"n": 0}, {"n": 1}, {"n": 2}]
+    engine.dispose()
+
+
+def test_archive_partition_refuses_tables_that_are_not_detached_partitions(
+    tmp_path: Path,
+) -> None:
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'archive.db'}")
+    Base.metadata.create_all(engine)
+    _seed_archivable_events(engine)
+
+    for name in ("outbox_events", "users", "outbox_events_p2026_01; DROP users"):
+        with pytest.raises(ValueError, match="not a detached partition"):
+            archive_partition(engine, "outbox_events", name, tmp_path / "archive")
+
+    assert partition_month("outbox_events", "outbox_events_p2026_01") == date(
+        2026, 1, 1
+    )
+    for name in ("outbox_events_default", "webhook_events_p2026_01", "users"):
+        assert partition_month("outbox_events", name) is None
+    with Session(engine) as session:
+        assert session.scalar(sa.select(sa.func.count(models.OutboxEvent.id))) == 5
+    assert not (tmp_path / "archive").exists()
+    engine.dispose()
+
+
+def test_archive_reader_skips_rows_written_twice(tmp_path: Path) -> None:
+    row = {"id": uuid4(), "created_at": datetime(2026, 2, 1, 9, tzinfo=UTC)}
+    write_chunk(tmp_path, "outbox_events", [row], "ndjson")
+    write_chunk(tmp_path, "outbox_events", [row], "ndjson")
+
+    assert [r["id"] for r in read_archive(tmp_path, "outbox_events")] == [
+        str(row["id"])
+    ]
+
+
+def test_archive_parquet_round_trips_json_payloads(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    row = {
+        "id": uuid4(),
+        "created_at": datetime(2026, 2, 1, 9, tzinfo=UTC),
+        "payload": {"nested": [1, 2]},
+    }
+    write_chunk(tmp_path, "outbox_events", [row], "parquet")
+
+    [archived] = read_archive(tmp_path, "outbox_events")
+    assert archived["payload"] == {"nested": [1, 2]}
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def explain_engine(
+    request: pytest.FixtureRequest, tmp_path: Path
+) -> Iterator[sa.Engine]:
+    if request.param == "sqlite":
+        engine = sa.create_engine(f"sqlite:///{tmp_path / 'explain.db'}")
+    else:
+        url = os.getenv("TEST_DATABASE_URL", "")
+        if not url.startswith("postgresql"):
+            pytest.skip("set TEST_DATABASE_URL to a scratch PostgreSQL database")
+        engine = sa.create_engine(url)
+
+        @event.listens_for(engine, "connect")
+        def _prefer_indexes(dbapi_connection: Any, record: object) -> None:  # noqa: ANN401
+            # Tiny test tables are cheaper to scan; ask whether an index applies.
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def test_hot_queries_use_their_partial_indexes(explain_engine: sa.Engine) -> None:
+    now = datetime(2026, 5, 20, tzinfo=UTC)
+    with Session(explain_engine) as session, record_queries(explain=True) as recording:
+        with SqlAlchemyUnitOfWork(session) as uow:
+            uow.outbox.lease_pending(limit=10)
+            uow.notifications.list_due(now, limit=10)
+            session.execute(
+                sa.select(_WEBHOOK_EVENTS.c.id)
+                .where(models.UNPROCESSED_WEBHOOKS)
+                .order_by(_WEBHOOK_EVENTS.c.created_at)
+                .limit(10)
+            )
+
+    plans = "\n".join(line for plan in recording.plans.values() for line in plan or ())
+    for index in (
+        "ix_outbox_events_pending",
+        "ix_notifications_due",
+        "ix_webhook_events_unprocessed",
+    ):
+        assert index in plans
+    assert recording.sequential_scans() == []
+
+
+def test_failed_explain_leaves_the_transaction_usable(
+    explain_engine: sa.Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setitem(
+        query_recorder._EXPLAIN_PREFIX,
+        explain_engine.dialect.name,
+        "EXPLAIN (NO_SUCH_OPTION) ",
+    )
+    with Session(explain_engine) as session, record_queries(explain=True) as recording:
+        _seed_users(session, 2)
+        session.execute(sa.select(models.User.id)).all()
+        # On PostgreSQL this fails if the EXPLAIN aborted the transaction.
+        assert session.scalar(sa.select(sa.func.count()).select_from(models.User)) == 2
+
+    assert list(recording.plans.values()) == [None, None]
+
+
+def test_online_backfill_updates_in_batches_and_reports_progress(
+    tmp_path: Path,
+) -> None:
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'online.db'}")
+    Base.metadata.create_all(engine)
+    user_id = uuid4()
+    with engine.begin() as conn:
+        conn.execute(
+            sa.insert(models.User), {"id": user_id, "kakao_user_id": "k", "name": "u"}
+        )
+        conn.execute(
+            sa.insert(models.Notification),
+            [
+                {
+                    "id": uuid4(),
+                    "user_id": user_id,
+                    "kind": "reading",
+                    "status": NotificationStatus.SENT,
+                    "schedule_at": datetime(2026, 1, 1, tzinfo=UTC),
+                    "idempotency_key": f"n{n}",
+                    "payload": {},
+                    "reason_code": "done" if n < 5 else None,
+                }
+                for n in range(30)
+            ],
+        )
+
+    reports: list[tuple[int, int]] = []
+    with engine.connect() as conn:
+        # A real outer transaction, as env.py opens one per revision.
+        context = MigrationContext.configure(conn, opts={"transactional_ddl": True})
+        with Operations.context(context), context.begin_transaction():
+            progress = online_migrations.backfill(
+                "notifications",
+                "reason_code = 'legacy'",
+                "reason_code IS NULL",
+                batch_size=10,
+                pause_seconds=0,
+                report=lambda p: reports.append((p.done, p.total)),
+                report_every=0,
+            )
+            online_migrations.add_check_not_valid(
+                "ck_notifications_reason_code_set",
+                "notifications",
+                "reason_code IS NOT NULL",
+            )
+            online_migrations.validate_constraint(
+                "ck_notifications_reason_code_set", "notifications"
+            )
+
+    assert (progress.done, progress.total, progress.batches) == (25, 25, 3)
+    assert reports == [(10, 25), (20, 25), (25, 25), (25, 25)]
+    with engine.connect() as conn:
+        codes = conn.scalars(sa.select(models.Notification.reason_code)).all()
+        assert codes.count("legacy") == 25
+        with pytest.raises(IntegrityError):
+            conn.execute(sa.update(models.Notification).values(reason_code=None))
+    engine.dispose()
+
+
+def _seed_users(session: Session, count: int) -> list[str]:
+    kakao_ids = [f"kakao-{n}" for n in range(count)]
+    session.execute(
+        sa.insert(models.User),
+        [{"id": uuid4(), "kakao_user_id": key, "name": "u"} for key in kakao_ids],
+    )
+    return kakao_ids
+
+
+def test_query_recorder_flags_n_plus_one_slow_and_scanning_statements(
+    session: Session,
+) -> None:
+    kakao_ids = _seed_users(session, 5)
+    users = SqlAlchemyUserRepository(session)
+
+    with record_queries(explain=True) as recording:
+        for kakao_id in kakao_ids:
+            users.get_by_kakao_user_id(kakao_id)
+        session.execute(sa.select(models.User).where(models.User.name == "u")).all()
+        # The same parameters again are a missing cache, not an N+1 loop.
+        for _ in range(5):
+            session.execute(sa.select(models.User).where(models.User.id == 1)).all()
+
+    [repeat] = recording.repeated(threshold=3)
+    assert repeat.count == 5 and "WHERE users.kakao_user_id = ?" in repeat.sql
+    assert [scan.table for scan in recording.sequential_scans()] == ["users"]
+    assert len(recording.slow(0.0)) == 11 and recording.slow(60.0) == []
+
+    violations = QueryBudget(
+        max_statements=4, slow_seconds=None, allow_sequential_scans=False
+    ).violations(recording)
+    assert [violation.split(":")[0].split()[0] for violation in violations] == [
+        "11",
+        "N+1",
+        "sequential",
+    ]
+    assert QueryBudget(max_repeats=5).violations(recording) == []
+
+
+def test_query_recorder_ignores_statements_outside_a_recording(
+    session: Session,
+) -> None:
+    with record_queries() as recording:
+        pass
+    _seed_users(session, 2)
+    SqlAlchemyUserRepository(session).map_kakao_user_ids(["kakao-1"])
+
+    assert recording.statements == []
+
+
+@pytest.mark.query_budget(max_statements=3, max_repeats=1)
+def test_kakao_id_batch_lookup_stays_within_query_budget(
+    session: Session, query_budget: QueryRecording
+) -> None:
+    kakao_ids = _seed_users(session, 50)
+    users = SqlAlchemyUserRepository(session)
+
+    assert len(users.map_kakao_user_ids(kakao_ids)) == 50
+    assert len(query_budget.statements) <= 3
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from fastapi import FastAPI
+from godlife_backend.adapter.persistence import session as session_module
+from godlife_backend.adapter.webapi.app import create_app
+from godlife_backend.adapter.webapi.server import PreforkServer, ServerSettings
+
+
+def _settings(workers: int) -> ServerSettings:
+    return ServerSettings(
+        host="127.0.0.1",
+        port=0,
+        workers=workers,
+        graceful_timeout=5.0,
+        restart_interval=0.0,
+    )
+
+
+def _sleep_forever(app: FastAPI, sock: object) -> None:
+    while True:
+        time.sleep(60)
+
+
+def test_forked_child_gets_a_fresh_connection_pool(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'fork.db'}")
+    monkeypatch.setitem(session_module._ENGINES, "default", engine)
+    with engine.connect() as connection:
+        connection.execute(sa.text("select 1"))
+    parent_pool = engine.pool
+
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        os.write(write_end, b"1" if engine.pool is not parent_pool else b"0")
+        os._exit(0)
+    os.close(write_end)
+    os.waitpid(pid, 0)
+
+    assert os.read(read_end, 1) == b"1"
+    assert engine.pool is parent_pool
+    os.close(read_end)
+    engine.dispose()
+
+
+def test_prefork_server_replaces_restarts_and_stops_workers() -> None:
+    server = PreforkServer(FastAPI(), _settings(workers=2), target=_sleep_forever)
+    server.start()
+    try:
+        first = server.workers
+        assert len(first) == 2
+
+        server.restart_workers()
+        restarted = server.workers
+        assert len(restarted) == 2 and restarted.isdisjoint(first)
+
+        crashed = min(restarted)
+        os.kill(crashed, signal.SIGKILL)
+        os.waitpid(crashed, 0)
+        assert server.reap() == {crashed}
+        assert len(server.workers) == 2 and crashed not in server.workers
+    finally:
+        server.stop()
+    assert server.workers == frozenset()
+
+
+def test_prefork_server_serves_requests_from_every_worker(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pytest.importorskip("uvicorn")
+    monkeypatch.setenv("GODLIFE_WARM_KAKAO_INDEX", "false")
+    monkeypatch.setenv("GODLIFE_CACHE_BROADCAST_SECONDS", "0")
+    server = PreforkServer(create_app(), _settings(workers=2))
+    server.start()
+    try:
+        host, port = server.address
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://{host}:{port}/healthz") as resp:
+                    assert resp.status == 200
+                    break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+    finally:
+        server.stop()
+
+
+def _children(pid: int) -> set[int]:
+    children = Path(f"/proc/{pid}/task/{pid}/children").read_text().split()
+    return {int(child) for child in children}
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.1)
+
+
+def test_sighup_reexecutes_the_master_and_replaces_every_worker(
+    tmp_path: Path,
+) -> None:
+    pytest.importorskip("uvicorn")
+    if not Path(f"/proc/{os.getpid()}/task/{os.getpid()}/children").exists():
+        pytest.skip("needs /proc child listings")
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    env = {
+        **os.environ,
+        "GODLIFE_WARM_KAKAO_INDEX": "false",
+        "GODLIFE_CACHE_BROADCAST_SECONDS": "0",
+        "GODLIFE_METRICS_DIR": str(tmp_path / "metrics"),
+        "PYTHONPATH": os.pathsep.join(filter(None, sys.path)),
+    }
+    command = [sys.executable, "-m", "godlife_backend.adapter.webapi.server"]
+    options = ["--host", "127.0.0.1", "--port", str(port), "--workers", "2"]
+    log = (tmp_path / "server.log").open("w+")
+    master = subprocess.Popen(
+        [*command, *options, "--graceful-timeout", "5"],
+        env=env,
+        stderr=log,
+    )
+    url = f"http://127.0.0.1:{port}/healthz"
+
+    def healthy() -> bool:
+        try:
+            with urllib.request.urlopen(url, timeout=5) as resp:
+                return resp.status == 200
+        except OSError:
+            return False
+
+    try:
+        _wait_for(lambda: healthy() and len(_children(master.pid)) == 2)
+        old_workers = _children(master.pid)
+
+        master.send_signal(signal.SIGHUP)
+        failures = 0
+
+        def replaced() -> bool:
+            nonlocal failures
+            failures += not healthy()
+            current = _children(master.pid)
+            return len(current) == 2 and current.isdisjoint(old_workers)
+
+        _wait_for(replaced)
+        assert master.poll() is None
+        assert failures == 0
+        log.seek(0)
+        output = log.read()
+        assert f"re-executing master {master.pid}" in output
+        assert "retired 2 old workers" in output
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=30)
+        log.close()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+_BACKEND_SRC = Path(__file__).resolve().parents[1] / "apps" / "backend" / "src"
+_WEB_STACK = {"fastapi", "starlette", "pydantic", "uvicorn"}
+
+# Generous ceilings in milliseconds: the module-set assertions are the precise
+# guard, these only catch a regression large enough to hurt autoscaling.
+_BUDGET_SCALE = float(os.getenv("GODLIFE_IMPORT_BUDGET_SCALE", "1.0"))
+
+
+def _import_profile(statement: str) -> tuple[set[str], float]:
+    """Run ``statement`` in a fresh interpreter under ``-X importtime``.
+
+    Returns the imported module names and the total cumulative import time of
+    the top-level imports in milliseconds.
+    """
+
+    env = {**os.environ, "PYTHONPATH": str(_BACKEND_SRC)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    modules: set[str] = set()
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        modules.add(name.strip())
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return modules, total_us / 1000
+
+
+def _top_level(modules: set[str]) -> set[str]:
+    return {name.partition(".")[0] for name in modules}
+
+
+def test_worker_role_never_imports_the_web_stack() -> None:
+    modules, total_ms = _import_profile("import godlife_backend.adapter.worker")
+
+    assert _top_level(modules).isdisjoint(_WEB_STACK | {"numpy"})
+    assert total_ms < 1500 * _BUDGET_SCALE
+
+
+def test_app_module_defers_routers_until_an_app_is_built() -> None:
+    modules, _ = _import_profile("import godlife_backend.adapter.webapi.app")
+
+    assert "godlife_backend.adapter.webapi.routers.webhooks" not in modules
+    assert "godlife_backend.db.models" not in modules
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "from godlife_backend.adapter.webapi.app import create_app; create_app()",
+        "from godlife_backend.adapter.webapi.app import app",
+    ],
+)
+def test_api_role_cold_start_stays_within_budget(statement: str) -> None:
+    modules, total_ms = _import_profile(statement)
+
+    assert "godlife_backend.adapter.webapi.routers.webhooks" in modules
+    assert "numpy" not in _top_level(modules)
+    assert "godlife_backend.adapter.persistence.reading_analytics" not in modules
+    assert total_ms < 3000 * _BUDGET_SCALE
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
-from datetime import date, datetime
+import json
+from collections.abc import Collection, Mapping, Sequence
+from datetime import UTC, date, datetime, timedelta
 from uuid import UUID, uuid4
 
 import pytest
+from godlife_backend.adapter.persistence.repositories.caching_repositories import (
+    CachingUserProfileRepository,
+    CachingUserRepository,
+    register_user_cache_invalidation,
+    user_cache,
+    user_profile_cache,
+)
 from godlife_backend.adapter.test_doubles import (
     InMemoryExercisePlanRepository,
     InMemoryExerciseSessionRepository,
@@ -12,17 +20,38 @@ from godlife_backend.adapter.test_doubles import (
     InMemoryNotificationRepository,
     InMemoryOutboxEventRepository,
     InMemoryReadingLogRepository,
+    InMemorySharedCache,
+    InMemoryUserDailyStatsRepository,
     InMemoryUserProfileRepository,
     InMemoryUserRepository,
     InMemoryWebhookEventRepository,
 )
+from godlife_backend.application.cache import TtlLruCache
+from godlife_backend.application.services.activity_summary_service import (
+    ActivitySeries,
+    ActivitySeriesCache,
+    ActivitySummaryService,
+    register_activity_cache_invalidation,
+)
+from godlife_backend.application.services.daily_stats_service import (
+    DailyStatsService,
+)
 from godlife_backend.application.services.exercise_plan_service import (
     ExercisePlanService,
     GeneratePlanCommand,
+    RecordSetResultCommand,
+)
+from godlife_backend.application.services.kakao_user_resolver import (
+    KakaoUserResolver,
 )
 from godlife_backend.application.services.notification_service import (
     NotificationService,
 )
+from godlife_backend.application.services.outbox_broadcast import OutboxBroadcast
+from godlife_backend.application.services.outbox_dispatcher import OutboxDispatcher
+from godlife_backend.application.services.reading_log_service import (
+    ReadingLogService,
+)
 from godlife_backend.application.services.webhook_service import WebhookService
 from godlife_backend.db.enums import (
     NotificationStatus,
@@ -38,9 +67,17 @@ from godlife_backend.domain.entities import (
     OutboxEvent,
     ReadingLog,
     User,
+    UserDailyStats,
     UserProfile,
     WebhookEvent,
 )
+from godlife_backend.domain.errors import ConcurrencyConflictError
+from godlife_backend.domain.events import (
+    EXERCISE_SET_STATUS_CHANGED,
+    USER_CHANGED,
+    USER_PROFILE_CHANGED,
+)
+from godlife_backend.domain.payload import JsonPayload
 
 
 class _OutboxStub:
@@ -56,6 +93,11 @@ class _OutboxStub:
     def mark_failed(self, event_id: UUID, reason: str | None) -> OutboxEvent | None:
         return None
 
+    def list_recent(
+        self, event_types: Collection[str], since: datetime, limit: int = 1000
+    ) -> list[OutboxEvent]:
+        return []
+
 
 def test_in_memory_user_repository_can_find_by_kakao_user_id() -> None:
     repository = InMemoryUserRepository()
@@ -263,6 +305,33 @@ def test_in_memory_notification_repository_filters_status_and_date() -> None:
     assert repository.get_by_idempotency_key("send-1") is not None
 
 
+def test_in_memory_notification_repository_lists_due_oldest_first() -> None:
+    repository = InMemoryNotificationRepository()
+    user_id = uuid4()
+    base = datetime(2026, 5, 20, 9, 0)
+    for n, status in enumerate(
+        [
+            NotificationStatus.RETRY_SCHEDULED,
+            NotificationStatus.SCHEDULED,
+            NotificationStatus.SENT,
+            NotificationStatus.SCHEDULED,
+        ]
+    ):
+        repository.save(
+            Notification(
+                user_id=user_id,
+                kind="reading",
+                status=status,
+                schedule_at=base - timedelta(hours=n),
+                idempotency_key=f"due-{n}",
+            )
+        )
+
+    due = repository.list_due(base, limit=2)
+
+    assert [n.idempotency_key for n in due] == ["due-3", "due-1"]
+
+
 def test_in_memory_webhook_event_repository_sets_failure_reason() -> None:
     repository = InMemoryWebhookEventRepository()
     repository.save(
@@ -342,6 +411,165 @@ def test_in_memory_outbox_mark_failed_adds_payload_reason() -> None:
     assert event.payload["failure_reason"] == "error"
 
 
+def test_json_payload_decodes_lazily_and_records_patches() -> None:
+    raw = b'{"user":{"id":"kakao-1"},"tags":[1,2,3]}'
+    payload = JsonPayload.from_json(raw)
+
+    assert payload.to_json() is raw
+    failed = payload.patched({"failure_reason": "boom"})
+    assert failed["failure_reason"] == "boom"
+    assert failed.patch == {"failure_reason": "boom"}
+    assert not payload.is_decoded and not failed.is_decoded
+
+    assert payload == {"user": {"id": "kakao-1"}, "tags": [1, 2, 3]}
+    assert "failure_reason" not in payload
+    assert json.loads(failed.to_json()) == {
+        "user": {"id": "kakao-1"},
+        "tags": [1, 2, 3],
+        "failure_reason": "boom",
+    }
+    assert JsonPayload.of(payload) is payload
+    assert JsonPayload.of({"a": 1}) == {"a": 1}
+    assert JsonPayload() == {}
+
+
+def test_in_memory_versioned_repository_rejects_stale_write() -> None:
+    repository = InMemoryExerciseSetStateRepository()
+    session_id = uuid4()
+    repository.save(ExerciseSetState(session_id=session_id, set_no=1))
+
+    first = repository.get(session_id, 1)
+    second = repository.get(session_id, 1)
+    assert first is not None and second is not None
+    first.status = SetStatus.DONE
+    repository.save(first)
+    second.status = SetStatus.SKIPPED
+
+    with pytest.raises(ConcurrencyConflictError):
+        repository.save(second)
+    stored = repository.get(session_id, 1)
+    assert stored is not None
+    assert (stored.status, stored.version) == (SetStatus.DONE, 2)
+
+
+class _RacingSetStateRepository(InMemoryExerciseSetStateRepository):
+    """Lets a competing writer commit between the service's read and write."""
+
+    def __init__(
+        self,
+        competing_status: SetStatus,
+        sessions: InMemoryExerciseSessionRepository,
+        plans: InMemoryExercisePlanRepository,
+    ) -> None:
+        super().__init__(sessions, plans)
+        self._competing_status: SetStatus | None = competing_status
+
+    def save(self, state: ExerciseSetState) -> ExerciseSetState:
+        if self._competing_status is not None and state.version > 0:
+            competitor = self.get(state.session_id, state.set_no)
+            assert competitor is not None
+            competitor.status = self._competing_status
+            self._competing_status = None
+            super().save(competitor)
+        return super().save(state)
+
+
+def _plan_service_with_sets(
+    set_count: int,
+    competing_status: SetStatus | None = None,
+) -> tuple[ExercisePlanService, ExercisePlan, ExerciseSession]:
+    plans = InMemoryExercisePlanRepository()
+    sessions = InMemoryExerciseSessionRepository()
+    set_states = (
+        InMemoryExerciseSetStateRepository(sessions, plans)
+        if competing_status is None
+        else _RacingSetStateRepository(competing_status, sessions, plans)
+    )
+    plan = plans.save(ExercisePlan(user_id=uuid4(), status=PlanStatus.ACTIVE))
+    session = sessions.save(ExerciseSession(plan_id=plan.id, target_sets=set_count))
+    for set_no in range(1, set_count + 1):
+        set_states.save(ExerciseSetState(session_id=session.id, set_no=set_no))
+    service = ExercisePlanService(
+        plan_repository=plans,
+        session_repository=sessions,
+        set_state_repository=set_states,
+        outbox_repository=_OutboxStub(),
+    )
+    return service, plan, session
+
+
+def test_exercise_plan_service_record_set_result_retries_on_conflict() -> None:
+    service, plan, session = _plan_service_with_sets(
+        1, competing_status=SetStatus.SKIPPED
+    )
+
+    state = service.record_set_result(
+        RecordSetResultCommand(
+            session_id=session.id, set_no=1, status=SetStatus.DONE, performed_reps=8
+        )
+    )
+
+    assert state is not None
+    assert state.status == SetStatus.DONE
+    assert state.version == 3
+    assert state.completed_at is not None and state.skipped_at is None
+
+
+def test_exercise_plan_service_record_set_result_double_tap_is_noop() -> None:
+    service, plan, session = _plan_service_with_sets(1)
+    command = RecordSetResultCommand(
+        session_id=session.id, set_no=1, status=SetStatus.DONE, performed_reps=8
+    )
+
+    first = service.record_set_result(command)
+    second = service.record_set_result(command)
+
+    assert first is not None and second is not None
+    assert first.version == second.version == 2
+    assert session.done_sets == 1 and session.pending_sets == 0
+    assert (
+        service.record_set_result(
+            RecordSetResultCommand(session_id=uuid4(), set_no=1, status=SetStatus.DONE)
+        )
+        is None
+    )
+
+
+def test_exercise_plan_service_completes_plan_from_counters() -> None:
+    service, plan, session = _plan_service_with_sets(3)
+    fresh = service.complete_active_plan(plan.id)
+    assert fresh is not None
+    assert (fresh.status, fresh.pending_sets, session.pending_sets) == (
+        PlanStatus.ACTIVE,
+        3,
+        3,
+    )
+    for set_no, status in ((1, SetStatus.DONE), (2, SetStatus.IN_PROGRESS)):
+        service.record_set_result(
+            RecordSetResultCommand(session_id=session.id, set_no=set_no, status=status)
+        )
+
+    pending = service.complete_active_plan(plan.id)
+    assert pending is not None
+    assert pending.status == PlanStatus.ACTIVE
+    assert (pending.pending_sets, pending.done_sets) == (2, 1)
+
+    for set_no, status in ((2, SetStatus.FAILED), (3, SetStatus.SKIPPED)):
+        service.record_set_result(
+            RecordSetResultCommand(session_id=session.id, set_no=set_no, status=status)
+        )
+    completed = service.complete_active_plan(plan.id)
+
+    assert completed is not None
+    assert completed.status == PlanStatus.DONE
+    assert completed.summary == "done=1 skipped=1 failed=1"
+    assert (session.pending_sets, session.failed_sets, session.skipped_sets) == (
+        0,
+        1,
+        1,
+    )
+
+
 class _PlanServiceRepo:
     def __init__(self, plan: ExercisePlan | None = None) -> None:
         self.plan = plan
@@ -367,6 +595,9 @@ class _PlanServiceRepo:
     def save(self, plan: ExercisePlan) -> ExercisePlan:
         return plan
 
+    def increment_set_counters(self, plan_id: UUID, deltas: Mapping[str, int]) -> None:
+        del plan_id, deltas
+
 
 def test_exercise_plan_service_complete_active_plan_returns_none_when_missing() -> None:
     service = ExercisePlanService(
@@ -396,18 +627,17 @@ def test_exercise_plan_service_generate_plan_not_implemented() -> None:
         )
 
 
-def test_exercise_plan_service_complete_active_plan_not_implemented_when_exists() -> (
-    None
-):
+def test_exercise_plan_service_complete_active_plan_ignores_draft_plan() -> None:
+    draft = ExercisePlan(id=uuid4(), status=PlanStatus.DRAFT)
     service = ExercisePlanService(
-        plan_repository=_PlanServiceRepo(ExercisePlan(id=uuid4())),
+        plan_repository=_PlanServiceRepo(draft),
         session_repository=InMemoryExerciseSessionRepository(),
         set_state_repository=InMemoryExerciseSetStateRepository(),
         outbox_repository=_OutboxStub(),
     )
 
-    with pytest.raises(NotImplementedError):
-        service.complete_active_plan(uuid4())
+    assert service.complete_active_plan(uuid4()) == draft
+    assert draft.status == PlanStatus.DRAFT
 
 
 class _NotificationRepo:
@@ -430,6 +660,10 @@ class _NotificationRepo:
         del user_id, status, from_at, to_at
         return []
 
+    def list_due(self, before: datetime, limit: int = 100) -> Sequence[Notification]:
+        del before, limit
+        return []
+
     def save(self, notification: Notification) -> Notification:
         return notification
 
@@ -480,3 +714,388 @@ def test_webhook_service_handle_event_and_replay_behavior() -> None:
         )
 
     assert service.replay_failed_events(provider="stripe", limit=10) == []
+
+
+def test_daily_stats_projection_from_outbox_events() -> None:
+    outbox = InMemoryOutboxEventRepository()
+    stats = InMemoryUserDailyStatsRepository()
+    dispatcher = OutboxDispatcher(outbox)
+    DailyStatsService(stats).register(dispatcher)
+
+    plans = InMemoryExercisePlanRepository()
+    sessions = InMemoryExerciseSessionRepository()
+    set_states = InMemoryExerciseSetStateRepository(sessions, plans)
+    user_id = uuid4()
+    plan = plans.save(ExercisePlan(user_id=user_id, target_date=date(2026, 1, 2)))
+    session = sessions.save(ExerciseSession(plan_id=plan.id))
+    set_states.save(ExerciseSetState(session_id=session.id, set_no=1))
+    plan_service = ExercisePlanService(
+        plan_repository=plans,
+        session_repository=sessions,
+        set_state_repository=set_states,
+        outbox_repository=outbox,
+    )
+    plan_service.record_set_result(
+        RecordSetResultCommand(
+            session_id=session.id,
+            set_no=1,
+            status=SetStatus.DONE,
+            performed_reps=10,
+            performed_weight_kg=40.0,
+        )
+    )
+
+    users = InMemoryUserRepository()
+    users.save(User(id=user_id, timezone="Asia/Seoul"))
+    reading = ReadingLogService(InMemoryReadingLogRepository(), outbox, users)
+    # 21:00 on January 1st and 07:00 on January 2nd in Seoul: the second log
+    # is still January 1st in UTC but must count towards the plan's day.
+    reading.record_log(
+        ReadingLog(
+            user_id=user_id,
+            start_at=datetime(2026, 1, 1, 12, 0, tzinfo=UTC),
+            end_at=datetime(2026, 1, 1, 12, 45, tzinfo=UTC),
+            pages_read=30,
+        )
+    )
+    reading.record_log(
+        ReadingLog(
+            user_id=user_id,
+            start_at=datetime(2026, 1, 1, 22, 0, tzinfo=UTC),
+            end_at=datetime(2026, 1, 1, 22, 20, tzinfo=UTC),
+            pages_read=12,
+        )
+    )
+
+    assert dispatcher.dispatch_pending() == 3
+    assert outbox.lease_pending() == []
+
+    day_one = stats.get(user_id, date(2026, 1, 1))
+    day_two = stats.get(user_id, date(2026, 1, 2))
+    assert day_one is not None and day_two is not None
+    assert (day_one.reading_minutes, day_one.pages_read) == (45.0, 30)
+    assert day_one.streak_days == 1
+    assert (day_two.sets_done, day_two.volume_kg) == (1, 400.0)
+    assert (day_two.reading_minutes, day_two.pages_read) == (20.0, 12)
+    assert day_two.streak_days == 2
+
+
+def test_outbox_dispatcher_marks_failed_handler_events() -> None:
+    outbox = InMemoryOutboxEventRepository()
+    event = outbox.save(OutboxEvent(event_type="boom"))
+    dispatcher = OutboxDispatcher(outbox)
+
+    def _explode(_: OutboxEvent) -> None:
+        raise RuntimeError("handler down")
+
+    dispatcher.register("boom", _explode)
+
+    assert dispatcher.dispatch_pending() == 0
+    assert event.status == OutboxStatus.FAILED
+    assert event.payload["failure_reason"] == "handler down"
+
+
+def test_ttl_lru_cache_evicts_least_recent_and_expired_entries() -> None:
+    now = [0.0]
+    cache: TtlLruCache[str, int] = TtlLruCache(
+        max_entries=2, ttl_seconds=10.0, clock=lambda: now[0]
+    )
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+    now[0] = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_activity_series_streaks_and_window_totals() -> None:
+    user_id = uuid4()
+    today = date(2026, 3, 31)
+
+    def _day(days_ago: int, **values: float) -> UserDailyStats:
+        return UserDailyStats(
+            user_id=user_id,
+            stat_date=today - timedelta(days=days_ago),
+            sets_done=int(values.get("sets", 0)),
+            volume_kg=values.get("volume", 0.0),
+            reading_minutes=values.get("minutes", 0.0),
+            pages_read=int(values.get("pages", 0)),
+        )
+
+    rows = [
+        _day(400, sets=9),
+        _day(40, minutes=10.0),
+        *(_day(days_ago, sets=1) for days_ago in range(20, 16, -1)),
+        _day(8, minutes=30.0, pages=20),
+        _day(2, sets=3, volume=300.0),
+        _day(1, minutes=25.0, pages=15),
+    ]
+    summary = ActivitySeries.from_stats(rows, end_date=today).summarize(user_id)
+
+    assert summary.as_of == today
+    assert summary.current_streak_days == 2
+    assert summary.longest_streak_days == 4
+    assert (summary.weekly_sets_done, summary.weekly_volume_kg) == (3, 300.0)
+    assert (summary.weekly_reading_minutes, summary.weekly_pages_read) == (25.0, 15)
+    assert summary.monthly_reading_minutes == 55.0
+
+    rows.append(_day(0, minutes=5.0))
+    extended = ActivitySeries.from_stats(rows, end_date=today)
+    assert extended.current_streak() == 3
+    assert ActivitySeries(today).current_streak() == 0
+
+
+class _CountingStatsRepository(InMemoryUserDailyStatsRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.range_calls = 0
+
+    def list_range(
+        self, user_id: UUID, from_date: date, to_date: date
+    ) -> list[UserDailyStats]:
+        self.range_calls += 1
+        return super().list_range(user_id, from_date, to_date)
+
+
+def test_activity_summary_uses_local_date_and_expires_by_ttl() -> None:
+    stats = _CountingStatsRepository()
+    users = InMemoryUserRepository()
+    seoul = users.save(User(timezone="Asia/Seoul"))
+    utc = users.save(User(timezone="UTC"))
+    monotonic = [0.0]
+    cache = ActivitySeriesCache(
+        max_entries=16, ttl_seconds=60.0, clock=lambda: monotonic[0]
+    )
+    # 00:30 on April 1st in Seoul, still March 31st in UTC.
+    now = datetime(2026, 3, 31, 15, 30, tzinfo=UTC)
+    service = ActivitySummaryService(stats, users, cache, clock=lambda: now)
+
+    assert service.get_summary(seoul.id).as_of == date(2026, 4, 1)
+    assert service.get_summary(utc.id).as_of == date(2026, 3, 31)
+    assert service.get_summary(seoul.id).weekly_reading_minutes == 0.0
+    assert stats.range_calls == 2
+
+    stats.increment(seoul.id, date(2026, 4, 1), {"reading_minutes": 15.0})
+    assert service.get_summary(seoul.id).weekly_reading_minutes == 0.0
+    monotonic[0] = 61.0
+    summary = service.get_summary(seoul.id)
+    assert stats.range_calls == 3
+    assert summary.weekly_reading_minutes == 15.0
+    assert summary.current_streak_days == 1
+
+
+def test_activity_events_evict_the_cached_series_in_every_process() -> None:
+    stats = _CountingStatsRepository()
+    users = InMemoryUserRepository()
+    user = users.save(User(timezone="UTC"))
+    outbox = InMemoryOutboxEventRepository()
+    now = datetime(2026, 4, 1, 12, 0, tzinfo=UTC)
+    cache = ActivitySeriesCache(max_entries=16, ttl_seconds=60.0)
+    broadcast = OutboxBroadcast(clock=lambda: now)
+    register_activity_cache_invalidation(broadcast, cache)
+    service = ActivitySummaryService(stats, users, cache, clock=lambda: now)
+    assert broadcast.poll(outbox) == 0
+    assert service.get_summary(user.id).weekly_sets_done == 0
+
+    stats.increment(user.id, date(2026, 4, 1), {"sets_done": 2})
+    outbox.save(
+        OutboxEvent(
+            event_type=EXERCISE_SET_STATUS_CHANGED,
+            payload={"user_id": str(user.id), "stat_date": "2026-04-01"},
+            created_at=now,
+        )
+    )
+    assert service.get_summary(user.id).weekly_sets_done == 0
+    assert broadcast.poll(outbox) == 1
+    assert service.get_summary(user.id).weekly_sets_done == 2
+    assert stats.range_calls == 2
+
+
+class _CountingUserRepository(InMemoryUserRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups = 0
+
+    def get_by_id(self, user_id: UUID) -> User | None:
+        self.lookups += 1
+        return super().get_by_id(user_id)
+
+    def get_by_kakao_user_id(self, kakao_user_id: str) -> User | None:
+        self.lookups += 1
+        return super().get_by_kakao_user_id(kakao_user_id)
+
+
+def test_caching_user_repository_reads_through_and_invalidates_on_save() -> None:
+    inner = _CountingUserRepository()
+    outbox = InMemoryOutboxEventRepository()
+    shared = InMemorySharedCache()
+    users = CachingUserRepository(inner, user_cache(shared=shared), outbox)
+    user = inner.save(User(kakao_user_id="kakao-1", name="before"))
+
+    assert users.get_by_kakao_user_id("kakao-1") == user
+    cached = users.get_by_id(user.id)
+    assert cached is not None and cached is not user
+    assert inner.lookups == 1
+
+    # A second worker with a cold local tier is served from the shared tier.
+    other_worker = CachingUserRepository(
+        _CountingUserRepository(), user_cache(shared=shared), outbox
+    )
+    assert other_worker.get_by_id(user.id) == user
+
+    cached.name = "after"
+    cached.kakao_user_id = "kakao-2"
+    users.save(cached)
+
+    (event,) = outbox.lease_pending()
+    assert event.event_type == USER_CHANGED
+    assert event.payload["kakao_user_ids"] == ["kakao-1", "kakao-2"]
+    assert shared.values == {}
+    assert users.get_by_kakao_user_id("kakao-1") is None
+    refreshed = users.get_by_kakao_user_id("kakao-2")
+    assert refreshed is not None and refreshed.name == "after"
+
+
+def test_user_cache_invalidation_reaches_every_polling_process() -> None:
+    outbox = InMemoryOutboxEventRepository()
+    now = [datetime(2026, 3, 1, 12, 0, tzinfo=UTC)]
+    inner_profiles = InMemoryUserProfileRepository()
+    user_id = uuid4()
+    inner_profiles.save(UserProfile(user_id=user_id, goal="strength"))
+
+    # Two API processes, each with its own cache and broadcast poller.
+    processes = []
+    for _ in range(2):
+        broadcast = OutboxBroadcast(lookback_seconds=30.0, clock=lambda: now[0])
+        profiles_cache = user_profile_cache()
+        register_user_cache_invalidation(broadcast, user_cache(), profiles_cache)
+        profiles = CachingUserProfileRepository(inner_profiles, profiles_cache, outbox)
+        assert broadcast.poll(outbox) == 0
+        assert profiles.get_by_user_id(user_id) is not None
+        processes.append((broadcast, profiles))
+
+    stored = inner_profiles.get_by_user_id(user_id)
+    assert stored is not None
+    stored.goal = "endurance"
+    # Committed a little late: stamped before the previous poll, seen anyway.
+    outbox.save(
+        OutboxEvent(
+            event_type=USER_PROFILE_CHANGED,
+            payload={"user_id": str(user_id)},
+            created_at=now[0] - timedelta(seconds=5),
+        )
+    )
+    now[0] += timedelta(seconds=1)
+    for broadcast, profiles in processes:
+        cached = profiles.get_by_user_id(user_id)
+        assert cached is not None and cached.goal == "strength"
+        assert broadcast.poll(outbox) == 1
+        fresh = profiles.get_by_user_id(user_id)
+        assert fresh is not None and fresh.goal == "endurance"
+        # Already delivered; the lookback window does not replay it.
+        assert broadcast.poll(outbox) == 0
+    # The event is not leased: the worker still gets it.
+    assert [event.event_type for event in outbox.lease_pending()] == [
+        USER_PROFILE_CHANGED
+    ]
+
+
+class _BatchCountingUserRepository(InMemoryUserRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[set[str]] = []
+
+    def map_kakao_user_ids(self, kakao_user_ids: Collection[str]) -> dict[str, UUID]:
+        self.batches.append(set(kakao_user_ids))
+        return super().map_kakao_user_ids(kakao_user_ids)
+
+
+def test_kakao_user_resolver_batches_misses_and_negative_caches() -> None:
+    users = _BatchCountingUserRepository()
+    warm = users.save(User(kakao_user_id="warm"))
+    cold = users.save(User(kakao_user_id="cold"))
+    resolver = KakaoUserResolver(max_entries=10)
+    assert resolver.warm(users) == 2
+    users.save(late := User(kakao_user_id="late"))
+
+    resolved = resolver.resolve_many(["warm", "late", "ghost", "late"], users)
+    assert resolved == {"warm": warm.id, "late": late.id}
+    assert users.batches == [{"late", "ghost"}]
+
+    assert resolver.resolve_many(["cold", "late", "ghost"], users) == {
+        "cold": cold.id,
+        "late": late.id,
+    }
+    assert len(users.batches) == 1
+
+    outbox = InMemoryOutboxEventRepository()
+    broadcast = OutboxBroadcast()
+    resolver.register(broadcast)
+    broadcast.poll(outbox)
+    users.save(User(kakao_user_id="ghost"))
+    outbox.save(
+        OutboxEvent(event_type=USER_CHANGED, payload={"kakao_user_ids": ["ghost"]})
+    )
+    assert broadcast.poll(outbox) == 1
+    assert resolver.resolve("ghost", users) is not None
+    assert users.batches[-1] == {"ghost"}
+
+
+def test_kakao_user_resolver_expires_known_ids_after_ttl() -> None:
+    users = _BatchCountingUserRepository()
+    first = users.save(User(kakao_user_id="k1"))
+    now = [0.0]
+    resolver = KakaoUserResolver(ttl_seconds=100.0, clock=lambda: now[0])
+    assert resolver.warm(users) == 1
+
+    # One TTL in, the entry has moved to the previous generation and still hits.
+    now[0] = 150.0
+    assert resolver.resolve("k1", users) == first.id
+    assert users.batches == []
+
+    # Re-mapped elsewhere and the change event was missed: the TTL catches it.
+    first.kakao_user_id = "k1-old"
+    users.save(first)
+    second = users.save(User(kakao_user_id="k1"))
+    now[0] = 260.0
+    assert resolver.resolve("k1", users) == second.id
+    assert users.batches == [{"k1"}]
+
+    now[0] = 1000.0
+    assert resolver.resolve("k1", users) == second.id
+    assert users.batches == [{"k1"}, {"k1"}]
+
+
+def test_webhook_service_assigns_user_ids_with_one_lookup() -> None:
+    users = _BatchCountingUserRepository()
+    known = users.save(User(kakao_user_id="kakao-1"))
+    service = WebhookService(
+        webhook_event_repository=InMemoryWebhookEventRepository(),
+        outbox_repository=InMemoryOutboxEventRepository(),
+        user_repository=users,
+        user_resolver=KakaoUserResolver(),
+    )
+    explicit = uuid4()
+    events = [
+        (WebhookEvent(provider="kakao", event_type="message"), "kakao-1"),
+        (WebhookEvent(provider="kakao", event_type="message"), "kakao-1"),
+        (WebhookEvent(provider="kakao", event_type="message"), "unknown"),
+        (WebhookEvent(provider="kakao", event_type="message", user_id=explicit), "x"),
+        (WebhookEvent(provider="kakao", event_type="message"), None),
+    ]
+
+    service.assign_user_ids(events)
+
+    assert [event.user_id for event, _ in events] == [
+        known.id,
+        known.id,
+        None,
+        explicit,
+        None,
+    ]
+    assert users.batches == [{"kakao-1", "unknown"}]